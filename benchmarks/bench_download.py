@@ -0,0 +1,56 @@
+"""Mede o tempo de download_all com diferentes quantidades de workers.
+
+Cada resposta do servidor local tem uma latência simulada, de forma que
+o tempo medido reflete, principalmente, a espera por I/O.
+
+> Exemplo: python -m benchmarks.bench_download
+"""
+import io
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from odufrn_downloader import ODUFRNDownloader
+from tests.server import CKANServer, synthetic_catalog
+
+LATENCY = 0.02
+PACKAGES = 20
+RESOURCES = 5
+
+
+def run(server: CKANServer, workers: int, max_per_host: int) -> tuple:
+    path = tempfile.mkdtemp()
+    ufrn_data = ODUFRNDownloader()
+    ufrn_data.url_base = server.url
+    ufrn_data.max_per_host = max_per_host
+    ufrn_data.available_packages
+
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(io.StringIO()):
+            failures = ufrn_data.download_all(path, workers=workers).failures
+    finally:
+        shutil.rmtree(path)
+
+    return time.perf_counter() - start, len(failures)
+
+
+def main():
+    catalog = synthetic_catalog(PACKAGES, RESOURCES, file_size=16 * 1024)
+    with CKANServer(catalog, latency=LATENCY) as server:
+        print('{} pacotes x {} recursos, latência de {:.0f} ms'.format(
+            PACKAGES, RESOURCES, LATENCY * 1000
+        ))
+        print('{:>8}{:>14}{:>12}{:>10}'.format(
+            'workers', 'max_per_host', 'tempo (s)', 'falhas'
+        ))
+        for workers, max_per_host in ((1, 4), (4, 4), (8, 4), (8, 8),
+                                      (16, 16)):
+            elapsed, failures = run(server, workers, max_per_host)
+            print('{:>8}{:>14}{:>12.2f}{:>10}'.format(
+                workers, max_per_host, elapsed, failures
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Mede o pico de memória ao baixar um arquivo grande.
+
+Compara a leitura do corpo inteiro da resposta (comportamento antigo de
+Package._download) com a escrita em partes feita atualmente. O pico é
+medido com tracemalloc, que contabiliza as alocações feitas pelo Python.
+
+> Exemplo: python -m benchmarks.bench_memory
+"""
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+import requests
+from odufrn_downloader import ODUFRNDownloader
+from tests.server import CKANServer, make_catalog
+
+FILE_SIZE = 100 * 1024 * 1024
+
+
+def buffered(ufrn_data: ODUFRNDownloader, path: str, resource: dict):
+    """Reproduz o download antigo, que mantinha o arquivo em memória."""
+    file_path = '{}/{}.{}'.format(
+        path, resource['name'], resource['format'].lower()
+    )
+    with open(file_path, 'wb') as f:
+        f.write(requests.get(resource['url']).content)
+
+
+def streamed(ufrn_data: ODUFRNDownloader, path: str, resource: dict):
+    with redirect_stdout(io.StringIO()):
+        ufrn_data._download(path, resource)
+
+
+def measure(fun, ufrn_data: ODUFRNDownloader, resource: dict) -> tuple:
+    path = tempfile.mkdtemp()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fun(ufrn_data, path, resource)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        size = os.path.getsize(os.path.join(path, 'grande.csv'))
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(path)
+
+    return peak, elapsed, size
+
+
+def main():
+    catalog = make_catalog({'grande': {'resources': [('grande', 'CSV')]}})
+    catalog['files']['files/grande/0.csv'] = FILE_SIZE
+
+    with CKANServer(catalog) as server:
+        ufrn_data = ODUFRNDownloader()
+        ufrn_data.url_base = server.url
+        resource = ufrn_data._request_get(
+            ufrn_data.url_package + 'grande'
+        )['resources'][0]
+
+        print('arquivo de {} MiB'.format(FILE_SIZE // 2 ** 20))
+        print('{:<12}{:>16}{:>12}'.format('modo', 'pico (MiB)', 'tempo (s)'))
+        for name, fun in (('buffered', buffered), ('streamed', streamed)):
+            peak, elapsed, size = measure(fun, ufrn_data, resource)
+            assert size == FILE_SIZE
+            print('{:<12}{:>16.1f}{:>12.2f}'.format(
+                name, peak / 2 ** 20, elapsed
+            ))
+
+
+if __name__ == '__main__':
+    main()
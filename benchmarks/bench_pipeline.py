@@ -0,0 +1,52 @@
+"""Compara a consulta sequencial de metadados (um pacote após o outro,
+com os downloads em paralelo) com o pipeline de download_packages, que
+consulta os metadados concorrentemente enquanto os downloads ocorrem.
+
+> Exemplo: python -m benchmarks.bench_pipeline
+"""
+import io
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from odufrn_downloader import ODUFRNDownloader
+from tests.server import CKANServer, synthetic_catalog
+
+LATENCY = 0.03
+PACKAGES = 40
+WORKERS = 4
+
+
+def sequential(ufrn_data: ODUFRNDownloader, packages: list, path: str):
+    """Consulta os metadados de um pacote por vez, como antes."""
+    with ufrn_data._download_pool(WORKERS) as pool:
+        for name in packages:
+            ufrn_data._download_package(name, path, True, None, pool)
+
+
+def pipelined(ufrn_data: ODUFRNDownloader, packages: list, path: str):
+    ufrn_data.download_packages(packages, path, workers=WORKERS)
+
+
+def main():
+    catalog = synthetic_catalog(PACKAGES, 2, file_size=4096)
+    with CKANServer(catalog, latency=LATENCY) as server:
+        print('{} pacotes x 2 recursos, {} workers, latência de {:.0f} ms'
+              .format(PACKAGES, WORKERS, LATENCY * 1000))
+        for name, fun in (('sequencial', sequential),
+                          ('pipeline', pipelined)):
+            ufrn_data = ODUFRNDownloader()
+            ufrn_data.url_base = server.url
+            packages = list(ufrn_data.available_packages)
+            path = tempfile.mkdtemp()
+
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                fun(ufrn_data, packages, path)
+            elapsed = time.perf_counter() - start
+            shutil.rmtree(path)
+            print('{:<12}{:>8.2f} s'.format(name, elapsed))
+
+
+if __name__ == '__main__':
+    main()
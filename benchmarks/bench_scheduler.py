@@ -0,0 +1,57 @@
+"""Compara downloads com concorrência fixa e com o RequestScheduler em
+um servidor que recusa (503) as requisições além da sua capacidade.
+
+> Exemplo: python -m benchmarks.bench_scheduler
+"""
+import io
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from odufrn_downloader import ODUFRNDownloader
+from odufrn_downloader.modules.RequestScheduler import RequestScheduler
+from tests.server import CKANServer, synthetic_catalog
+
+PACKAGES = 40
+CAPACITY = 6
+LATENCY = 0.02
+WORKERS = 16
+
+
+def run(server: CKANServer, scheduler: RequestScheduler) -> tuple:
+    server.reset()
+    ufrn_data = ODUFRNDownloader()
+    ufrn_data.url_base = server.url
+    ufrn_data.max_per_host = WORKERS
+    ufrn_data.scheduler = scheduler
+    path = tempfile.mkdtemp()
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        failures = ufrn_data.download_all(path, workers=WORKERS).failures
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(path)
+
+    return elapsed, len(failures), server.rejected, server.max_in_flight
+
+
+def main():
+    catalog = synthetic_catalog(PACKAGES, 3, file_size=64 * 1024)
+    with CKANServer(catalog, LATENCY, CAPACITY) as server:
+        print('{} pacotes x 3 recursos, {} workers, capacidade do servidor: '
+              '{} requisições'.format(PACKAGES, WORKERS, CAPACITY))
+        print('{:<12}{:>10}{:>8}{:>10}{:>12}'.format(
+            '', 'tempo', 'falhas', 'recusas', 'simultâneas'
+        ))
+        for name, scheduler in (
+                ('fixo', None),
+                ('adaptativo', RequestScheduler(max_concurrency=WORKERS,
+                                                backoff=0.1))):
+            elapsed, failures, rejected, in_flight = run(server, scheduler)
+            print('{:<12}{:>8.2f} s{:>8}{:>10}{:>12}'.format(
+                name, elapsed, failures, rejected, in_flight
+            ))
+
+
+if __name__ == '__main__':
+    main()
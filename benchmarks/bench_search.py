@@ -0,0 +1,102 @@
+"""Compara search_related com o índice de busca e a versão original, que
+calculava a distância de Levenshtein para todas as palavras da lista a
+cada chamada, e mede a busca em lote (search_related_many).
+
+> Exemplo: python -m benchmarks.bench_search
+"""
+import random
+import time
+from odufrn_downloader.mixins.FilterMixin import FilterMixin
+
+WORDS = ['dados', 'discentes', 'docentes', 'graduacao', 'pos', 'cursos',
+         'unidades', 'academicas', 'acervo', 'biblioteca', 'contratos',
+         'convenios', 'despesas', 'orcamento', 'extensao', 'pesquisa',
+         'projetos', 'servidores', 'telefones', 'turmas', 'processos',
+         'seletivos', 'patrimonio', 'materiais', 'bolsas', 'auxilios']
+KEYWORDS = ['discente', 'graduacoa', 'pesquisas', 'telefone', 'orcamentos',
+            'biblioteca', 'processo', 'xyz', 'dado', 'servidor']
+SIZE = 10000
+BATCH_SIZE = 1000
+BATCH_KEYWORDS = 200
+
+
+def synthetic_names(size: int) -> list:
+    rand = random.Random(42)
+    names = []
+    seen = set()
+    while len(names) < size:
+        words = rand.sample(WORDS, rand.randint(1, 4))
+        # Variações para que existam muitas palavras distintas
+        words = [w + rand.choice(['', '', 's', 'es', str(rand.randint(0, 96))])
+                 for w in words]
+        name = '-'.join(words)
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def original(mixin: FilterMixin, keyword: str, input_list: list) -> list:
+    """search_related como era antes do índice."""
+    str1 = list(keyword)
+    filter_list = []
+    for item in input_list:
+        for word in item.split('-'):
+            if mixin.levenshtein(str1, list(word)) > 0.87:
+                filter_list.append(item)
+                continue
+    return filter_list
+
+
+def unique(items: list) -> list:
+    seen = set()
+    return [i for i in items if not (i in seen or seen.add(i))]
+
+
+def main():
+    names = synthetic_names(SIZE)
+    mixin = FilterMixin()
+
+    start = time.perf_counter()
+    expected = [original(mixin, k, names) for k in KEYWORDS]
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mixin.search_related(KEYWORDS[0], names)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = [mixin.search_related(k, names) for k in KEYWORDS]
+    after = time.perf_counter() - start
+
+    assert [unique(e) for e in expected] == result
+    print('{} nomes, {} palavras-chave'.format(SIZE, len(KEYWORDS)))
+    print('original:     {:8.1f} ms por busca'.format(
+        before / len(KEYWORDS) * 1000))
+    print('com índice:   {:8.1f} ms por busca (+{:.1f} ms na primeira, '
+          'para construir o índice)'.format(
+              after / len(KEYWORDS) * 1000, build * 1000))
+
+    # Busca em lote: várias palavras-chave contra um catálogo menor
+    names = synthetic_names(BATCH_SIZE)
+    keywords = [name.split('-')[0] + 'x'
+                for name in synthetic_names(BATCH_KEYWORDS)]
+
+    start = time.perf_counter()
+    expected = {k: unique(original(mixin, k, names)) for k in keywords}
+    before = time.perf_counter() - start
+
+    mixin = FilterMixin()
+    start = time.perf_counter()
+    result = mixin.search_related_many(keywords, names)
+    after = time.perf_counter() - start
+
+    assert expected == result
+    print('\n{} nomes, {} palavras-chave em lote'.format(
+        BATCH_SIZE, len(keywords)))
+    print('original:             {:8.2f} s'.format(before))
+    print('search_related_many:  {:8.2f} s'.format(after))
+
+
+if __name__ == '__main__':
+    main()
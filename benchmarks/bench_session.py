@@ -0,0 +1,63 @@
+"""Compara download_group usando a sessão compartilhada com o uso de
+uma nova conexão por requisição (comportamento antigo, via requests.get).
+
+> Exemplo: python -m benchmarks.bench_session
+"""
+import io
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+import requests
+from odufrn_downloader import ODUFRNDownloader
+from tests.server import CKANServer, synthetic_catalog
+
+PACKAGES = 40
+ROUNDS = 3
+
+
+class NoKeepAlive:
+    """Sessão que abre uma conexão nova a cada requisição."""
+
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+
+def run(server: CKANServer, session, workers: int) -> tuple:
+    elapsed = 0
+    server.reset()
+    for _ in range(ROUNDS):
+        path = tempfile.mkdtemp()
+        ufrn_data = ODUFRNDownloader()
+        ufrn_data.url_base = server.url
+        if session is not None:
+            ufrn_data.session = session()
+
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            ufrn_data.download_group('grupo-0', path, workers=workers)
+        elapsed += time.perf_counter() - start
+        shutil.rmtree(path)
+
+    calls = len(server.requests)
+    return elapsed / calls * 1000, calls // ROUNDS, \
+        len(server.connections) // ROUNDS
+
+
+def main():
+    catalog = synthetic_catalog(PACKAGES, 3, file_size=4096, n_groups=1)
+    with CKANServer(catalog) as server:
+        print('{:<14}{:>8}{:>14}{:>12}{:>12}'.format(
+            'sessão', 'workers', 'ms/requisição', 'requisições', 'conexões'
+        ))
+        for workers in (1, 4):
+            for name, session in (('requests.get', NoKeepAlive),
+                                  ('compartilhada', None)):
+                latency, calls, connections = run(server, session, workers)
+                print('{:<14}{:>8}{:>14.2f}{:>12}{:>12}'.format(
+                    name, workers, latency, calls, connections
+                ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Mede o custo de construção do ODUFRNDownloader.
+
+Compara a construção preguiçosa atual com o comportamento antigo, em que
+o construtor carregava package_list, group_list e tag_list (duas vezes,
+por causa da instância interna de Tag) antes de retornar.
+
+> Exemplo: python -m benchmarks.bench_startup
+"""
+import time
+from odufrn_downloader import ODUFRNDownloader
+from odufrn_downloader.modules.Tag import Tag
+from tests.server import CKANServer, synthetic_catalog
+
+LATENCY = 0.05
+ROUNDS = 5
+
+
+def eager(url_base: str):
+    """Reproduz as consultas feitas pelo construtor antigo."""
+    ufrn_data = ODUFRNDownloader()
+    ufrn_data.url_base = url_base
+    ufrn_data.load_packages()
+    ufrn_data.load_groups()
+    ufrn_data.load_tags()
+    tag = Tag()
+    tag.url_base = url_base
+    tag.load_tags()
+
+
+def lazy(url_base: str):
+    ufrn_data = ODUFRNDownloader()
+    ufrn_data.url_base = url_base
+
+
+def measure(server: CKANServer, fun) -> tuple:
+    server.reset()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fun(server.url)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    return len(server.requests) / ROUNDS, elapsed
+
+
+def main():
+    with CKANServer(synthetic_catalog(300), latency=LATENCY) as server:
+        print('latência simulada: {:.0f} ms'.format(LATENCY * 1000))
+        print('{:<10}{:>12}{:>14}'.format('modo', 'requisições', 'tempo (ms)'))
+        for name, fun in (('antes', eager), ('depois', lazy)):
+            count, elapsed = measure(server, fun)
+            print('{:<10}{:>12.0f}{:>14.1f}'.format(
+                name, count, elapsed * 1000
+            ))
+
+
+if __name__ == '__main__':
+    main()
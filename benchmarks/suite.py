@@ -0,0 +1,207 @@
+"""Suíte de benchmarks dos principais caminhos do pacote, executada contra
+o servidor local (tests.server.CKANServer) com um catálogo sintético.
+
+Cenários: construção (construtor e primeira consulta à lista de pacotes),
+search_related, download_package, download_group e download_all. Cada
+cenário é executado `--rounds` vezes e a mediana do tempo é registrada.
+
+Os resultados podem ser salvos como referência (--save) e comparados com
+uma referência anterior (--baseline): os cenários mais lentos que a
+referência além da tolerância (--tolerance) são indicados e o programa
+termina com código 1.
+
+> Exemplo:
+    python -m benchmarks.suite --save referencia.json
+    python -m benchmarks.suite --baseline referencia.json
+    python -m benchmarks.suite --packages 200 --latency 0.01 \
+        --error-rate 0.05 --only download_all
+"""
+import argparse
+import io
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from odufrn_downloader import ODUFRNDownloader
+from tests.server import CKANServer, synthetic_catalog
+
+KEYWORDS = ['pacote', 'dados', 'pacot', 'dado', 'recurso', 'xyz']
+
+
+def downloader(server: CKANServer, config: dict) -> ODUFRNDownloader:
+    ufrn_data = ODUFRNDownloader()
+    ufrn_data.url_base = server.url
+    ufrn_data.max_per_host = config['workers']
+    return ufrn_data
+
+
+def construction(server: CKANServer, config: dict):
+    ufrn_data = downloader(server, config)
+    ufrn_data.available_packages
+
+
+def search_related(server: CKANServer, config: dict):
+    ufrn_data = downloader(server, config)
+    ufrn_data.available_packages
+    for keyword in KEYWORDS:
+        ufrn_data.search_related_packages(keyword)
+
+
+def download_package(server: CKANServer, config: dict):
+    download(server, config, lambda ufrn_data, path: (
+        ufrn_data.download_package('pacote-0-dados', path,
+                                   workers=config['workers'])
+    ))
+
+
+def download_group(server: CKANServer, config: dict):
+    download(server, config, lambda ufrn_data, path: (
+        ufrn_data.download_group('grupo-0', path, workers=config['workers'])
+    ))
+
+
+def download_all(server: CKANServer, config: dict):
+    download(server, config, lambda ufrn_data, path: (
+        ufrn_data.download_all(path, workers=config['workers'])
+    ))
+
+
+def download(server: CKANServer, config: dict, fun):
+    path = tempfile.mkdtemp()
+    try:
+        with redirect_stdout(io.StringIO()):
+            fun(downloader(server, config), path)
+    finally:
+        shutil.rmtree(path)
+
+
+SCENARIOS = {
+    'construction': construction,
+    'search_related': search_related,
+    'download_package': download_package,
+    'download_group': download_group,
+    'download_all': download_all,
+}
+
+
+def measure(server: CKANServer, scenario, config: dict) -> dict:
+    times = []
+    for _ in range(config['rounds']):
+        server.reset()
+        start = time.perf_counter()
+        scenario(server, config)
+        times.append(time.perf_counter() - start)
+
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'requests': len(server.requests),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Imprime a comparação com a referência e retorna os cenários que
+    ficaram mais lentos além da tolerância."""
+    if baseline['config'] != results['config']:
+        print('aviso: a referência foi medida com outra configuração: '
+              '{}'.format(baseline['config']))
+
+    print('{:<18}{:>12}{:>14}{:>10}'.format(
+        'cenário', 'tempo (s)', 'referência', 'variação'
+    ))
+    regressions = []
+    for name, result in results['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            print('{:<18}{:>12.3f}{:>14}{:>10}'.format(
+                name, result['median'], '-', '-'
+            ))
+            continue
+
+        change = result['median'] / reference['median'] - 1
+        mark = ''
+        if change > tolerance:
+            regressions.append(name)
+            mark = ' !'
+        print('{:<18}{:>12.3f}{:>14.3f}{:>+9.0%}{}'.format(
+            name, result['median'], reference['median'], change, mark
+        ))
+
+    return regressions
+
+
+def parse_args(args: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.suite',
+        description='Mede os principais caminhos do pacote contra o '
+                    'servidor local.'
+    )
+    parser.add_argument('--packages', type=int, default=100,
+                        help='quantidade de pacotes do catálogo')
+    parser.add_argument('--resources', type=int, default=3,
+                        help='recursos por pacote')
+    parser.add_argument('--file-size', type=int, default=16 * 1024,
+                        help='tamanho de cada arquivo, em bytes')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='latência de cada resposta, em segundos')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fração dos downloads que recebem 503')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='workers dos downloads')
+    parser.add_argument('--rounds', type=int, default=3,
+                        help='execuções de cada cenário')
+    parser.add_argument('--only', nargs='+', choices=sorted(SCENARIOS),
+                        help='cenários a executar (por padrão, todos)')
+    parser.add_argument('--save', help='salva os resultados neste arquivo')
+    parser.add_argument('--baseline',
+                        help='compara com os resultados deste arquivo')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='piora aceita em relação à referência')
+    return parser.parse_args(args)
+
+
+def main(args: list = None) -> int:
+    args = parse_args(args)
+    config = {
+        'packages': args.packages, 'resources': args.resources,
+        'file_size': args.file_size, 'latency': args.latency,
+        'error_rate': args.error_rate, 'workers': args.workers,
+        'rounds': args.rounds,
+    }
+    catalog = synthetic_catalog(args.packages, args.resources,
+                                args.file_size)
+
+    results = {'config': config, 'results': {}}
+    with CKANServer(catalog, latency=args.latency,
+                    error_rate=args.error_rate) as server:
+        for name in args.only or SCENARIOS:
+            results['results'][name] = measure(
+                server, SCENARIOS[name], config
+            )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+    else:
+        print('{:<18}{:>12}{:>12}{:>14}'.format(
+            'cenário', 'tempo (s)', 'mínimo (s)', 'requisições'
+        ))
+        for name, result in results['results'].items():
+            print('{:<18}{:>12.3f}{:>12.3f}{:>14}'.format(
+                name, result['median'], result['min'], result['requests']
+            ))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,396 @@
+import asyncio
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from .modules.Env import Env
+from .mixins.FilterMixin import FilterMixin
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncODUFRNDownloader(Env, FilterMixin):
+    """Versão assíncrona (asyncio) dos métodos de download do pacote.
+
+    As consultas de metadados e os downloads de arquivos de uma chamada
+    são feitos concorrentemente em um mesmo event loop, limitados por um
+    semáforo. Requer o pacote `aiohttp` (pip install odufrn-downloader[async]).
+
+    Os atributos timeout, retry, scheduler e monitor valem como na versão
+    síncrona: timeout limita a conexão e cada espera por dados (não a
+    duração total do download), e as falhas transitórias são tentadas
+    novamente pela mesma RetryPolicy. As operações bloqueantes (cache de
+    metadados e escrita dos arquivos) são feitas em threads, fora do
+    event loop.
+
+    > Exemplo:
+        ufrn_data = AsyncODUFRNDownloader()
+        await ufrn_data.download_group('ensino')
+
+    Atributos
+    ---------
+    concurrency: int
+        quantidade máxima de requisições simultâneas de uma chamada.
+    """
+
+    def __init__(self, concurrency: int = 8):
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncODUFRNDownloader requer o pacote aiohttp: '
+                'pip install odufrn-downloader[async]'
+            )
+        super().__init__()
+        self.concurrency = concurrency
+        self._tasks = itertools.count()
+
+    @property
+    def url_package(self) -> str:
+        return self.url_base + 'api/rest/dataset/'
+
+    @property
+    def url_group(self) -> str:
+        return self.url_base + 'api/rest/group/'
+
+    async def load_packages(self) -> list:
+        """Atualiza e retorna a lista de pacotes disponíveis."""
+        async with self._client() as client:
+            return await self._load_catalog(client, 'package_list')
+
+    async def load_groups(self) -> list:
+        """Atualiza e retorna a lista de grupos de pacotes disponíveis."""
+        async with self._client() as client:
+            return await self._load_catalog(client, 'group_list')
+
+    async def download_package(self, name: str, path: str = os.getcwd(),
+                               dictionary: bool = True,
+                               years: list = None) -> list:
+        """Baixa os arquivos de um pacote em uma pasta com o seu nome.
+
+        > Exemplo: await download_package('acervo-biblioteca')
+
+        Parâmetros
+        ----------
+        name: str
+            nome do pacote.
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos
+            (por padrão, a pasta atual).
+        dictionary: bool
+            flag para baixar o dicionário dos dados (por padrão, True).
+        years: list
+            define os anos dos dados que serão baixados, se existir
+            realiza-se o download.
+
+        Retorno
+        -------
+        lista com as falhas ocorridas.
+        """
+        return await self.download_packages([name], path, dictionary, years)
+
+    async def download_packages(self, packages: list,
+                                path: str = os.getcwd(),
+                                dictionary: bool = True,
+                                years: list = None) -> list:
+        """Baixa os arquivos de uma lista de pacotes, cada um em uma pasta
+        com o seu nome.
+
+        > Exemplo: await download_packages(['discentes', 'telefones'])
+
+        Parâmetros
+        ----------
+        packages: list
+            lista com os nomes dos pacotes desejados.
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos
+            (por padrão, a pasta atual).
+        dictionary: bool
+            flag para baixar o dicionário dos dados (por padrão, True).
+        years: list
+            define os anos dos dados que serão baixados, se existir
+            realiza-se o download.
+
+        Retorno
+        -------
+        lista com as falhas ocorridas.
+        """
+        failures = []
+        async with self._client() as client:
+            await asyncio.gather(*[
+                self._download_package(
+                    client, package, path, dictionary, years, failures
+                ) for package in packages
+            ])
+
+        return self._report_failures(failures)
+
+    async def download_group(self, name: str, path: str = os.getcwd(),
+                             dictionary: bool = True,
+                             years: list = None) -> list:
+        """Baixa os pacotes de um grupo em uma pasta com o seu nome.
+
+        > Exemplo: await download_group('pessoas')
+
+        Parâmetros
+        ----------
+        name: str
+            nome do grupo.
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos
+            (por padrão, a pasta atual).
+        dictionary: bool
+            flag para baixar o dicionário dos dados (por padrão, True).
+        years: list
+            define os anos dos dados que serão baixados, se existir
+            realiza-se o download.
+
+        Retorno
+        -------
+        lista com as falhas ocorridas.
+        """
+        failures = []
+        async with self._client() as client:
+            try:
+                group = await self._get_json(client, self.url_group + name)
+                packages = group['packages']
+            except Exception as ex:
+                failures.append({'group': name, 'error': ex})
+                packages = []
+
+            path = await self._blocking(
+                self._make_dir, '{}/{}'.format(path, name)
+            )
+            await asyncio.gather(*[
+                self._download_package(
+                    client, package, path, dictionary, years, failures
+                ) for package in packages
+            ])
+
+        return self._report_failures(failures)
+
+    async def download_all(self, path: str = os.getcwd(),
+                           dictionary: bool = True, years: list = None,
+                           refresh: bool = False) -> list:
+        """Baixa todos os pacotes de dados disponíveis.
+
+        > Exemplo: await download_all(years=list(range(2009, 2014)))
+
+        Parâmetros
+        ----------
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos
+            (por padrão, a pasta atual).
+        dictionary: bool
+            flag para baixar o dicionário dos dados (por padrão, True).
+        years: list
+            define os anos dos dados que serão baixados, se existir
+            realiza-se o download.
+        refresh: bool
+            flag para consultar novamente a lista de pacotes, mesmo que
+            ela já tenha sido carregada (por padrão, False).
+
+        Retorno
+        -------
+        lista com as falhas ocorridas.
+        """
+        packages = self._catalog.get('package_list')
+        if refresh or packages is None:
+            packages = await self.load_packages()
+
+        return await self.download_packages(packages, path, dictionary, years)
+
+    def _client(self) -> '_Client':
+        """Cria a sessão aiohttp e o semáforo usados por uma chamada."""
+        connect, read = self.timeout if isinstance(self.timeout, tuple) \
+            else (self.timeout, self.timeout)
+        return _Client(self.concurrency, self._host_limit(),
+                       aiohttp.ClientTimeout(total=None, sock_connect=connect,
+                                             sock_read=read))
+
+    async def _load_catalog(self, client: '_Client', option: str) -> list:
+        result = await self._get_json(client, self.url_action + option)
+        self._catalog[option] = result['result']
+        return self._catalog[option]
+
+    async def _blocking(self, fun, *args):
+        """Executa uma função bloqueante (ex.: acesso ao disco ou ao
+        cache) em uma thread, sem bloquear o event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, fun, *args
+        )
+
+    async def _retry(self, fun, *args):
+        """Aguarda fun(*args) segundo a política de novas tentativas."""
+        if self.retry is None:
+            return await fun(*args)
+
+        return await self.retry.call_async(fun, *args)
+
+    @asynccontextmanager
+    async def _get(self, client: '_Client', url: str):
+        """Realiza uma requisição GET, aguardando a vez no semáforo e no
+        scheduler, se houver, e enviando ao monitor o evento 'request'.
+        A vez é mantida até o fim do bloco, enquanto o corpo da resposta
+        é lido.
+
+        Parâmetros
+        ----------
+        client: _Client
+            a sessão da chamada.
+        url: str
+            a url que se deseja realizar a requisição.
+        """
+        async with client.semaphore:
+            if self.scheduler is None:
+                slot = _NoSlot()
+            else:
+                # A vez é aguardada no event loop, sem ocupar threads do
+                # executor, que são usadas pela escrita dos arquivos
+                slot = self.scheduler.slot(url)
+            async with slot:
+                start = time.monotonic()
+                try:
+                    response = await client.session.get(url)
+                except Exception as ex:
+                    self._emit('request', url=url, status=None,
+                               duration=time.monotonic() - start, error=ex)
+                    raise
+
+                elapsed = time.monotonic() - start
+                self._emit('request', url=url, status=response.status,
+                           duration=elapsed)
+                slot.update(response.status, elapsed, response.headers)
+                async with response:
+                    yield response
+
+    async def _get_json(self, client: '_Client', url: str):
+        """Realiza a requisição desejada, consultando o cache se houver,
+        e retorna a resposta em json."""
+        start = time.monotonic()
+        if self.cache is not None:
+            cached = await self._blocking(self.cache.get, url)
+            if cached is not None:
+                self._emit('metadata', url=url, cached=True,
+                           duration=time.monotonic() - start)
+                return cached
+
+        try:
+            data = await self._retry(self._fetch_json, client, url)
+        except Exception as ex:
+            self._emit('metadata', url=url, cached=None,
+                       duration=time.monotonic() - start, error=ex)
+            raise
+
+        if self.cache is not None:
+            await self._blocking(self.cache.set, url, data)
+        self._emit('metadata', url=url,
+                   cached=False if self.cache is not None else None,
+                   duration=time.monotonic() - start)
+
+        return data
+
+    async def _fetch_json(self, client: '_Client', url: str):
+        async with self._get(client, url) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def _download_package(self, client: '_Client', name: str,
+                                path: str, dictionary: bool, years: list,
+                                failures: list):
+        try:
+            package = await self._get_json(client, self.url_package + name)
+            resources = package['resources']
+        except Exception as ex:
+            failures.append({'package': name, 'resource': None, 'error': ex})
+            return
+
+        path = await self._blocking(self._make_dir,
+                                    '{}/{}'.format(path, name))
+        await asyncio.gather(*[
+            self._download(client, name, path, resource, failures)
+            for resource in resources
+            if self._check_resource(resource, dictionary, years)
+        ])
+
+    async def _download(self, client: '_Client', package: str, path: str,
+                        resource: dict, failures: list):
+        """Baixa o arquivo do recurso, com novas tentativas nas falhas
+        transitórias, registrando a falha se todas falharem. Os eventos
+        do download levam o campo task, que os distingue dos de outros
+        downloads simultâneos no mesmo event loop."""
+        info = {'package': package, 'resource': resource['name'],
+                'url': resource['url']}
+        task = next(self._tasks)
+        self._emit('download_start', task=task, **info)
+        try:
+            await self._retry(self._download_file, client, path, resource,
+                              task)
+        except Exception as ex:
+            failures.append(dict(info, error=ex))
+            self._emit('download_failure', task=task, error=ex, **info)
+        else:
+            self._emit('download_end', task=task, status='ok', **info)
+
+    async def _download_file(self, client: '_Client', path: str,
+                             resource: dict, task: int = None):
+        """Baixa o arquivo do recurso em partes, escrevendo-o em
+        `<nome>.part` e renomeando-o ao término do download."""
+        file_path = '{}/{}.{}'.format(
+            path, resource['name'], resource['format'].lower()
+        )
+        part_path = file_path + '.part'
+        print("Baixando {}...".format(resource['name']))
+        async with self._get(client, resource['url']) as response:
+            response.raise_for_status()
+            f = await self._blocking(open, part_path, 'wb')
+            try:
+                async for chunk in response.content.iter_chunked(
+                        self.chunk_size):
+                    await self._blocking(f.write, chunk)
+                    self._emit('download_progress', task=task,
+                               resource=resource['name'],
+                               url=resource['url'], bytes=len(chunk))
+            finally:
+                await self._blocking(f.close)
+
+        await self._blocking(self._check_size, resource, part_path)
+        await self._blocking(os.replace, part_path, file_path)
+
+
+class _NoSlot:
+    """Vez de uma requisição quando não há scheduler."""
+
+    def update(self, status: int, elapsed: float, headers: dict):
+        pass
+
+    async def __aenter__(self) -> '_NoSlot':
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class _Client:
+    """Sessão aiohttp e semáforo compartilhados por uma chamada."""
+
+    def __init__(self, concurrency: int, max_per_host: int,
+                 timeout: 'aiohttp.ClientTimeout'):
+        self.concurrency = concurrency
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.semaphore = None
+        self.session = None
+
+    async def __aenter__(self) -> '_Client':
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.concurrency, limit_per_host=self.max_per_host
+            ), timeout=self.timeout
+        )
+        return self
+
+    async def __aexit__(self, *args):
+        await self.session.close()
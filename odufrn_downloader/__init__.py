@@ -1 +1,3 @@
 from .ODUFRNDownloader import ODUFRNDownloader
+from .AsyncODUFRNDownloader import AsyncODUFRNDownloader
+from .modules.MetadataCache import MetadataCache
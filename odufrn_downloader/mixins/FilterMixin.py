@@ -5,3 +5,22 @@ from .filters.YearsMixin import YearsMixin
 
 class FilterMixin(LevenshteinMixin, SimpleSearchMixin, YearsMixin):
     """Mixin que engloba os métodos de filtros."""
+
+    def _check_resource(self, resource: dict, dictionary: bool,
+                        years: list) -> bool:
+        """Verifica se o recurso deve ser baixado, de acordo com os
+        filtros de dicionário e de anos.
+
+        Parâmetros
+        ----------
+        resource: dict
+            o recurso do pacote.
+        dictionary: bool
+            flag para baixar o dicionário dos dados.
+        years: list
+            define os anos dos dados que serão baixados.
+        """
+        if 'Dicion' in resource['name']:
+            return dictionary
+
+        return years is None or self.year_find(resource['name'], years)
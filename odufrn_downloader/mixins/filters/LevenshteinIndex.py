@@ -0,0 +1,150 @@
+class LevenshteinIndex:
+    """Índice das palavras de uma lista, usado para buscas por
+    similaridade de Levenshtein sem recalcular a distância para cada
+    palavra repetida.
+
+    As palavras distintas são agrupadas por tamanho. Numa busca, apenas
+    os grupos cujo tamanho é compatível com a razão mínima são visitados,
+    e a distância é calculada pelo algoritmo bit-paralelo de Myers.
+
+    Atributos
+    ---------
+    items: list
+        a lista indexada.
+    split: bool
+        indica se os itens foram divididos em palavras pelo '-'.
+    """
+
+    def __init__(self, items: list, split: bool = True,
+                 threshold: float = 0.87):
+        self.items = items
+        self.split = split
+        self.threshold = threshold
+        self._size = len(items)
+        self._words = {}
+        self._by_length = {}
+
+        for position, item in enumerate(items):
+            for word in (item.split('-') if split else [item]):
+                positions = self._words.get(word)
+                if positions is None:
+                    positions = self._words[word] = []
+                    self._by_length.setdefault(len(word), []).append(word)
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+    def matches(self, items: list, split: bool) -> bool:
+        """Verifica se o índice foi construído para a lista recebida."""
+        return items is self.items and len(items) == self._size \
+            and split == self.split
+
+    def search(self, keyword: str) -> list:
+        """Retorna os itens, na ordem da lista, que possuem alguma palavra
+        com razão de similaridade maior que o limiar.
+
+        Parâmetros
+        ----------
+        keyword: str
+            palavra-chave com a qual será feita a busca.
+        """
+        return self.search_many([keyword])[keyword]
+
+    def search_many(self, keywords: list) -> dict:
+        """Realiza a busca de várias palavras-chave de uma só vez.
+
+        Cada palavra-chave é codificada uma única vez em máscaras de bits
+        e comparada às palavras do índice com o algoritmo bit-paralelo
+        de Myers, que processa todas as posições da palavra-chave a cada
+        caractere.
+
+        Parâmetros
+        ----------
+        keywords: list
+            palavras-chave com as quais será feita a busca.
+
+        Retorno
+        -------
+        dicionário {palavra-chave: lista de itens semelhantes}.
+        """
+        results = {}
+        for keyword in keywords:
+            if keyword in results:
+                continue
+
+            masks = pattern_masks(keyword)
+            size = len(keyword)
+            positions = set()
+            for length, words in self._by_length.items():
+                max_distance = self.max_distance(size, length)
+                if max_distance < abs(size - length):
+                    continue
+                for word in words:
+                    if myers_distance(masks, size, word) <= max_distance:
+                        positions.update(self._words[word])
+
+            results[keyword] = [
+                self.items[position] for position in sorted(positions)
+            ]
+
+        return results
+
+    def max_distance(self, size1: int, size2: int) -> int:
+        """Maior distância entre palavras de tamanhos size1 e size2 para a
+        qual a razão de similaridade ainda supera o limiar (-1 se não
+        houver)."""
+        lens = size1 + size2
+        distance = -1
+        while distance < lens and \
+                lens and (lens - (distance + 1)) / lens > self.threshold:
+            distance += 1
+
+        return distance
+
+
+def pattern_masks(pattern: str) -> dict:
+    """Codifica a palavra em máscaras de bits: para cada caractere, os
+    bits das posições em que ele ocorre."""
+    masks = {}
+    for position, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << position)
+
+    return masks
+
+
+def myers_distance(masks: dict, size: int, text: str) -> int:
+    """Calcula a distância de Levenshtein entre a palavra codificada em
+    masks (ver pattern_masks) e text, pelo algoritmo bit-paralelo de
+    Myers (na versão de Hyyrö para a distância entre palavras inteiras).
+
+    Parâmetros
+    ----------
+    masks: dict
+        máscaras de bits da palavra.
+    size: int
+        tamanho da palavra.
+    text: str
+        palavra com a qual será comparada.
+    """
+    if size == 0:
+        return len(text)
+
+    full = (1 << size) - 1
+    last = 1 << (size - 1)
+    positive, negative = full, 0
+    distance = size
+    for char in text:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        h_positive = negative | (~(horizontal | positive) & full)
+        h_negative = positive & horizontal
+        if h_positive & last:
+            distance += 1
+        elif h_negative & last:
+            distance -= 1
+        h_positive = ((h_positive << 1) | 1) & full
+        h_negative = (h_negative << 1) & full
+        positive = h_negative | (~(vertical | h_positive) & full)
+        negative = h_positive & vertical
+
+    return distance
@@ -1,3 +1,6 @@
+from .LevenshteinIndex import LevenshteinIndex
+
+
 class LevenshteinMixin:
     """Mixin relacionado ao calculo de similaridade entre duas palavras."""
 
@@ -52,19 +55,48 @@ class LevenshteinMixin:
         Retorno
         -------
         lista de valores com nome similares à palavra de interesse.
+
+        O índice das palavras de input_list é construído na primeira busca
+        e reaproveitado enquanto a lista não for substituída.
+        """
+        return self._search_index(input_list, split).search(keyword)
+
+    def search_related_many(self, keywords: list, input_list: list,
+                            split: bool = True) -> dict:
+        """Realiza search_related para várias palavras-chave de uma só vez,
+        comparando cada uma com as palavras distintas de input_list.
+
+        > Exemplo: search_related_many(['discente', 'docente'], \
+            self.available_packages)
+
+        Parâmetros
+        ----------
+        keywords: list
+            palavras-chave com as quais será feita a busca.
+        input_list: list
+            lista com os valores que irá verificar a similaridade com keyword.
+        split: bool
+            flag que indica se a palavra-chave deve ser dividida.
+
+        Retorno
+        -------
+        dicionário {palavra-chave: lista de valores com nome similares}.
         """
-        str1 = list(keyword)
-        filter_list = []
-
-        for item in input_list:
-            items = item.split('-') if split else [item]
-            for word in items:
-                ratio = self.levenshtein(str1, list(word))
-                if ratio > 0.87:
-                    filter_list.append(item)
-                    continue
-
-        return filter_list
+        return self._search_index(input_list, split).search_many(keywords)
+
+    def _search_index(self, input_list: list,
+                      split: bool) -> LevenshteinIndex:
+        """Retorna o índice de busca da lista, construindo-o se preciso."""
+        indexes = self.__dict__.setdefault('_search_indexes', {})
+        key = (id(input_list), split)
+        index = indexes.get(key)
+        if index is None or not index.matches(input_list, split):
+            # Mantém apenas os índices das listas usadas mais recentemente
+            if len(indexes) >= 8:
+                indexes.pop(next(iter(indexes)))
+            index = indexes[key] = LevenshteinIndex(input_list, split)
+
+        return index
 
     def str_related(self, related_packages: list):
         """Formata mensagem de lista com buscas relacionadas.
@@ -1,3 +1,6 @@
+import re
+
+
 class YearsMixin:
     """Mixin que adiciona métodos relacionados a filtragem
     de pacotes e grupos por anos"""
@@ -22,3 +25,27 @@ class YearsMixin:
                 if str(year) in package_name:
                     return True
         return False
+
+    def year_of(self, package_name: str, years: list = None) -> int:
+        """Retorna o ano presente no nome do pacote.
+
+        Parâmetros
+        ----------
+        package_name: str
+            nome do pacote.
+        years: list
+            anos procurados. Se não informados, retorna o primeiro ano
+            entre 1900 e 2099 encontrado no nome.
+
+        Retorno
+        ----------
+        int
+            o ano encontrado ou None."""
+        if years:
+            for year in years:
+                if str(year) in package_name:
+                    return int(year)
+            return None
+
+        match = re.search(r'(?<!\d)(19|20)\d{2}(?!\d)', package_name)
+        return int(match.group()) if match else None
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import shutil
+
+
+class ContentStore:
+    """Armazenamento de arquivos endereçado pelo conteúdo.
+
+    Cada arquivo baixado é guardado uma única vez em
+    `<root>/<hash[:2]>/<hash>` e aparece nas pastas dos pacotes como um
+    hardlink para esse conteúdo: arquivos iguais, mesmo que venham de
+    urls ou pacotes diferentes, ocupam espaço em disco uma só vez. Se o
+    sistema de arquivos não permitir hardlinks (ex.: root em outro
+    disco), os arquivos são copiados.
+
+    Os hardlinks compartilham o conteúdo: um arquivo editado no lugar
+    altera também o conteúdo guardado e as demais pastas. Os downloads
+    seguintes não são afetados, pois substituem o arquivo em vez de
+    reescrevê-lo.
+
+    > Exemplo:
+        ufrn_data.store = ContentStore('/dados/.odufrn-store')
+        ufrn_data.download_groups(['ensino', 'pesquisa'])
+
+    Atributos
+    ---------
+    root: str
+        pasta onde os conteúdos são guardados.
+    algorithm: str
+        algoritmo de hash do hashlib usado como endereço
+        (por padrão, 'sha256').
+    """
+
+    def __init__(self, root: str, algorithm: str = 'sha256'):
+        self.root = root
+        self.algorithm = algorithm
+
+    def put(self, file_path: str) -> str:
+        """Guarda o conteúdo do arquivo, substituindo-o por um hardlink
+        para o conteúdo guardado, e retorna o seu hash.
+
+        Parâmetros
+        ----------
+        file_path: str
+            caminho do arquivo.
+        """
+        digest = self.digest(file_path)
+        blob_path = self.blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            try:
+                os.link(file_path, blob_path)
+                return digest
+            except FileExistsError:
+                pass
+            except OSError:
+                link_file(file_path, blob_path)
+                return digest
+
+        link_file(blob_path, file_path)
+        return digest
+
+    def digest(self, file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """Calcula o hash do conteúdo do arquivo."""
+        digest = hashlib.new(self.algorithm)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def blob_path(self, digest: str) -> str:
+        """Retorna o caminho do conteúdo com o hash informado."""
+        return os.path.join(self.root, digest[:2], digest)
+
+    def prune(self) -> int:
+        """Remove os conteúdos que não são mais usados por nenhum
+        arquivo (sem outros hardlinks) e retorna quantos foram
+        removidos."""
+        removed = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                blob_path = os.path.join(directory, name)
+                if os.stat(blob_path).st_nlink == 1:
+                    os.remove(blob_path)
+                    removed += 1
+
+        return removed
+
+
+def link_file(source: str, target: str, copy: bool = False):
+    """Faz de target um hardlink para source (ou uma cópia, se o
+    hardlink não for possível), substituindo target atomicamente.
+
+    Parâmetros
+    ----------
+    source: str
+        caminho do arquivo existente.
+    target: str
+        caminho do novo arquivo.
+    copy: bool
+        flag para sempre copiar o arquivo, de modo que target possa ser
+        editado sem alterar source (por padrão, False).
+    """
+    tmp_path = target + '.link'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    if not copy:
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            copy = True
+    if copy:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
@@ -0,0 +1,253 @@
+import csv
+import io
+import re
+
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:
+    pyarrow = None
+
+
+class CsvStream:
+    """Divide o conteúdo de um arquivo CSV, recebido em partes, em blocos
+    de registros completos, para que ele seja processado à medida que é
+    baixado, sem ser mantido inteiro em memória.
+
+    A codificação e o delimitador são detectados no primeiro bloco,
+    quando não informados: arquivos que não são UTF-8 válido são lidos
+    como Latin-1 (comum nos dados da UFRN), e o delimitador é o mais
+    frequente no cabeçalho entre ';', ',', tab e '|'. Os blocos são
+    entregues sempre em UTF-8, sem o cabeçalho.
+
+    > Exemplo:
+        stream = CsvStream()
+        for chunk in response.iter_content(64 * 1024):
+            for block in stream.feed(chunk):
+                ...
+        for block in stream.close():
+            ...
+
+    O arquivo é percorrido uma única vez, acompanhando as aspas entre
+    as chamadas de feed. Para que a memória continue limitada, um
+    registro maior que MAX_BLOCKS blocos (em geral, aspas que nunca são
+    fechadas) lança ValueError.
+
+    Atributos
+    ---------
+    block_size: int
+        tamanho mínimo, em bytes, de cada bloco (exceto o último).
+    encoding: str
+        codificação do arquivo (None para detectar).
+    delimiter: str
+        delimitador dos campos (None para detectar).
+    columns: list
+        nomes das colunas, lidos do cabeçalho.
+    """
+
+    DELIMITERS = (';', ',', '\t', '|')
+    MAX_BLOCKS = 4
+    _SPECIAL = re.compile(b'["\n]')
+
+    def __init__(self, block_size: int = 4 * 1024 * 1024,
+                 encoding: str = None, delimiter: str = None):
+        self.block_size = block_size
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.columns = None
+        self._buffer = bytearray()
+        # Posição até onde o buffer já foi percorrido, se ela está dentro
+        # de aspas e a última quebra de linha fora de aspas até ela
+        self._scanned = 0
+        self._quoted = False
+        self._end = -1
+
+    def feed(self, chunk: bytes) -> list:
+        """Recebe uma parte do arquivo e retorna os blocos completos.
+
+        Parâmetros
+        ----------
+        chunk: bytes
+            a parte do arquivo.
+        """
+        self._buffer += chunk
+        self._scan()
+        if len(self._buffer) < self.block_size:
+            return []
+
+        if self._end < 0:
+            if len(self._buffer) > self.MAX_BLOCKS * self.block_size:
+                raise ValueError(
+                    'Registro do CSV maior que {} bytes (aspas não '
+                    'fechadas?)'.format(self.MAX_BLOCKS * self.block_size)
+                )
+            return []
+
+        size = self._end + 1
+        block = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        # O corte é feito fora de aspas: o estado das aspas se mantém
+        self._scanned -= size
+        self._end = -1
+        return self._block(block)
+
+    def close(self) -> list:
+        """Retorna os blocos com o restante do arquivo."""
+        block = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._end = -1
+        if block and not block.endswith(b'\n'):
+            block += b'\n'
+        return self._block(block)
+
+    def read_arrow(self, block: bytes, schema: 'pyarrow.Schema' = None,
+                   infer_types: bool = True,
+                   columns: list = None) -> 'pyarrow.Table':
+        """Converte um bloco em uma tabela Arrow. Requer o pacote
+        `pyarrow` (pip install odufrn-downloader[arrow]).
+
+        Parâmetros
+        ----------
+        block: bytes
+            o bloco, retornado por feed ou close.
+        schema: pyarrow.Schema
+            tipos das colunas, normalmente o schema da tabela do
+            primeiro bloco; se None, os tipos são inferidos.
+        infer_types: bool
+            flag para inferir os tipos; com False, as colunas são texto
+            (por padrão, True).
+        columns: list
+            colunas a serem lidas (por padrão, todas).
+
+        Campos vazios são lidos como nulos, e colunas sem nenhum valor
+        no bloco são lidas como texto. Se um valor não couber no tipo da
+        coluna em schema (ex.: um código que passa a ter letras, ou um
+        decimal em uma coluna de inteiros), a coluna é ampliada para
+        double (se era de inteiros e os valores são números) ou para
+        texto: a tabela retornada tem então um schema diferente do
+        informado, e os blocos anteriores devem ser convertidos para ele.
+        """
+        if pyarrow is None:
+            raise ImportError(
+                'A leitura em Arrow requer o pacote pyarrow: '
+                'pip install odufrn-downloader[arrow]'
+            )
+
+        column_types = None
+        if schema is not None:
+            column_types = {field.name: field.type for field in schema}
+        elif not infer_types:
+            column_types = {name: pyarrow.string() for name in self.columns}
+
+        try:
+            table = self._read_csv(block, column_types, columns)
+        except pyarrow.ArrowInvalid:
+            if schema is None:
+                raise
+            return self._widen(block, schema, columns)
+
+        if schema is None:
+            # Colunas vazias no primeiro bloco podem ter texto nos demais
+            table = table.cast(pyarrow.schema([
+                field.with_type(pyarrow.string())
+                if pyarrow.types.is_null(field.type) else field
+                for field in table.schema
+            ]))
+
+        return table
+
+    def _read_csv(self, block: bytes, column_types: dict,
+                  columns: list) -> 'pyarrow.Table':
+        return pyarrow.csv.read_csv(
+            io.BytesIO(block),
+            read_options=pyarrow.csv.ReadOptions(column_names=self.columns),
+            parse_options=pyarrow.csv.ParseOptions(
+                delimiter=self.delimiter, newlines_in_values=True
+            ),
+            convert_options=pyarrow.csv.ConvertOptions(
+                column_types=column_types, include_columns=columns,
+                strings_can_be_null=True
+            ),
+        )
+
+    def _widen(self, block: bytes, schema: 'pyarrow.Schema',
+               columns: list) -> 'pyarrow.Table':
+        """Lê o bloco como texto e converte cada coluna para o tipo de
+        schema, ou para o tipo mais amplo em que os valores cabem."""
+        table = self._read_csv(
+            block, {name: pyarrow.string() for name in self.columns}, columns
+        )
+        fields = []
+        arrays = []
+        for field in schema:
+            kinds = [field.type, pyarrow.string()]
+            if pyarrow.types.is_integer(field.type):
+                kinds.insert(1, pyarrow.float64())
+            for kind in kinds:
+                try:
+                    array = table.column(field.name).cast(kind)
+                    break
+                except (pyarrow.ArrowInvalid,
+                        pyarrow.ArrowNotImplementedError):
+                    continue
+            fields.append(field.with_type(kind))
+            arrays.append(array)
+
+        return pyarrow.Table.from_arrays(arrays, schema=pyarrow.schema(fields))
+
+    def _block(self, block: bytes) -> list:
+        if not block:
+            return []
+
+        text = self._decode(block)
+        if self.columns is None:
+            header, _, text = text.partition('\n')
+            header = header.rstrip('\r')
+            if self.delimiter is None:
+                self.delimiter = max(self.DELIMITERS, key=header.count) \
+                    if any(d in header for d in self.DELIMITERS) else ';'
+            self.columns = next(csv.reader(
+                io.StringIO(header), delimiter=self.delimiter
+            ), [])
+
+        return [text.encode('utf-8')] if text.strip() else []
+
+    def _decode(self, block: bytes) -> str:
+        if self.encoding is None:
+            if block.startswith(b'\xef\xbb\xbf'):
+                self.encoding = 'utf-8-sig'
+            else:
+                try:
+                    block.decode('utf-8')
+                    self.encoding = 'utf-8'
+                except UnicodeDecodeError:
+                    self.encoding = 'latin-1'
+
+        try:
+            return block.decode(self.encoding)
+        except UnicodeDecodeError:
+            if not self.encoding.startswith('utf-8'):
+                raise
+            # O início do arquivo era apenas ASCII: segue em Latin-1
+            self.encoding = 'latin-1'
+            return block.decode(self.encoding)
+
+    def _scan(self):
+        """Percorre a parte nova do buffer, guardando a posição da última
+        quebra de linha que não está dentro de um campo entre aspas."""
+        start, self._scanned = self._scanned, len(self._buffer)
+        if not self._quoted and self._buffer.find(b'"', start) < 0:
+            # Caso comum: parte sem aspas
+            end = self._buffer.rfind(b'\n', start)
+            if end >= 0:
+                self._end = end
+            return
+
+        quoted = self._quoted
+        for match in self._SPECIAL.finditer(self._buffer, start):
+            if match.group() == b'"':
+                quoted = not quoted
+            elif not quoted:
+                self._end = match.start()
+        self._quoted = quoted
@@ -0,0 +1,263 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from .Monitor import Monitor
+from .RetryPolicy import RetryPolicy
+from .RunResult import RunResult
+
+
+class DownloadPool:
+    """Executa downloads em um conjunto limitado de threads, respeitando
+    um limite de downloads simultâneos por servidor.
+
+    Com workers=1 os downloads são feitos na própria thread, na ordem em
+    que são submetidos.
+
+    Uma url submetida mais de uma vez na mesma execução (ex.: um pacote
+    presente em vários grupos) é baixada apenas uma vez: as demais
+    submissões aguardam o primeiro download e reaproveitam o seu
+    resultado (ver submit).
+
+    Atributos
+    ---------
+    workers: int
+        quantidade máxima de downloads simultâneos.
+    max_per_host: int
+        quantidade máxima de downloads simultâneos para um mesmo servidor
+        (None para não haver limite).
+    records: list
+        registros dos downloads (ver RunResult).
+    retry: RetryPolicy
+        política de novas tentativas de cada download (None para não
+        haver novas tentativas).
+    monitor: Monitor
+        registro dos eventos de início, fim e falha de cada download
+        (por padrão, None).
+    previous: RunResult
+        resultado de uma execução anterior: os downloads concluídos nela
+        não são repetidos (por padrão, None).
+    options: dict
+        opções que valem para todos os downloads da execução
+        (ex.: sync).
+    """
+
+    def __init__(self, workers: int = 1, max_per_host: int = None,
+                 retry: RetryPolicy = None, monitor: Monitor = None,
+                 previous: RunResult = None, **options):
+        self.workers = max(1, workers)
+        self.max_per_host = max_per_host
+        self.retry = retry
+        self.monitor = monitor
+        self.options = options
+        self.records = []
+        self._completed = {}
+        if previous is not None:
+            for (url, target), record in previous.completed().items():
+                self._completed[url, self._target(target)] = record
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._pending = {}
+        self._futures = []
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(self.workers)
+
+    def submit(self, info: dict, url: str, fun, *args, target: str = None,
+               duplicate=None):
+        """Agenda fun(*args) para baixar a url. Se o download da url para
+        o mesmo destino foi concluído na execução anterior, e o arquivo
+        ainda existe, ele é apenas registrado como 'skipped'.
+
+        Parâmetros
+        ----------
+        info: dict
+            identificação do download, usada nos registros.
+        url: str
+            a url a ser baixada, usada no limite por servidor.
+        fun: callable
+            a função que realiza o download e retorna um dicionário com
+            os campos do registro (status, path e bytes).
+        target: str
+            destino do arquivo: o caminho, ou a chave no sink (por
+            padrão, None).
+        duplicate: callable
+            função chamada como `duplicate(record, *args)` quando a url
+            já foi submetida nesta execução, com o registro do primeiro
+            download concluído, em vez de baixar a url novamente. Se o
+            primeiro download falhar, fun é usada normalmente (por
+            padrão, None, que baixa a url em todas as submissões).
+        """
+        previous = self._completed.get((url, self._target(target)))
+        if previous is not None and self._still_done(previous):
+            self._add(dict(
+                info, url=url, status='skipped', path=previous.get('path'),
+                bytes=0, duration=0.0, retries=0
+            ))
+            return
+
+        task = (self._run, info, url, fun, args)
+        if duplicate is not None:
+            with self._lock:
+                first = self._pending.get(url)
+                if first is None:
+                    first = self._pending[url] = _Pending()
+                    task += (first,)
+                else:
+                    task = (self._run_duplicate, info, url, fun, args,
+                            duplicate, first)
+
+        if self._executor is None:
+            task[0](*task[1:])
+        else:
+            self._futures.append(self._executor.submit(*task))
+
+    def add_failure(self, info: dict, ex: Exception, **fields):
+        """Registra uma falha.
+
+        Parâmetros
+        ----------
+        info: dict
+            identificação do que falhou.
+        ex: Exception
+            a exceção ocorrida.
+        fields:
+            demais campos do registro.
+        """
+        self._add(dict(info, status='failed', error=ex, **fields))
+
+    @property
+    def failures(self) -> list:
+        """Registros das falhas ocorridas."""
+        return self.result().failures
+
+    def result(self) -> RunResult:
+        """Retorna o resultado dos downloads registrados até o momento."""
+        with self._lock:
+            return RunResult(list(self.records))
+
+    def wait(self) -> RunResult:
+        """Aguarda todos os downloads agendados e retorna o resultado."""
+        if self._executor is not None:
+            for future in self._futures:
+                future.result()
+            self._futures = []
+            self._executor.shutdown()
+
+        return self.result()
+
+    def _add(self, record: dict):
+        with self._lock:
+            self.records.append(record)
+
+    def _target(self, target: str) -> str:
+        """Normaliza o destino de um arquivo, para que caminhos relativos
+        e absolutos de um mesmo arquivo sejam iguais."""
+        if target is None or self.options.get('sink') is not None:
+            return target
+
+        return os.path.abspath(target)
+
+    def _still_done(self, record: dict) -> bool:
+        """Confere se o arquivo de um download concluído ainda existe.
+        Com um sink, a conferência depende de Sink.exists; se o sink não
+        souber responder, o registro anterior é considerado válido."""
+        sink = self.options.get('sink')
+        if not record.get('path'):
+            return True
+        if sink is not None:
+            return sink.exists(record['path']) is not False
+
+        return os.path.exists(record['path'])
+
+    def _host_limit(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(
+                    self.max_per_host or self.workers
+                )
+            return self._hosts[host]
+
+    def _run(self, info: dict, url: str, fun, args: tuple,
+             pending: '_Pending' = None):
+        attempts = []
+
+        def attempt():
+            attempts.append(1)
+            return self._limited(url, fun, args)
+
+        self._emit('download_start', info, url)
+        start = time.monotonic()
+        # As esperas entre tentativas ocorrem fora do limite por servidor
+        try:
+            if self.retry is None:
+                outcome = attempt()
+            else:
+                outcome = self.retry.call(attempt)
+        except Exception as ex:
+            self.add_failure(
+                info, ex, url=url, duration=time.monotonic() - start,
+                retries=len(attempts) - 1
+            )
+            self._emit('download_failure', info, url, error=ex)
+        else:
+            record = dict(info, url=url, status='ok', path=None, bytes=0)
+            record.update(outcome or {})
+            record.update(duration=time.monotonic() - start,
+                          retries=len(attempts) - 1)
+            self._add(record)
+            self._emit('download_end', info, url, status=record['status'])
+            if pending is not None:
+                pending.record = record
+        finally:
+            if pending is not None:
+                pending.done.set()
+
+    def _run_duplicate(self, info: dict, url: str, fun, args: tuple,
+                       duplicate, first: '_Pending'):
+        """Aguarda o primeiro download da url e reaproveita o seu
+        resultado, ou baixa a url se ele tiver falhado."""
+        # O primeiro download foi submetido antes e, portanto, já está
+        # em execução (ou concluído) quando esta tarefa começa
+        first.done.wait()
+        if first.record is None:
+            self._run(info, url, fun, args)
+            return
+
+        start = time.monotonic()
+        try:
+            outcome = duplicate(first.record, *args)
+        except Exception as ex:
+            self.add_failure(
+                info, ex, url=url, duration=time.monotonic() - start,
+                retries=0
+            )
+        else:
+            record = dict(info, url=url, status='linked', path=None, bytes=0)
+            record.update(outcome or {})
+            record.update(duration=time.monotonic() - start, retries=0)
+            self._add(record)
+
+    def _emit(self, event: str, info: dict, url: str, **data):
+        if self.monitor is not None:
+            self.monitor.emit(event, url=url, **dict(info, **data))
+
+    def _limited(self, url: str, fun, args: tuple):
+        with self._host_limit(url):
+            return fun(*args)
+
+    def __enter__(self) -> 'DownloadPool':
+        return self
+
+    def __exit__(self, *args):
+        self.wait()
+
+
+class _Pending:
+    """Primeiro download de uma url na execução (ver DownloadPool.submit)."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.record = None
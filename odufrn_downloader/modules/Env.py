@@ -1,7 +1,11 @@
 from abc import ABC
+from contextlib import contextmanager
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import pprint
+import time
+from .RetryPolicy import RetryPolicy
 
 
 class Env(ABC):
@@ -14,6 +18,40 @@ class Env(ABC):
         a url para a API de dados abertos da UFRN.
     url_action: str
         a url para a página de ações da API.
+    cache: MetadataCache
+        cache opcional das respostas de metadados (por padrão, None).
+    max_per_host: int
+        quantidade máxima de downloads simultâneos para um mesmo
+        servidor (por padrão, 4).
+    chunk_size: int
+        tamanho, em bytes, das partes escritas em disco durante
+        o download (por padrão, 64 KiB).
+    session: requests.Session
+        sessão usada em todas as requisições, que mantém as conexões
+        abertas entre elas. Pode ser substituída por uma sessão
+        personalizada (ex.: com proxies).
+    scheduler: RequestScheduler
+        controle opcional da taxa e da concorrência das requisições a
+        cada servidor (por padrão, None). Quando definido, substitui
+        max_per_host como limite de requisições simultâneas.
+    timeout: tuple
+        tempos máximos, em segundos, para estabelecer a conexão e para
+        aguardar dados do servidor (por padrão, (10, 60)).
+    retry: RetryPolicy
+        política de novas tentativas das consultas de metadados e de
+        cada download (None para não haver novas tentativas).
+    monitor: Monitor
+        registro opcional dos eventos de requisições e downloads, com
+        estatísticas da execução (por padrão, None).
+    store: ContentStore
+        armazenamento opcional endereçado pelo conteúdo: arquivos
+        baixados com o mesmo conteúdo são gravados no disco uma única
+        vez e ligados às pastas dos pacotes (por padrão, None).
+    link_duplicates: bool
+        flag para ligar por hardlink os arquivos de uma url repetida na
+        execução (por padrão, True). Os hardlinks compartilham o
+        conteúdo: editar um deles no lugar altera todos. Com False, cada
+        ocorrência recebe uma cópia.
     """
 
     """Constante com mensagens de erros"""
@@ -26,10 +64,88 @@ class Env(ABC):
         'none_package': 'Nenhum pacote foi encontrado',
     }
 
+    """Atributos compartilhados com instâncias internas (ex.: Tag)"""
+    SHARED_ATTRS = ('_catalog', 'url_base', 'warnings', 'cache', 'session',
+                    'scheduler', 'timeout', 'retry', 'monitor', 'store',
+                    'link_duplicates')
+
     def __init__(self):
         self.url_base = 'http://dados.ufrn.br/'
-        self.url_action = self.url_base + 'api/action/'
         self.warnings = False
+        self.cache = None
+        self.max_per_host = 4
+        self.chunk_size = 64 * 1024
+        self.scheduler = None
+        self.timeout = (10, 60)
+        self.retry = RetryPolicy()
+        self.monitor = None
+        self.store = None
+        self.link_duplicates = True
+        self._catalog = {}
+        self._session = None
+        self._session_pool_size = 0
+        self._custom_session = False
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            self._custom_session = False
+            self._resize_session(self._host_limit())
+
+        return self._session
+
+    @session.setter
+    def session(self, value: requests.Session):
+        self._session = value
+        self._custom_session = True
+
+    @property
+    def url_action(self) -> str:
+        return self.url_base + 'api/action/'
+
+    def _resize_session(self, pool_size: int):
+        """Garante que a sessão padrão mantenha ao menos pool_size
+        conexões abertas por servidor. Sessões personalizadas não são
+        alteradas.
+
+        Parâmetros
+        ----------
+        pool_size: int
+            quantidade de conexões por servidor.
+        """
+        if self._custom_session or pool_size <= self._session_pool_size:
+            return
+
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._session_pool_size = pool_size
+
+    def _host_limit(self) -> int:
+        """Retorna o limite de requisições simultâneas por servidor."""
+        if self.scheduler is not None:
+            return self.scheduler.max_concurrency
+
+        return self.max_per_host
+
+    def _emit(self, event: str, **data):
+        """Envia um evento ao monitor, se houver (ver Monitor)."""
+        if self.monitor is not None:
+            self.monitor.emit(event, **data)
+
+    def _share_env(self, other: 'Env') -> 'Env':
+        """Faz com que outra instância use o mesmo catálogo e
+        configuração desta.
+
+        Parâmetros
+        ----------
+        other: Env
+            instância que passará a compartilhar o estado."""
+        for attr in self.SHARED_ATTRS:
+            setattr(other, attr, getattr(self, attr))
+
+        return other
 
     def _print_exception(self, ex: Exception,
                          msg: str = MSG_ERRORS['download_error']):
@@ -37,6 +153,26 @@ class Env(ABC):
         print('\033[91m{}\033[0m'.format(type(ex).__name__))
         print(msg)
 
+    def _report_failures(self, failures: list) -> list:
+        """Imprime as falhas ocorridas em um download e as retorna."""
+        for failure in failures:
+            self._print_exception(failure['error'])
+
+        return failures
+
+    def _report_result(self, result):
+        """Imprime as falhas de um RunResult e o retorna."""
+        self._report_failures(result.failures)
+        return result
+
+    def _range_start(self, response) -> int:
+        """Retorna o byte inicial de uma resposta parcial (206)."""
+        content_range = response.headers.get('Content-Range', '')
+        try:
+            return int(content_range.split()[1].split('-')[0])
+        except (IndexError, ValueError):
+            return -1
+
     def _print_not_found(self, name: str, type_name: str):
         """Imprime mensagem padrão para nomes de dados não encontrados.
         """
@@ -54,20 +190,52 @@ class Env(ABC):
         pp = pprint.PrettyPrinter(indent=4)
         pp.pprint(variable)
 
-    def _load_list(self, option: str) -> list:
+    def _load_list(self, option: str, refresh: bool = False) -> list:
         """Atualiza a lista desejada através de uma consulta.
 
         Parâmetros
         ----------
         option: str
             indica o que se deseja consultar pelo request.
+        refresh: bool
+            flag para ignorar o cache e consultar a API (por padrão, False).
         """
         try:
-            packages = requests.get(self.url_action + option).json()
+            packages = self._cached_get(self.url_action + option, refresh)
             return packages['result']
         except Exception as ex:
             self._print_exception(ex)
 
+    def _refresh_catalog(self, option: str, refresh: bool = True) -> list:
+        """Consulta novamente a lista desejada e a guarda no catálogo.
+
+        Parâmetros
+        ----------
+        option: str
+            indica o que se deseja consultar pelo request.
+        refresh: bool
+            flag para ignorar o cache e consultar a API (por padrão, True).
+        """
+        result = self._load_list(option, refresh)
+        if result is not None:
+            self._catalog[option] = result
+
+        return result
+
+    def _get_catalog(self, option: str) -> list:
+        """Retorna a lista desejada do catálogo, consultando-a apenas
+        no primeiro acesso.
+
+        Parâmetros
+        ----------
+        option: str
+            indica o que se deseja consultar pelo request.
+        """
+        if option not in self._catalog:
+            return self._refresh_catalog(option, refresh=False)
+
+        return self._catalog[option]
+
     def _make_dir(self, path: str) -> str:
         """Cria o diretório, caso ele não exista.
 
@@ -80,7 +248,46 @@ class Env(ABC):
 
         return path
 
-    def _request_get(self, url: str) -> dict:
+    def _check_size(self, resource: dict, file_path: str):
+        """Confere o tamanho do arquivo baixado com o informado nos
+        metadados do recurso, descartando-o se forem diferentes.
+
+        Parâmetros
+        ----------
+        resource: dict
+            o recurso do pacote.
+        file_path: str
+            o caminho do arquivo baixado.
+        """
+        try:
+            self._check_length(resource, os.path.getsize(file_path))
+        except IOError:
+            os.remove(file_path)
+            raise
+
+    def _check_length(self, resource: dict, size: int):
+        """Confere a quantidade de bytes recebida com o tamanho informado
+        nos metadados do recurso, lançando IOError se forem diferentes.
+
+        Parâmetros
+        ----------
+        resource: dict
+            o recurso do pacote.
+        size: int
+            a quantidade de bytes recebida.
+        """
+        try:
+            expected = int(resource.get('size'))
+        except (TypeError, ValueError):
+            return
+
+        if size != expected:
+            raise IOError(
+                'Tamanho de {} ({} bytes) difere do esperado ({} bytes)'
+                .format(resource['name'], size, expected)
+            )
+
+    def _request_get(self, url: str, refresh: bool = False) -> dict:
         """Realiza a requisição desejada e retorna os dados
         e o caminho formado para download.
 
@@ -88,11 +295,102 @@ class Env(ABC):
         ----------
         url: str
             a url que se deseja realizar a requisição.
+        refresh: bool
+            flag para ignorar o cache e consultar a API (por padrão, False).
 
         Retorno
         ----------
         dict:
             a resposta da requisição em json (dicionário)."""
-        request_get = requests.get(url)
+        return self._cached_get(url, refresh)
+
+    def _cached_get(self, url: str, refresh: bool = False):
+        """Consulta a url no cache, se houver, e na API caso
+        contrário, guardando a resposta obtida.
+
+        Parâmetros
+        ----------
+        url: str
+            a url que se deseja realizar a requisição.
+        refresh: bool
+            flag para ignorar o cache e consultar a API (por padrão, False).
+        """
+        start = time.monotonic()
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(url)
+            if cached is not None:
+                self._emit('metadata', url=url, cached=True,
+                           duration=time.monotonic() - start)
+                return cached
+
+        try:
+            if self.retry is None:
+                data, ok = self._get_json(url)
+            else:
+                data, ok = self.retry.call(self._get_json, url)
+        except Exception as ex:
+            self._emit('metadata', url=url, cached=None,
+                       duration=time.monotonic() - start, error=ex)
+            raise
+
+        if self.cache is not None and ok:
+            self.cache.set(url, data)
+        self._emit('metadata', url=url,
+                   cached=False if self.cache is not None else None,
+                   duration=time.monotonic() - start)
+
+        return data
+
+    def _get_json(self, url: str) -> tuple:
+        """Consulta a url e retorna a resposta em json e se ela foi bem
+        sucedida. Respostas 429 e 5xx lançam HTTPError."""
+        with self._get(url) as response:
+            if response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()
+            return response.json(), response.ok
+
+    @contextmanager
+    def _get(self, url: str, **kwargs):
+        """Realiza uma requisição GET pela sessão, aguardando a vez da
+        requisição no scheduler, se houver, e informando-o da resposta.
+        A vez é mantida até o fim do bloco, enquanto o corpo da resposta
+        é lido.
+
+        > Exemplo:
+            with self._get(url, stream=True) as response:
+                ...
+
+        Parâmetros
+        ----------
+        url: str
+            a url que se deseja realizar a requisição.
+        kwargs:
+            argumentos repassados a session.get (por padrão, com o
+            timeout da instância).
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if self.scheduler is None:
+            with self._timed_get(url, kwargs) as response:
+                yield response
+            return
+
+        with self.scheduler.slot(url) as slot:
+            response = self._timed_get(url, kwargs)
+            slot.record(response)
+            with response:
+                yield response
+
+    def _timed_get(self, url: str, kwargs: dict) -> requests.Response:
+        """Realiza a requisição GET, enviando ao monitor o evento
+        'request' com a sua duração até o recebimento dos cabeçalhos."""
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, **kwargs)
+        except Exception as ex:
+            self._emit('request', url=url, status=None,
+                       duration=time.monotonic() - start, error=ex)
+            raise
 
-        return request_get.json()
+        self._emit('request', url=url, status=response.status_code,
+                   duration=time.monotonic() - start)
+        return response
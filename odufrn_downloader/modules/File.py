@@ -1,5 +1,7 @@
 import os
 from .Package import Package
+from .RunResult import RunResult
+from ..sinks.Sink import Sink
 
 
 class File(Package):
@@ -9,7 +11,10 @@ class File(Package):
         super().__init__()
 
     def download_from_file(self, filename: str, path: str = os.getcwd(),
-                           dictionary: bool = True, years: list = None):
+                           dictionary: bool = True, years: list = None,
+                           workers: int = 1, sync: bool = False,
+                           sink: Sink = None,
+                           previous: RunResult = None) -> RunResult:
         """Baixa os pacotes de dados que estão escritos
         em um arquivo de texto.
 
@@ -27,12 +32,33 @@ class File(Package):
         years: list
             define os anos dos dados que serão baixados, se existir
             realiza-se o download
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<pacote>/<nome>.<formato>` (por padrão,
+            None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
+
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
         """
         try:
             with open(filename, 'r') as file:
-                for packageName in file:
-                    self.download_package(
-                        packageName.rstrip(), path, dictionary, years
-                    )
+                packages = [name.rstrip() for name in file]
         except IOError as ex:
             self._print_exception(ex)
+            return RunResult()
+
+        return self.download_packages(
+            packages, path, dictionary, years, workers, sync, sink,
+            previous
+        )
@@ -1,5 +1,9 @@
 import os
 from .Package import Package
+from .DownloadPool import DownloadPool
+from .Resource import Resource
+from .RunResult import RunResult
+from ..sinks.Sink import Sink
 
 
 class Group(Package):
@@ -17,13 +21,21 @@ class Group(Package):
     def __init__(self):
         super().__init__()
 
-        self.url_group = self.url_base + 'api/rest/group/'
-        self.available_groups = []
-        self.load_groups()
+    @property
+    def url_group(self) -> str:
+        return self.url_base + 'api/rest/group/'
+
+    @property
+    def available_groups(self) -> list:
+        return self._get_catalog('group_list')
+
+    @available_groups.setter
+    def available_groups(self, value: list):
+        self._catalog['group_list'] = value
 
     def load_groups(self):
         """Atualiza lista de grupos de pacotes disponíveis."""
-        self.available_groups = self._load_list('group_list')
+        self._refresh_catalog('group_list')
 
     def print_groups(self):
         """Imprime os grupos de pacotes."""
@@ -43,12 +55,13 @@ class Group(Package):
             print("O grupo de dados \"{}\" não foi encontrado.".format(name))
             return
 
-        response = self._request_get(self.url_group + name)
-
-        return response['packages']
+        return self._get_group_packages(name)
 
     def download_group(self, name: str, path: str = os.getcwd(),
-                       dictionary: bool = True, years: list = None):
+                       dictionary: bool = True, years: list = None,
+                       workers: int = 1, sync: bool = False,
+                       sink: Sink = None,
+                       previous: RunResult = None) -> RunResult:
         """Exibe grupo de pacotes de acordo com seu nome
         e baixa-os em pastas com o nome do respectivo
         grupo de dados.
@@ -67,25 +80,36 @@ class Group(Package):
             (por padrão, a pasta atual).
         dictionary: bool
             flag para baixar o dicionário dos dados (por padrão, True).
-        """
-
-        # Checa se o grupo está disponível
-        if not (name in self.available_groups) and self.warnings:
-            self._print_not_found(name, 'Grupo')
-            return
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<grupo>/<pacote>/<nome>.<formato>`
+            (por padrão, None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
 
-        groups = self._request_get(self.url_group + name)
-        path = self._make_dir('{}/{}'.format(path, name))
-
-        try:
-            for package in groups['packages']:
-                self.download_package(package, path, dictionary, years)
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
+        """
+        with self._download_pool(workers, path, sync, sink,
+                                 previous) as pool:
+            self._download_group(name, path, dictionary, years, pool)
 
-        except Exception as ex:
-            self._print_exception(ex)
+        return self._report_result(pool.wait())
 
     def download_groups(self, groups: list, path: str = os.getcwd(),
-                        dictionary: bool = True, years: list = None):
+                        dictionary: bool = True, years: list = None,
+                        workers: int = 1, sync: bool = False,
+                        sink: Sink = None,
+                        previous: RunResult = None) -> RunResult:
         """Exibe os grupos de pacotes de acordo com seu nome
         e baixa-os em pastas com o nome do respectivo
         grupo de dados.
@@ -104,10 +128,154 @@ class Group(Package):
             (por padrão, a pasta atual).
         dictionary: bool
             flag para baixar o dicionário dos dados (por padrão, True).
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<grupo>/<pacote>/<nome>.<formato>`
+            (por padrão, None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
+
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
+        """
+        with self._download_pool(workers, path, sync, sink,
+                                 previous) as pool:
+            for group in groups:
+                self._download_group(group, path, dictionary, years, pool)
+
+        return self._report_result(pool.wait())
+
+    def _get_group_packages(self, name: str, refresh: bool = False) -> list:
+        """Retorna os pacotes do grupo, do catálogo carregado por
+        load_catalog se houver, ou da API caso contrário.
+
+        Parâmetros
+        ----------
+        name: str
+            nome do grupo.
+        refresh: bool
+            flag para ignorar o catálogo e o cache e consultar a API
+            (por padrão, False).
+        """
+        groups = self._catalog.get('group_packages')
+        if groups is not None and name in groups and not refresh:
+            return groups[name]
+
+        return self._request_get(self.url_group + name, refresh)['packages']
+
+    def _download_group(self, name: str, path: str, dictionary: bool,
+                        years: list, pool: DownloadPool):
+        """Agenda no pool os downloads dos pacotes de um grupo.
+
+        Parâmetros
+        ----------
+        name: str
+            nome do grupo.
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos.
+        dictionary: bool
+            flag para baixar o dicionário dos dados.
+        years: list
+            define os anos dos dados que serão baixados.
+        pool: DownloadPool
+            executor que realizará os downloads.
+        """
+        # Checa se o grupo está disponível
+        if not (name in self.available_groups) and self.warnings:
+            self._print_not_found(name, 'Grupo')
+            return
+
+        try:
+            packages = self._get_group_packages(
+                name, pool.options.get('refresh', False)
+            )
+        except Exception as ex:
+            pool.add_failure({'group': name}, ex)
+            return
+
+        path = self._pool_dir(path, name, pool)
+        self._download_packages(packages, path, dictionary, years, pool)
+
+    def iter_resources(self, packages: list = None, groups: list = None,
+                       tags: list = None, years: list = None,
+                       dictionary: bool = True):
+        """Percorre os recursos dos pacotes desejados, sem baixá-los.
+
+        Os pacotes são consultados um a um, à medida que a iteração avança,
+        e cada pacote é percorrido uma única vez, mesmo que pertença a mais
+        de um grupo ou etiqueta. Se nenhum filtro de pacotes, grupos ou
+        etiquetas for informado, percorre todos os pacotes disponíveis.
+
+        > Exemplo:
+            for resource in iter_resources(groups=['ensino'], years=[2019]):
+                print(resource.package, resource.url)
+
+        Parâmetros
+        ----------
+        packages: list
+            nomes dos pacotes.
+        groups: list
+            nomes dos grupos cujos pacotes serão percorridos.
+        tags: list
+            nomes das etiquetas cujos pacotes serão percorridos.
+        years: list
+            define os anos dos recursos que serão retornados.
+        dictionary: bool
+            flag para retornar os dicionários dos dados (por padrão, True).
+
+        Retorno
+        -------
+        gerador de Resource.
         """
+        for name in self._iter_package_names(packages, groups, tags):
+            try:
+                metadata = self._get_package(name)
+                resources = metadata['resources']
+            except Exception as ex:
+                self._print_exception(ex)
+                continue
+
+            for resource in resources:
+                if not self._check_resource(resource, dictionary, years):
+                    continue
+                try:
+                    size = int(resource.get('size'))
+                except (TypeError, ValueError):
+                    size = None
+                yield Resource(
+                    package=name,
+                    name=resource['name'],
+                    format=resource['format'].lower(),
+                    url=resource['url'],
+                    size=size,
+                    year=self.year_of(resource['name'], years),
+                )
+
+    def _iter_package_names(self, packages: list, groups: list,
+                            tags: list):
+        """Gera, sem repetições, os nomes dos pacotes informados, dos
+        pacotes dos grupos e dos pacotes das etiquetas."""
+        if packages is None and groups is None and tags is None:
+            packages = self.available_packages
 
-        for group in groups:
-            self.download_group(group, path, dictionary, years)
+        seen = set()
+        sources = [iter(packages or [])]
+        sources += [self._get_group_packages(name) for name in groups or []]
+        sources += [self.tag.get_packages_by_tag(key) for key in tags or []]
+        for source in sources:
+            for name in source:
+                if name not in seen:
+                    seen.add(name)
+                    yield name
 
     def search_related_groups(self, keyword: str,
                               simple_filter: bool = False) -> list:
@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class MetadataCache:
+    """Cache persistente, em sqlite, das respostas de metadados da API.
+
+    As respostas são indexadas pela url consultada. Qualquer objeto com
+    os métodos `get(url)` e `set(url, value)` pode ser usado no lugar
+    desta classe como cache do pacote.
+
+    > Exemplo:
+        ufrn_data.cache = MetadataCache('~/.odufrn/cache.db', ttl=3600)
+
+    Atributos
+    ---------
+    path: str
+        caminho do arquivo sqlite (':memory:' para um cache em memória).
+    ttl: float
+        tempo, em segundos, que uma resposta permanece válida
+        (None para nunca expirar).
+    max_size: int
+        tamanho máximo, em bytes, das respostas guardadas. Ao ultrapassá-lo
+        as respostas usadas há mais tempo são removidas (None para não
+        haver limite).
+    hits: int
+        quantidade de consultas atendidas pelo cache.
+    misses: int
+        quantidade de consultas que não estavam no cache ou expiraram.
+    """
+
+    def __init__(self, path: str = ':memory:', ttl: float = None,
+                 max_size: int = None):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'size INTEGER NOT NULL, stored_at REAL NOT NULL, '
+            'accessed_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+        self._last_access = self._conn.execute(
+            'SELECT COALESCE(MAX(accessed_at), 0) FROM responses'
+        ).fetchone()[0]
+
+    def get(self, url: str):
+        """Retorna a resposta guardada para a url ou None, caso ela não
+        exista ou tenha expirado.
+
+        Parâmetros
+        ----------
+        url: str
+            a url consultada.
+        """
+        with self._lock:
+            now = self._tick()
+            row = self._conn.execute(
+                'SELECT value, stored_at FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                'UPDATE responses SET accessed_at = ? WHERE url = ?',
+                (now, url)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, url: str, value):
+        """Guarda a resposta da url, removendo as entradas menos usadas
+        caso o limite de tamanho seja ultrapassado.
+
+        Parâmetros
+        ----------
+        url: str
+            a url consultada.
+        value:
+            a resposta da requisição em json.
+        """
+        data = json.dumps(value)
+        with self._lock:
+            now = self._tick()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (url, data, len(data), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self):
+        """Remove todas as respostas guardadas."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Retorna as estatísticas de uso do cache."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'size': size,
+        }
+
+    def _tick(self) -> float:
+        # Instante estritamente crescente, para desempatar o LRU
+        self._last_access = max(time.time(), self._last_access + 1e-6)
+        return self._last_access
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _evict(self):
+        if self.max_size is None:
+            return
+
+        total = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()[0]
+        rows = self._conn.execute(
+            'SELECT url, size FROM responses ORDER BY accessed_at, rowid'
+        ).fetchall()
+        for url, size in rows:
+            if total <= self.max_size:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
@@ -0,0 +1,241 @@
+import json
+import random
+import threading
+import time
+
+
+class Monitor:
+    """Registra os eventos das requisições e downloads e calcula
+    estatísticas agregadas da execução.
+
+    Eventos (nome e campos de data):
+
+    - request: url, status (None em erro de conexão), duration
+      (segundos até o recebimento dos cabeçalhos) e error, se houver.
+    - metadata: url, cached (se veio do cache), duration e error,
+      se houver.
+    - download_start: package, resource e url.
+    - download_progress: resource, url e bytes recebidos na parte.
+    - download_end: package, resource, url, status ('ok' ou
+      'unchanged'), bytes e duration.
+    - download_failure: package, resource, url, bytes, duration e error.
+
+    Os eventos de um download são associados pelo campo task, se houver
+    (no download assíncrono), ou pela thread e pela url: downloads
+    simultâneos da mesma url não se misturam. Apenas os downloads com
+    status 'ok' contam como arquivos baixados.
+
+    Os percentis são calculados sobre uma amostra aleatória uniforme
+    (reservoir sampling) de até RESERVOIR_SIZE valores, de modo que a
+    memória usada não cresce com a duração da execução; as somas e as
+    contagens consideram todos os valores.
+
+    > Exemplo:
+        monitor = Monitor()
+        monitor.subscribe(lambda event, data: print(event, data))
+        ufrn_data.monitor = monitor
+        ufrn_data.download_group('ensino')
+        print(monitor.to_prometheus())
+
+    Atributos
+    ---------
+    listeners: list
+        funções chamadas como `listener(event, data)` a cada evento.
+    """
+
+    PERCENTILES = (50, 90, 99)
+    RESERVOIR_SIZE = 1024
+
+    def __init__(self):
+        self.listeners = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def subscribe(self, listener):
+        """Registra uma função a ser chamada a cada evento.
+
+        Parâmetros
+        ----------
+        listener: callable
+            função chamada como `listener(event, data)`.
+        """
+        self.listeners.append(listener)
+
+    def reset(self):
+        """Zera as estatísticas, iniciando uma nova execução."""
+        with self._lock:
+            self._started = None
+            self._finished = None
+            self._counters = {
+                'requests': 0, 'request_errors': 0, 'metadata': 0,
+                'cache_hits': 0, 'cache_misses': 0, 'files': 0,
+                'unchanged': 0, 'failures': 0, 'bytes': 0,
+            }
+            self._request_latencies = _Reservoir(self.RESERVOIR_SIZE)
+            self._download_durations = _Reservoir(self.RESERVOIR_SIZE)
+            self._downloads = {}
+
+    def emit(self, event: str, **data):
+        """Registra um evento e o repassa aos listeners.
+
+        Parâmetros
+        ----------
+        event: str
+            nome do evento.
+        data:
+            campos do evento.
+        """
+        with self._lock:
+            self._record(event, data)
+        for listener in self.listeners:
+            listener(event, data)
+
+    def stats(self) -> dict:
+        """Retorna as estatísticas da execução: contadores, duração,
+        taxa de transferência e percentis, soma e contagem das latências
+        das requisições e das durações dos downloads (em segundos)."""
+        with self._lock:
+            stats = dict(self._counters)
+            elapsed = 0.0
+            if self._started is not None:
+                elapsed = self._finished - self._started
+            stats['elapsed'] = elapsed
+            stats['bytes_per_second'] = \
+                stats['bytes'] / elapsed if elapsed else 0.0
+            for name, reservoir in (
+                    ('request_latency', self._request_latencies),
+                    ('download_duration', self._download_durations)):
+                stats[name] = percentiles(reservoir.values, self.PERCENTILES)
+                stats[name + '_sum'] = reservoir.sum
+                stats[name + '_count'] = reservoir.count
+
+        return stats
+
+    def to_json(self) -> str:
+        """Retorna as estatísticas da execução em json."""
+        return json.dumps(self.stats(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = 'odufrn') -> str:
+        """Retorna as estatísticas da execução no formato de texto do
+        Prometheus.
+
+        Parâmetros
+        ----------
+        prefix: str
+            prefixo dos nomes das métricas (por padrão, 'odufrn').
+        """
+        stats = self.stats()
+        lines = []
+        for name in sorted(self._counters):
+            lines.append('# TYPE {}_{}_total counter'.format(prefix, name))
+            lines.append('{}_{}_total {}'.format(prefix, name, stats[name]))
+
+        for name in ('elapsed', 'bytes_per_second'):
+            lines.append('# TYPE {}_{} gauge'.format(prefix, name))
+            lines.append('{}_{} {}'.format(prefix, name, stats[name]))
+
+        for name in ('request_latency', 'download_duration'):
+            metric = '{}_{}_seconds'.format(prefix, name)
+            lines.append('# TYPE {} summary'.format(metric))
+            for percentile, value in sorted(stats[name].items()):
+                lines.append('{}{{quantile="{}"}} {}'.format(
+                    metric, percentile / 100, value
+                ))
+            lines.append('{}_sum {}'.format(metric, stats[name + '_sum']))
+            lines.append('{}_count {}'.format(metric,
+                                              stats[name + '_count']))
+
+        return '\n'.join(lines) + '\n'
+
+    def _record(self, event: str, data: dict):
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        self._finished = now
+        counters = self._counters
+
+        if event == 'request':
+            counters['requests'] += 1
+            if data.get('error') is not None:
+                counters['request_errors'] += 1
+            else:
+                self._request_latencies.add(data['duration'])
+        elif event == 'metadata':
+            counters['metadata'] += 1
+            if data.get('cached'):
+                counters['cache_hits'] += 1
+            elif data.get('cached') is not None:
+                counters['cache_misses'] += 1
+        elif event == 'download_start':
+            self._downloads[self._task(data)] = [now, 0]
+        elif event == 'download_progress':
+            counters['bytes'] += data['bytes']
+            task = self._task(data)
+            if task in self._downloads:
+                self._downloads[task][1] += data['bytes']
+        elif event in ('download_end', 'download_failure'):
+            started, size = self._downloads.pop(self._task(data), (now, 0))
+            data['bytes'] = size
+            data['duration'] = now - started
+            if event == 'download_failure':
+                counters['failures'] += 1
+            elif data.setdefault('status', 'ok') == 'ok':
+                counters['files'] += 1
+                self._download_durations.add(data['duration'])
+            elif data['status'] == 'unchanged':
+                counters['unchanged'] += 1
+
+    def _task(self, data: dict):
+        """Retorna a chave do download a que o evento pertence."""
+        if data.get('task') is not None:
+            return data['task']
+
+        return threading.get_ident(), data['url']
+
+
+class _Reservoir:
+    """Amostra aleatória uniforme de tamanho limitado de uma sequência de
+    valores (algoritmo R), com a soma e a contagem de todos eles."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = []
+        self.count = 0
+        self.sum = 0.0
+        self._random = random.Random()
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        if len(self.values) < self.size:
+            self.values.append(value)
+            return
+
+        index = self._random.randrange(self.count)
+        if index < self.size:
+            self.values[index] = value
+
+
+def percentiles(values: list, ranks: tuple) -> dict:
+    """Calcula os percentis (pelo método do posto mais próximo) de uma
+    lista de valores.
+
+    Parâmetros
+    ----------
+    values: list
+        os valores.
+    ranks: tuple
+        os percentis desejados, entre 0 e 100.
+
+    Retorno
+    -------
+    dicionário {percentil: valor} (vazio se não houver valores).
+    """
+    if not values:
+        return {}
+
+    values = sorted(values)
+    return {
+        rank: values[max(0, -(-rank * len(values) // 100) - 1)]
+        for rank in ranks
+    }
@@ -1,8 +1,20 @@
+import hashlib
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .Env import Env
 from ..mixins.FilterMixin import FilterMixin
 from .Tag import Tag
+from .DownloadPool import DownloadPool
+from .RunResult import RunResult
+from .SyncManifest import SyncManifest
+from .ContentStore import link_file
+from .CsvStream import CsvStream
+from ..sinks.Sink import Sink
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 
 class Package(Env, FilterMixin):
@@ -15,27 +27,103 @@ class Package(Env, FilterMixin):
     available_packages: list
         lista de pacotes de dados que estão disponíveis para download.
     tag: Tag
-        instância da classe Tag usada na classe.
+        instância da classe Tag usada na classe, que compartilha
+        o catálogo desta instância.
+
+    As listas de disponíveis são consultadas apenas no primeiro acesso.
     """
 
     def __init__(self):
         super().__init__()
 
-        self.url_package = self.url_base + 'api/rest/dataset/'
-        self.available_packages = []
-        self.load_packages()
-        self.tag = Tag()
+        self._tag = None
+
+    @property
+    def url_package(self) -> str:
+        return self.url_base + 'api/rest/dataset/'
+
+    @property
+    def available_packages(self) -> list:
+        return self._get_catalog('package_list')
+
+    @available_packages.setter
+    def available_packages(self, value: list):
+        self._catalog['package_list'] = value
+
+    @property
+    def tag(self) -> Tag:
+        # Quando a própria instância já é uma Tag (ex.: ODUFRNDownloader),
+        # reaproveita-a em vez de criar uma nova.
+        if isinstance(self, Tag):
+            return self
+
+        if self._tag is None:
+            self._tag = Tag()
+
+        return self._share_env(self._tag)
 
     def load_packages(self):
         """Atualiza lista de pacotes disponíveis."""
-        self.available_packages = self._load_list('package_list')
+        self._refresh_catalog('package_list')
+
+    def load_catalog(self, rows: int = 1000):
+        """Carrega os metadados de todos os pacotes (recursos, etiquetas e
+        grupos) em poucas consultas paginadas ao `package_search`.
+
+        Enquanto o catálogo estiver carregado, os métodos de download e de
+        listagem de arquivos não consultam a API para cada pacote, e as
+        consultas por grupo e por etiqueta também usam o catálogo.
+
+        > Exemplo: load_catalog()
+
+        Parâmetros
+        ----------
+        rows: int
+            quantidade de pacotes por página (por padrão, 1000).
+        """
+        packages = {}
+        start = 0
+        while True:
+            response = self._request_get(
+                '{}package_search?rows={}&start={}'.format(
+                    self.url_action, rows, start
+                ), refresh=True
+            )['result']
+            for package in response['results']:
+                packages[package['name']] = self._compact_package(package)
+
+            start += rows
+            if not response['results'] or start >= response['count']:
+                break
+
+        groups = {}
+        for name, package in packages.items():
+            for group in package['groups']:
+                groups.setdefault(group, []).append(name)
+
+        self._catalog['package_metadata'] = packages
+        self._catalog['group_packages'] = groups
+        self._catalog['package_list'] = sorted(packages)
+        self._catalog.setdefault('group_list', sorted(groups))
+
+        # O catálogo completo também preenche o índice de etiquetas
+        tags = {}
+        for name, package in packages.items():
+            for tag in package['tags']:
+                tags.setdefault(tag, []).append(name)
+        for key, names in tags.items():
+            self.tag._index_tag(key, names)
+        self._catalog.setdefault('tag_list', sorted(tags))
 
     def print_packages(self):
         """Imprime os conjuntos de dados."""
         self._print_list("pacotes de dados", self.available_packages)
 
     def download_package(self, name: str, path: str = os.getcwd(),
-                         dictionary: bool = True, years: list = None):
+                         dictionary: bool = True, years: list = None,
+                         workers: int = 1, sync: bool = False,
+                         sink: Sink = None,
+                         previous: RunResult = None) -> RunResult:
         """Exibe pacote de dados de acordo com seu nome
         e baixa-os em pastas com o nome do respectivo
         conjunto de dado.
@@ -54,27 +142,36 @@ class Package(Env, FilterMixin):
         years: list
             define os anos dos dados que serão baixados, se existir
             realiza-se o download.
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<pacote>/<nome>.<formato>` (por padrão,
+            None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
+
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
         """
-        # Checa se o pacote está disponível
-        if not (name in self.available_packages) and self.warnings:
-            self._print_not_found(name, 'Pacote')
-            return
+        with self._download_pool(workers, path, sync, sink,
+                                 previous) as pool:
+            self._download_package(name, path, dictionary, years, pool)
 
-        response = self._request_get(self.url_package + name)
-        path = self._make_dir('{}/{}'.format(path, name))
-
-        try:
-            for resource in response['resources']:
-                if 'Dicion' in resource['name']:
-                    if dictionary:
-                        self._download(path, resource)
-                elif years is None or self.year_find(resource['name'], years):
-                    self._download(path, resource)
-        except Exception as ex:
-            self._print_exception(ex)
+        return self._report_result(pool.wait())
 
     def download_packages(self, packages: list, path: str = os.getcwd(),
-                          dictionary: bool = True, years: list = None):
+                          dictionary: bool = True, years: list = None,
+                          workers: int = 1, sync: bool = False,
+                          sink: Sink = None,
+                          previous: RunResult = None) -> RunResult:
         """Exibe os pacotes de dados de acordo com seu nome
         e baixa-os em pastas com o nome do respectivo
         conjunto de dado.
@@ -94,9 +191,30 @@ class Package(Env, FilterMixin):
         years: list
             define os anos dos dados que serão baixados, se existir
             realiza-se o download.
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<pacote>/<nome>.<formato>` (por padrão,
+            None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
+
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
         """
-        for package in packages:
-            self.download_package(package, path, dictionary, years)
+        with self._download_pool(workers, path, sync, sink,
+                                 previous) as pool:
+            self._download_packages(packages, path, dictionary, years, pool)
+
+        return self._report_result(pool.wait())
 
     def search_related_packages(self, keyword: str,
                                 simple_filter: bool = False,
@@ -136,7 +254,11 @@ class Package(Env, FilterMixin):
         return related
 
     def download_all(self, path: str = os.getcwd(),
-                     dictionary: bool = True, years: list = None):
+                     dictionary: bool = True, years: list = None,
+                     workers: int = 1, sync: bool = False,
+                     sink: Sink = None, previous: RunResult = None,
+                     shard_index: int = 0, shard_count: int = 1,
+                     refresh: bool = False) -> RunResult:
         """Exibe todos os pacotes de dados e baixa-os
         em pastas com o nome do respectivo conjunto de dado.
 
@@ -153,12 +275,78 @@ class Package(Env, FilterMixin):
         years: list
             define os anos dos dados que serão baixados, se existir
             realiza-se o download.
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<pacote>/<nome>.<formato>` (por padrão,
+            None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
+        shard_index: int
+            parte dos pacotes baixada por esta execução, de 0 a
+            shard_count - 1 (por padrão, 0).
+        shard_count: int
+            quantidade de partes em que os pacotes são divididos, para
+            que processos ou máquinas diferentes baixem cada um uma
+            parte (por padrão, 1).
+        refresh: bool
+            flag para carregar o catálogo novamente antes dos downloads,
+            mesmo que ele já tenha sido carregado (por padrão, False).
+
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
+
+        Se o catálogo ainda não tiver sido carregado, ou com refresh ou
+        sync, load_catalog é chamado antes dos downloads: assim, uma
+        instância usada por muito tempo (ex.: um espelho diário com
+        sync=True) baixa também os pacotes publicados depois da primeira
+        chamada.
+
+        > Exemplo: em três máquinas, com shard_index 0, 1 e 2
+            download_all(shard_index=0, shard_count=3)
+
+        A parte de cada pacote depende apenas do seu nome e de
+        shard_count (ver _shard): execuções com partes diferentes baixam
+        pacotes disjuntos, que juntos cobrem todos os pacotes, mesmo que
+        cada uma tenha carregado o catálogo em um momento diferente.
         """
-        self.download_packages(
-            self.available_packages, path, dictionary, years
-        )
-
-    def download_packages_by_tag(self, tag: str, path: str = os.getcwd()):
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError('Parte inválida: {} de {}'.format(
+                shard_index, shard_count
+            ))
+
+        loaded = False
+        if refresh or sync or 'package_metadata' not in self._catalog:
+            try:
+                self.load_catalog()
+                loaded = True
+            except Exception as ex:
+                # Sem o catálogo, os pacotes são consultados um a um
+                self._print_exception(ex)
+
+        packages = self.available_packages
+        if shard_count > 1:
+            packages = self._shard(packages, shard_index, shard_count)
+
+        # O catálogo recém-carregado já tem os metadados atuais
+        with self._download_pool(workers, path, sync, sink, previous,
+                                 refresh=sync and not loaded) as pool:
+            self._download_packages(packages, path, dictionary, years, pool)
+
+        return self._report_result(pool.wait())
+
+    def download_packages_by_tag(self, tag: str, path: str = os.getcwd(),
+                                 workers: int = 1, sync: bool = False,
+                                 sink: Sink = None,
+                                 previous: RunResult = None) -> RunResult:
         """Baixa pacotes pertencentes a uma etiqueta.
 
         Parâmetros
@@ -168,11 +356,150 @@ class Package(Env, FilterMixin):
         path: str
             o caminho da pasta onde serão adicionados os arquivos
             (por padrão, a pasta atual).
+        workers: int
+            quantidade de arquivos baixados simultaneamente (por padrão, 1).
+        sync: bool
+            flag para baixar apenas os recursos novos ou alterados desde
+            o último download (por padrão, False).
+        sink: Sink
+            destino dos arquivos (ver odufrn_downloader.sinks). Quando
+            informado, nada é gravado em path e os arquivos são entregues
+            ao sink com chaves `<pacote>/<nome>.<formato>` (por padrão,
+            None).
+        previous: RunResult
+            resultado (ou caminho do manifesto salvo) de uma execução
+            anterior: apenas os recursos que falharam ou faltaram nela
+            são baixados (por padrão, None).
+
+        Retorno
+        -------
+        RunResult com o registro de cada recurso.
+        """
+        # Recupera pacotes (no modo sync, consultando a API novamente)
+        packages = self.tag.search_by_tag(tag, refresh=sync)
+
+        return self.download_packages(
+            packages, path, workers=workers, sync=sync, sink=sink,
+            previous=previous
+        )
+
+    def load_resource(self, package: str, resource: str,
+                      output: str = 'pandas', usecols: list = None,
+                      nrows: int = None, encoding: str = None,
+                      delimiter: str = None,
+                      block_size: int = 4 * 1024 * 1024):
+        """Carrega um recurso CSV diretamente em memória, sem gravá-lo no
+        disco.
+
+        O conteúdo é lido em blocos de block_size bytes à medida que é
+        recebido (ver CsvStream), e apenas as colunas de usecols são
+        mantidas de cada bloco. Com nrows, o download é interrompido assim
+        que as linhas pedidas são lidas. Requer o pacote `pyarrow` (e o
+        `pandas`, para output='pandas').
+
+        Os tipos das colunas são inferidos no primeiro bloco. Se um bloco
+        seguinte tiver valores que não cabem neles, as colunas afetadas
+        são ampliadas para double ou texto (ver CsvStream.read_arrow): em
+        'arrow' e 'pandas' todos os blocos são convertidos para os tipos
+        finais, e em 'batches' os lotes seguintes têm o novo schema.
+
+        > Exemplo:
+            load_resource('discentes', 'Ingressantes em 2018',
+                          usecols=['matricula', 'nome'])
+
+        Parâmetros
+        ----------
+        package: str
+            nome do pacote.
+        resource: str
+            nome do recurso.
+        output: str
+            'pandas' (DataFrame), 'arrow' (pyarrow.Table) ou 'batches'
+            (iterador de pyarrow.RecordBatch, que baixa o recurso à medida
+            que é percorrido) (por padrão, 'pandas').
+        usecols: list
+            colunas a serem carregadas (por padrão, todas).
+        nrows: int
+            quantidade máxima de linhas (por padrão, todas).
+        encoding: str
+            codificação do CSV (por padrão, detectada).
+        delimiter: str
+            delimitador do CSV (por padrão, detectado).
+        block_size: int
+            tamanho, em bytes, dos blocos lidos de cada vez
+            (por padrão, 4 MiB).
+        """
+        if pyarrow is None:
+            raise ImportError(
+                'load_resource requer o pacote pyarrow: '
+                'pip install odufrn-downloader[arrow]'
+            )
+        if output not in ('pandas', 'arrow', 'batches'):
+            raise ValueError('Formato de saída inválido: {}'.format(output))
+
+        found = [
+            r for r in self._get_package(package)['resources']
+            if r['name'] == resource
+        ]
+        if not found:
+            raise ValueError('O recurso "{}" não foi encontrado no pacote '
+                             '"{}".'.format(resource, package))
+        if found[0]['format'].lower() != 'csv':
+            raise ValueError('O recurso "{}" não é um CSV.'.format(resource))
+
+        batches = self._read_batches(
+            found[0], CsvStream(block_size, encoding, delimiter), usecols,
+            nrows
+        )
+        if output == 'batches':
+            return batches
+
+        # Os tipos só são ampliados: o schema do último lote vale para
+        # todos
+        tables = [pyarrow.Table.from_batches([batch]) for batch in batches]
+        table = pyarrow.concat_tables([
+            t.cast(tables[-1].schema) for t in tables
+        ])
+        return table if output == 'arrow' else table.to_pandas()
+
+    def load_package(self, name: str, output: str = 'pandas',
+                     usecols: list = None, nrows: int = None,
+                     years: list = None, **options) -> dict:
+        """Carrega os recursos CSV de um pacote diretamente em memória
+        (ver load_resource).
+
+        > Exemplo: load_package('discentes', years=[2018])
+
+        Parâmetros
+        ----------
+        name: str
+            nome do pacote.
+        output: str
+            'pandas', 'arrow' ou 'batches' (por padrão, 'pandas').
+        usecols: list
+            colunas a serem carregadas de cada recurso (por padrão, todas).
+        nrows: int
+            quantidade máxima de linhas de cada recurso (por padrão, todas).
+        years: list
+            define os anos dos recursos que serão carregados.
+        options:
+            demais parâmetros de load_resource (encoding, delimiter e
+            block_size).
+
+        Retorno
+        -------
+        dicionário {nome do recurso: dados}.
         """
-        # Recupera pacotes
-        packages = self.tag.search_by_tag(tag)
+        loaded = {}
+        for resource in self._get_package(name)['resources']:
+            if resource['format'].lower() != 'csv' or \
+                    not self._check_resource(resource, False, years):
+                continue
+            loaded[resource['name']] = self.load_resource(
+                name, resource['name'], output, usecols, nrows, **options
+            )
 
-        self.download_packages(packages, path)
+        return loaded
 
     def print_files_from_package(self, name: str):
         """Imprime os arquivos do pacote.
@@ -182,7 +509,7 @@ class Package(Env, FilterMixin):
         name: str
             nome do recurso a ser pesquisado.
         """
-        request = self._request_get(self.url_package + name)
+        request = self._get_package(name)
         try:
             for resource in request['resources']:
                 print(resource['url'].split('/')[-1])
@@ -191,7 +518,220 @@ class Package(Env, FilterMixin):
                 e, self.str_related(self.search_related_packages(name))
             )
 
-    def _download(self, path: str, resource):
+    def _get_package(self, name: str, refresh: bool = False) -> dict:
+        """Retorna os metadados do pacote, do catálogo carregado por
+        load_catalog se houver, ou da API caso contrário.
+
+        Parâmetros
+        ----------
+        name: str
+            nome do pacote.
+        refresh: bool
+            flag para ignorar o catálogo e o cache e consultar a API
+            (por padrão, False).
+        """
+        metadata = self._catalog.get('package_metadata', {})
+        if name in metadata and not refresh:
+            return metadata[name]
+
+        return self._request_get(self.url_package + name, refresh)
+
+    def _shard(self, packages: list, shard_index: int,
+               shard_count: int) -> list:
+        """Retorna os pacotes da parte shard_index, na ordem original.
+
+        A parte de cada pacote é escolhida por rendezvous hashing: para
+        cada parte calcula-se o hash SHA-1 de `<parte>:<nome>`, e o
+        pacote fica na parte de maior hash. A escolha depende apenas do
+        nome do pacote e de shard_count, e não do restante do catálogo:
+        pacotes publicados ou removidos não mudam a parte dos demais, e
+        execuções com catálogos carregados em momentos diferentes não
+        deixam de baixar nem baixam duas vezes os pacotes em comum. Ao
+        mudar shard_count, apenas os pacotes que passam para as partes
+        novas (ou saem das removidas) mudam de parte.
+
+        Parâmetros
+        ----------
+        packages: list
+            nomes dos pacotes.
+        shard_index: int
+            a parte desejada.
+        shard_count: int
+            quantidade de partes.
+        """
+        def shard(name: str) -> int:
+            return max(range(shard_count), key=lambda index: int(
+                hashlib.sha1('{}:{}'.format(index, name).encode('utf-8'))
+                .hexdigest(), 16
+            ))
+
+        return [name for name in packages if shard(name) == shard_index]
+
+    def _compact_package(self, package: dict) -> dict:
+        """Reduz o pacote retornado pelo package_search aos campos usados
+        pelo pacote, no mesmo formato da API REST de datasets."""
+        fields = ('id', 'name', 'format', 'url', 'size', 'last_modified',
+                  'revision_id', 'hash')
+        return {
+            'name': package['name'],
+            'resources': [
+                {field: resource.get(field) for field in fields}
+                for resource in package.get('resources', [])
+            ],
+            'tags': [tag['name'] for tag in package.get('tags', [])],
+            'groups': [group['name'] for group in package.get('groups', [])],
+        }
+
+    def _download_pool(self, workers: int, path: str = None,
+                       sync: bool = False, sink: Sink = None,
+                       previous: RunResult = None,
+                       refresh: bool = None) -> DownloadPool:
+        """Cria o executor usado por uma chamada de download e ajusta
+        as conexões da sessão à concorrência desejada (consultas de
+        metadados e downloads podem ocorrer ao mesmo tempo).
+
+        Com refresh (por padrão, igual a sync), os metadados dos pacotes
+        e grupos são consultados na API, sem o catálogo e o cache, para
+        que o modo sync compare os recursos com a versão atual."""
+        if sync and sink is not None:
+            raise ValueError('O modo sync não pode ser usado com um sink')
+
+        self._resize_session(2 * min(max(1, workers), self._host_limit()))
+        if isinstance(previous, str):
+            previous = RunResult.load(previous)
+
+        return DownloadPool(
+            workers, self._host_limit(), self.retry, self.monitor, previous,
+            root=path, sync=sync, sink=sink,
+            refresh=sync if refresh is None else refresh
+        )
+
+    def _download_packages(self, packages: list, path: str,
+                           dictionary: bool, years: list,
+                           pool: DownloadPool):
+        """Agenda no pool os downloads dos recursos de vários pacotes.
+
+        Com mais de um worker, os metadados dos pacotes são consultados
+        concorrentemente e os recursos de cada pacote são agendados assim
+        que seus metadados chegam, enquanto os demais ainda são
+        consultados.
+
+        Parâmetros
+        ----------
+        packages: list
+            lista com os nomes dos pacotes.
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos.
+        dictionary: bool
+            flag para baixar o dicionário dos dados.
+        years: list
+            define os anos dos dados que serão baixados.
+        pool: DownloadPool
+            executor que realizará os downloads.
+        """
+        if pool.workers == 1:
+            for package in packages:
+                self._download_package(package, path, dictionary, years, pool)
+            return
+
+        packages = [name for name in packages if self._check_package(name)]
+        workers = min(pool.workers, self._host_limit())
+        with ThreadPoolExecutor(workers) as executor:
+            futures = {
+                executor.submit(self._get_package, name,
+                                pool.options.get('refresh', False)): name
+                for name in packages
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    response = future.result()
+                except Exception as ex:
+                    pool.add_failure({'package': name, 'resource': None}, ex)
+                    continue
+                self._download_package(
+                    name, path, dictionary, years, pool, response
+                )
+
+    def _download_package(self, name: str, path: str, dictionary: bool,
+                          years: list, pool: DownloadPool,
+                          response: dict = None):
+        """Agenda no pool os downloads dos recursos de um pacote.
+
+        Parâmetros
+        ----------
+        name: str
+            nome do pacote.
+        path: str
+            o caminho da pasta onde serão adicionados os arquivos.
+        dictionary: bool
+            flag para baixar o dicionário dos dados.
+        years: list
+            define os anos dos dados que serão baixados.
+        pool: DownloadPool
+            executor que realizará os downloads.
+        response: dict
+            metadados do pacote, se já tiverem sido consultados
+            (por padrão, None).
+        """
+        if response is None and not self._check_package(name):
+            return
+
+        try:
+            if response is None:
+                response = self._get_package(
+                    name, pool.options.get('refresh', False)
+                )
+            resources = response['resources']
+        except Exception as ex:
+            pool.add_failure({'package': name, 'resource': None}, ex)
+            return
+
+        path = self._pool_dir(path, name, pool)
+        sink = pool.options.get('sink')
+        manifest = SyncManifest(path) if pool.options.get('sync') else None
+        for resource in resources:
+            if not self._check_resource(resource, dictionary, years):
+                continue
+
+            info = {'package': name, 'resource': resource['name']}
+            if sink is None:
+                pool.submit(info, resource['url'], self._download, path,
+                            resource, manifest,
+                            target=self._file_path(path, resource),
+                            duplicate=self._link)
+            else:
+                key = os.path.relpath(
+                    self._file_path(path, resource), pool.options['root']
+                ).replace(os.sep, '/')
+                pool.submit(info, resource['url'], self._download_to_sink,
+                            sink, key, resource, target=key)
+
+    def _pool_dir(self, path: str, name: str, pool: DownloadPool) -> str:
+        """Retorna o caminho da pasta name dentro de path, criando-a
+        apenas se os arquivos forem gravados no disco."""
+        path = '{}/{}'.format(path, name)
+        if pool.options.get('sink') is None:
+            self._make_dir(path)
+
+        return path
+
+    def _file_path(self, path: str, resource: dict) -> str:
+        return '{}/{}.{}'.format(
+            path, resource['name'], resource['format'].lower()
+        )
+
+    def _check_package(self, name: str) -> bool:
+        """Checa se o pacote está disponível, quando os avisos estão
+        ativos, imprimindo mensagem caso não esteja."""
+        if not (name in self.available_packages) and self.warnings:
+            self._print_not_found(name, 'Pacote')
+            return False
+
+        return True
+
+    def _download(self, path: str, resource,
+                  manifest: SyncManifest = None):
         """Baixa o arquivo desejado e o coloca na pasta desejada
 
         > Exemplo: _download('acervo-biblioteca')
@@ -201,11 +741,263 @@ class Package(Env, FilterMixin):
         path: str
             o caminho da pasta onde serão adicionados os arquivos
             (por padrão, a pasta atual).
+        resource: dict
+            o recurso do pacote.
+        manifest: SyncManifest
+            registro do modo de sincronização. Quando informado, recursos
+            inalterados não são baixados novamente (por padrão, None).
+
+        O conteúdo é escrito em partes de `chunk_size` bytes no arquivo
+        `<nome>.part`, que só é renomeado para o nome final ao término
+        do download. Se o download for interrompido, o arquivo `.part` é
+        mantido e a próxima tentativa pede ao servidor apenas o restante
+        do arquivo (requisição com `Range`). O validador da resposta
+        (`ETag` forte ou `Last-Modified`) é guardado em
+        `<nome>.part.validator` e enviado no `If-Range`, de modo que, se
+        o arquivo mudou no servidor, ele é baixado inteiro de novo. Se o
+        servidor recusar o `Range` (416), o `.part` é finalizado quando
+        já tem o tamanho informado nos metadados, e descartado caso
+        contrário.
+
+        Retorno
+        -------
+        dicionário com o status ('ok' ou 'unchanged'), o caminho e o
+        tamanho do arquivo, para o registro do download (ver RunResult).
         """
-        print("Baixando {}...".format(resource['name']))
-        file_path = '{}/{}.{}'.format(
-            path, resource['name'], resource['format'].lower()
-        )
+        file_path = self._file_path(path, resource)
+        part_path = file_path + '.part'
+
+        headers = {}
+        if manifest is not None:
+            if manifest.unchanged(resource, file_path):
+                print("{} não foi alterado.".format(resource['name']))
+                return {'status': 'unchanged', 'path': file_path}
+            headers = manifest.headers(resource, file_path)
+
+        offset = 0
+        if os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+        if offset:
+            print("Retomando {}...".format(resource['name']))
+            headers['Range'] = 'bytes={}-'.format(offset)
+            validator = self._read_validator(part_path)
+            if validator is not None:
+                headers['If-Range'] = validator
+        else:
+            print("Baixando {}...".format(resource['name']))
+
+        with self._get(resource['url'], headers=headers,
+                       stream=True) as response:
+            if response.status_code == 304:
+                # O arquivo baixado continua atual: o parcial é descartado
+                if offset:
+                    self._discard_part(part_path)
+                print("{} não foi alterado.".format(resource['name']))
+                return {'status': 'unchanged', 'path': file_path}
+            restart = False
+            response_headers = response.headers
+            if response.status_code == 416 and offset:
+                # Não há bytes após o parcial: ou ele já está completo, ou
+                # não corresponde ao arquivo atual
+                restart = str(offset) != str(resource.get('size'))
+                response_headers = self._validator_headers(part_path)
+            else:
+                response.raise_for_status()
+
+                mode = 'wb'
+                if response.status_code == 206:
+                    if self._range_start(response) != offset:
+                        self._discard_part(part_path)
+                        raise IOError(
+                            'Resposta parcial inesperada para {}'.format(
+                                resource['name']
+                            )
+                        )
+                    mode = 'ab'
+                else:
+                    self._write_validator(part_path, response)
+
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+                        self._emit('download_progress',
+                                   resource=resource['name'],
+                                   url=resource['url'], bytes=len(chunk))
+
+        if restart:
+            # O arquivo parcial não corresponde ao atual: recomeça
+            self._discard_part(part_path)
+            return self._download(path, resource, manifest)
+
+        try:
+            self._check_size(resource, part_path)
+        except IOError:
+            self._discard_part(part_path)
+            raise
+        os.replace(part_path, file_path)
+        self._discard_part(part_path)
+        size = os.path.getsize(file_path)
+        if self.store is not None:
+            self.store.put(file_path)
+
+        if manifest is not None:
+            manifest.update(resource, file_path, response_headers)
+
+        return {'status': 'ok', 'path': file_path, 'bytes': size}
+
+    def _read_validator(self, part_path: str) -> str:
+        """Retorna o validador guardado para o arquivo parcial, se houver.
+        """
+        try:
+            with open(part_path + '.validator') as f:
+                return f.read() or None
+        except OSError:
+            return None
+
+    def _validator_headers(self, part_path: str) -> dict:
+        """Retorna o validador guardado para o arquivo parcial como os
+        cabeçalhos da resposta que o enviou (`ETag` ou `Last-Modified`).
+        """
+        validator = self._read_validator(part_path)
+        if validator is None:
+            return {}
+        if validator.startswith('"'):
+            return {'ETag': validator}
+        return {'Last-Modified': validator}
+
+    def _write_validator(self, part_path: str, response):
+        """Guarda o validador da resposta para retomar o arquivo parcial
+        com `If-Range`. Um ETag fraco (W/) não vale para o `If-Range`, e
+        então usa-se o `Last-Modified`."""
+        etag = response.headers.get('ETag')
+        if etag is not None and etag.startswith('W/'):
+            etag = None
+        validator = etag or response.headers.get('Last-Modified')
+        validator_path = part_path + '.validator'
+        if validator is None:
+            if os.path.exists(validator_path):
+                os.remove(validator_path)
+            return
+
+        with open(validator_path, 'w') as f:
+            f.write(validator)
 
-        with open(file_path, 'wb') as f:
-            f.write(requests.get(resource['url']).content)
+    def _discard_part(self, part_path: str):
+        """Remove o arquivo parcial e o seu validador, se existirem."""
+        for path in (part_path, part_path + '.validator'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _link(self, record: dict, path: str, resource: dict,
+              manifest: SyncManifest = None) -> dict:
+        """Reaproveita o arquivo de um download já concluído da mesma
+        url, ligando-o (hardlink, ou cópia se não for possível ou se
+        link_duplicates for False) à pasta desejada em vez de baixá-lo
+        novamente. No modo de sincronização, o arquivo é registrado com
+        os validadores (ETag e Last-Modified) do download original, para
+        que a próxima sincronização possa fazer a requisição condicional.
+
+        Parâmetros
+        ----------
+        record: dict
+            registro do download já concluído (ver RunResult).
+        path: str
+            o caminho da pasta onde será adicionado o arquivo.
+        resource: dict
+            o recurso do pacote.
+        manifest: SyncManifest
+            registro do modo de sincronização (por padrão, None).
+
+        Retorno
+        -------
+        dicionário com o status ('linked') e o caminho do arquivo, para o
+        registro do download (ver RunResult).
+        """
+        file_path = self._file_path(path, resource)
+        if os.path.abspath(record['path']) != os.path.abspath(file_path):
+            print("Reaproveitando {}...".format(resource['name']))
+            link_file(record['path'], file_path,
+                      copy=not self.link_duplicates)
+
+        if manifest is not None:
+            # O registro do download original está na pasta do seu pacote
+            original = SyncManifest(os.path.dirname(record['path']))
+            manifest.update(resource, file_path,
+                            original.validators(record['path']))
+
+        return {'status': 'linked', 'path': file_path}
+
+    def _read_batches(self, resource: dict, stream: CsvStream,
+                      usecols: list = None, nrows: int = None):
+        """Baixa o recurso CSV e gera os seus registros em
+        pyarrow.RecordBatch, bloco a bloco (ver load_resource)."""
+        schema = None
+        rows = 0
+        with self._get(resource['url'], stream=True) as response:
+            response.raise_for_status()
+            for block in self._iter_blocks(resource, response, stream):
+                table = stream.read_arrow(block, schema, columns=usecols)
+                schema = table.schema
+                if nrows is not None:
+                    table = table.slice(0, nrows - rows)
+                rows += table.num_rows
+                yield from table.to_batches()
+                if nrows is not None and rows >= nrows:
+                    break
+
+        if rows == 0:
+            # Sem registros: um lote vazio, com as colunas
+            if schema is None:
+                schema = pyarrow.schema([
+                    (name, pyarrow.string())
+                    for name in usecols or stream.columns or []
+                ])
+            yield pyarrow.RecordBatch.from_arrays(
+                [pyarrow.array([], field.type) for field in schema],
+                schema=schema
+            )
+
+    def _iter_blocks(self, resource: dict, response, stream: CsvStream):
+        for chunk in response.iter_content(self.chunk_size):
+            self._emit('download_progress', resource=resource['name'],
+                       url=resource['url'], bytes=len(chunk))
+            yield from stream.feed(chunk)
+        yield from stream.close()
+
+    def _download_to_sink(self, sink: Sink, key: str, resource: dict):
+        """Baixa o arquivo do recurso, entregando-o ao sink em partes de
+        `chunk_size` bytes.
+
+        Parâmetros
+        ----------
+        sink: Sink
+            o destino do arquivo.
+        key: str
+            o caminho relativo do arquivo.
+        resource: dict
+            o recurso do pacote.
+
+        Retorno
+        -------
+        dicionário com o status, a chave e o tamanho do arquivo, para o
+        registro do download (ver RunResult).
+        """
+        print("Baixando {}...".format(resource['name']))
+        writer = sink.open(key, resource)
+        try:
+            size = 0
+            with self._get(resource['url'], stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(self.chunk_size):
+                    writer.write(chunk)
+                    size += len(chunk)
+                    self._emit('download_progress',
+                               resource=resource['name'],
+                               url=resource['url'], bytes=len(chunk))
+            self._check_length(resource, size)
+        except BaseException:
+            writer.abort()
+            raise
+
+        writer.close()
+        return {'status': 'ok', 'path': key, 'bytes': size}
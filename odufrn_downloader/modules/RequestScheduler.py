@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class RequestScheduler:
+    """Controla o ritmo das requisições feitas a cada servidor.
+
+    Cada servidor tem um balde de fichas (token bucket), que limita a
+    taxa de requisições, e um limite de requisições simultâneas ajustado
+    no estilo AIMD: a cada resposta saudável o limite cresce de 1/limite
+    (cerca de uma requisição a mais por rodada), e a cada resposta 429,
+    5xx, erro de conexão ou pico de latência ele cai pela metade. Em
+    respostas 429 e 5xx o servidor também deixa de receber requisições
+    por um intervalo que dobra a cada falha seguida (respeitando o
+    cabeçalho `Retry-After`).
+
+    > Exemplo:
+        ufrn_data.scheduler = RequestScheduler(rate=20, max_concurrency=16)
+        ufrn_data.download_all(workers=16)
+
+    Atributos
+    ---------
+    rate: float
+        requisições por segundo permitidas para cada servidor
+        (None para não haver limite).
+    burst: int
+        quantidade de requisições que podem ser feitas de uma vez antes
+        de o limite de taxa valer (por padrão, igual a rate).
+    max_concurrency: int
+        limite máximo de requisições simultâneas por servidor.
+    min_concurrency: int
+        limite mínimo de requisições simultâneas por servidor.
+    initial_concurrency: int
+        limite inicial de requisições simultâneas por servidor.
+    latency_factor: float
+        uma resposta é considerada um pico de latência quando demora
+        mais que latency_factor vezes a latência média do servidor.
+    backoff: float
+        pausa, em segundos, após a primeira falha.
+    max_backoff: float
+        pausa máxima, em segundos.
+    poll_interval: float
+        intervalo, em segundos, entre as verificações da vez no download
+        assíncrono, que não bloqueia threads enquanto aguarda.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None,
+                 max_concurrency: int = 8, min_concurrency: int = 1,
+                 initial_concurrency: int = 2, latency_factor: float = 4.0,
+                 backoff: float = 0.5, max_backoff: float = 30.0,
+                 poll_interval: float = 0.01):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.initial_concurrency = initial_concurrency
+        self.latency_factor = latency_factor
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> '_Slot':
+        """Retorna o gerenciador de contexto de uma requisição para url,
+        que aguarda a vez da requisição ao entrar e registra a resposta
+        (ver _Slot.record) ao sair.
+
+        > Exemplo:
+            with scheduler.slot(url) as slot:
+                response = session.get(url)
+                slot.record(response)
+
+        No download assíncrono, use `async with scheduler.slot(url)`: a
+        vez é aguardada no event loop, sem ocupar uma thread.
+
+        Parâmetros
+        ----------
+        url: str
+            a url da requisição.
+        """
+        return _Slot(self, self._host(url))
+
+    def concurrency(self, url: str) -> int:
+        """Retorna o limite atual de requisições simultâneas para o
+        servidor da url."""
+        state = self._host(url)
+        with state.condition:
+            return int(state.limit)
+
+    def _host(self, url: str) -> '_HostState':
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostState(
+                    self.initial_concurrency, self.burst
+                )
+            return self._hosts[host]
+
+    def _acquire(self, state: '_HostState'):
+        with state.condition:
+            while True:
+                acquired, wait = self._try_acquire(state)
+                if acquired:
+                    return
+                state.condition.wait(wait)
+
+    async def _acquire_async(self, state: '_HostState'):
+        """Versão assíncrona de _acquire: verifica a vez a cada
+        poll_interval segundos, aguardando com asyncio.sleep."""
+        while True:
+            with state.condition:
+                acquired, wait = self._try_acquire(state)
+            if acquired:
+                return
+            await asyncio.sleep(
+                self.poll_interval if wait is None
+                else min(wait, self.poll_interval)
+            )
+
+    def _try_acquire(self, state: '_HostState') -> tuple:
+        """Tenta ocupar uma vez no servidor, com a condição de state já
+        adquirida. Retorna se conseguiu e, caso contrário, o tempo até a
+        próxima tentativa (None para aguardar uma liberação)."""
+        now = time.monotonic()
+        wait = state.paused_until - now
+        if wait > 0:
+            return False, wait
+        if state.in_flight >= int(state.limit):
+            return False, None
+
+        wait = self._take_token(state, now)
+        if wait > 0:
+            return False, wait
+
+        state.in_flight += 1
+        return True, 0
+
+    def _take_token(self, state: '_HostState', now: float) -> float:
+        """Retira uma ficha do balde, retornando 0, ou o tempo até a
+        próxima ficha se o balde estiver vazio."""
+        if self.rate is None:
+            return 0
+
+        state.tokens = min(
+            self.burst, state.tokens + (now - state.updated) * self.rate
+        )
+        state.updated = now
+        if state.tokens >= 1:
+            state.tokens -= 1
+            return 0
+
+        return (1 - state.tokens) / self.rate
+
+    def _release(self, state: '_HostState', started: float, status: int,
+                 elapsed: float, retry_after: float):
+        with state.condition:
+            state.in_flight -= 1
+            now = time.monotonic()
+            overloaded = status is None or status == 429 or status >= 500
+            slow = state.latency is not None and elapsed is not None \
+                and elapsed > self.latency_factor * state.latency
+
+            if overloaded or slow:
+                # Respostas a requisições feitas antes da última redução
+                # refletem o limite antigo e não reduzem de novo
+                if started >= state.decreased:
+                    state.limit = max(self.min_concurrency, state.limit / 2)
+                    state.decreased = now
+            else:
+                state.limit = min(
+                    self.max_concurrency, state.limit + 1 / state.limit
+                )
+
+            if overloaded:
+                state.delay = min(
+                    self.max_backoff, state.delay * 2 or self.backoff
+                )
+                pause = max(state.delay, retry_after or 0)
+                state.paused_until = max(state.paused_until, now + pause)
+            else:
+                state.delay = 0
+
+            if elapsed is not None:
+                state.latency = elapsed if state.latency is None \
+                    else 0.9 * state.latency + 0.1 * elapsed
+
+            state.condition.notify_all()
+
+
+class _HostState:
+    """Estado do controle de requisições de um servidor."""
+
+    def __init__(self, limit: int, tokens: int):
+        self.condition = threading.Condition()
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.tokens = float(tokens)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.decreased = 0.0
+        self.delay = 0.0
+        self.latency = None
+
+
+class _Slot:
+    """Vez de uma requisição a um servidor (ver RequestScheduler.slot)."""
+
+    def __init__(self, scheduler: RequestScheduler, state: _HostState):
+        self.scheduler = scheduler
+        self.state = state
+        self.started = None
+        self.status = None
+        self.elapsed = None
+        self.retry_after = None
+
+    def record(self, response):
+        """Registra a resposta recebida (status, latência e Retry-After).
+
+        Parâmetros
+        ----------
+        response: requests.Response
+            a resposta da requisição.
+        """
+        self.update(response.status_code, response.elapsed.total_seconds(),
+                    response.headers)
+
+    def update(self, status: int, elapsed: float, headers: dict):
+        """Registra o status, a latência e o Retry-After de uma resposta
+        que não é de requests (ex.: do download assíncrono).
+
+        Parâmetros
+        ----------
+        status: int
+            o status da resposta.
+        elapsed: float
+            segundos até o recebimento dos cabeçalhos.
+        headers: dict
+            os cabeçalhos da resposta.
+        """
+        self.status = status
+        self.elapsed = elapsed
+        try:
+            self.retry_after = float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            self.retry_after = None
+
+    def __enter__(self) -> '_Slot':
+        self.scheduler._acquire(self.state)
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *args):
+        self.scheduler._release(
+            self.state, self.started, self.status, self.elapsed,
+            self.retry_after
+        )
+
+    async def __aenter__(self) -> '_Slot':
+        await self.scheduler._acquire_async(self.state)
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, *args):
+        self.__exit__(*args)
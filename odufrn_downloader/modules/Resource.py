@@ -0,0 +1,22 @@
+from collections import namedtuple
+
+Resource = namedtuple(
+    'Resource', ['package', 'name', 'format', 'url', 'size', 'year']
+)
+Resource.__doc__ = """Recurso (arquivo) de um pacote de dados.
+
+Atributos
+---------
+package: str
+    nome do pacote ao qual o recurso pertence.
+name: str
+    nome do recurso.
+format: str
+    formato do arquivo, em minúsculas (ex.: 'csv').
+url: str
+    a url para download do arquivo.
+size: int
+    tamanho do arquivo em bytes, se informado pela API (ou None).
+year: int
+    ano ao qual o recurso se refere, de acordo com o seu nome (ou None).
+"""
@@ -0,0 +1,177 @@
+import asyncio
+import random
+import threading
+import time
+import requests
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class RetryPolicy:
+    """Política de novas tentativas para falhas transitórias de rede.
+
+    Erros de conexão, timeouts, respostas interrompidas e respostas com
+    os status em `statuses` são tentados novamente até `retries` vezes,
+    com espera exponencial e aleatória (full jitter) entre as tentativas:
+    um valor entre 0 e `backoff * 2 ** tentativa`, limitado a
+    `max_backoff` e nunca menor que o `Retry-After` da resposta. Se o
+    `Retry-After` for maior que `max_backoff`, a falha não é tentada
+    novamente, em vez de a nova tentativa ser antecipada.
+
+    O orçamento de novas tentativas evita que um servidor fora do ar
+    multiplique o tempo de uma execução longa: cada operação acrescenta
+    `budget` ao saldo (que começa em `min_budget`) e cada nova tentativa
+    consome 1. O saldo não passa de `min_budget + budget * window`, de
+    modo que um longo período sem falhas não acumula novas tentativas
+    para uma queda posterior; sem saldo, as falhas são registradas sem
+    novas tentativas.
+
+    > Exemplo:
+        ufrn_data.retry = RetryPolicy(retries=5, backoff=1)
+
+    Atributos
+    ---------
+    retries: int
+        quantidade máxima de novas tentativas de cada operação.
+    backoff: float
+        espera base, em segundos.
+    max_backoff: float
+        espera máxima, em segundos.
+    budget: float
+        fração das operações que podem ser tentadas novamente.
+    min_budget: int
+        saldo inicial de novas tentativas.
+    window: int
+        quantidade de operações cujo orçamento pode ser acumulado.
+    statuses: tuple
+        status HTTP considerados transitórios.
+    retried: int
+        quantidade de novas tentativas realizadas.
+    """
+
+    def __init__(self, retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30.0, budget: float = 0.2,
+                 min_budget: int = 10, window: int = 100,
+                 statuses: tuple = (429, 500, 502, 503, 504)):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.min_budget = min_budget
+        self.window = window
+        self.statuses = statuses
+        self.retried = 0
+        self._balance = float(min_budget)
+        self._lock = threading.Lock()
+
+    def call(self, fun, *args):
+        """Executa fun(*args), tentando novamente nas falhas
+        transitórias, e retorna o seu resultado.
+
+        Parâmetros
+        ----------
+        fun: callable
+            a operação.
+        """
+        self._deposit()
+        attempt = 0
+        while True:
+            try:
+                return fun(*args)
+            except Exception as ex:
+                if attempt >= self.retries or not self.retryable(ex):
+                    raise
+                delay = self.delay(attempt, ex)
+                if delay > self.max_backoff or not self._withdraw():
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def call_async(self, fun, *args):
+        """Versão assíncrona de call: aguarda a corrotina fun(*args),
+        tentando novamente nas falhas transitórias, sem bloquear o event
+        loop durante as esperas.
+
+        Parâmetros
+        ----------
+        fun: callable
+            função que retorna a corrotina da operação.
+        """
+        self._deposit()
+        attempt = 0
+        while True:
+            try:
+                return await fun(*args)
+            except Exception as ex:
+                if attempt >= self.retries or not self.retryable(ex):
+                    raise
+                delay = self.delay(attempt, ex)
+                if delay > self.max_backoff or not self._withdraw():
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def retryable(self, ex: Exception) -> bool:
+        """Verifica se a exceção é uma falha transitória (de requests
+        ou, no download assíncrono, de aiohttp)."""
+        if isinstance(ex, requests.HTTPError):
+            return ex.response is not None \
+                and ex.response.status_code in self.statuses
+        if aiohttp is not None:
+            if isinstance(ex, aiohttp.ClientResponseError):
+                return ex.status in self.statuses
+            if isinstance(ex, (aiohttp.ClientConnectionError,
+                               aiohttp.ClientPayloadError)):
+                return True
+
+        return isinstance(ex, (
+            requests.ConnectionError, requests.Timeout,
+            requests.exceptions.ChunkedEncodingError, asyncio.TimeoutError
+        ))
+
+    def delay(self, attempt: int, ex: Exception = None) -> float:
+        """Calcula a espera antes da nova tentativa.
+
+        Parâmetros
+        ----------
+        attempt: int
+            quantidade de novas tentativas já feitas.
+        ex: Exception
+            a falha ocorrida, da qual é lido o `Retry-After`.
+
+        A espera aleatória é limitada a max_backoff, mas o Retry-After
+        não: uma espera maior que max_backoff indica que a falha não
+        deve ser tentada novamente.
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** attempt)
+        )
+        # Em requests, os cabeçalhos ficam na resposta; em aiohttp, na
+        # própria exceção
+        headers = getattr(getattr(ex, 'response', None), 'headers', None) \
+            or getattr(ex, 'headers', None)
+        if headers is not None:
+            try:
+                delay = max(delay, float(headers['Retry-After']))
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        return delay
+
+    def _deposit(self):
+        with self._lock:
+            self._balance = min(
+                self._balance + self.budget,
+                self.min_budget + self.budget * self.window
+            )
+
+    def _withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            self.retried += 1
+            return True
@@ -0,0 +1,109 @@
+import json
+import os
+
+
+class RunResult:
+    """Resultado de uma execução de download, com um registro para cada
+    recurso (e para cada pacote ou grupo cujos metadados falharam).
+
+    Cada registro é um dicionário com os campos:
+
+    - package, resource e url: identificação do recurso (ou group, nas
+      falhas de grupos);
+    - status: 'ok' (baixado), 'unchanged' (inalterado no modo sync),
+      'linked' (url já baixada na mesma execução, cujo arquivo foi
+      reaproveitado), 'skipped' (concluído em uma execução anterior) ou
+      'failed';
+    - path: caminho do arquivo (ou chave, com um sink);
+    - bytes, duration (segundos) e retries (novas tentativas);
+    - error: a exceção ocorrida, nas falhas.
+
+    O resultado pode ser salvo como um manifesto json-lines (uma linha
+    por registro) e passado no parâmetro `previous` de uma nova execução,
+    que baixa novamente apenas os recursos que falharam ou faltaram.
+
+    > Exemplo:
+        result = ufrn_data.download_all(workers=4)
+        result.save('manifesto.jsonl')
+        ufrn_data.download_all(workers=4, previous='manifesto.jsonl')
+
+    Atributos
+    ---------
+    records: list
+        registros da execução.
+    """
+
+    DONE = ('ok', 'unchanged', 'linked', 'skipped')
+
+    def __init__(self, records: list = None):
+        self.records = records if records is not None else []
+
+    @property
+    def failures(self) -> list:
+        """Registros das falhas ocorridas."""
+        return [r for r in self.records if r['status'] == 'failed']
+
+    @property
+    def ok(self) -> bool:
+        """Indica se a execução terminou sem falhas."""
+        return not self.failures
+
+    @property
+    def bytes(self) -> int:
+        """Total de bytes baixados na execução."""
+        return sum(r.get('bytes') or 0 for r in self.records
+                   if r['status'] == 'ok')
+
+    def completed(self) -> dict:
+        """Retorna os registros dos recursos concluídos, indexados pela
+        url do recurso e pelo destino (caminho ou chave) do arquivo.
+
+        A mesma url pode ter sido gravada em mais de um destino (ex.: um
+        pacote presente em vários grupos), e cada destino é conferido
+        separadamente.
+        """
+        return {
+            (r['url'], r.get('path')): r for r in self.records
+            if r['status'] in self.DONE and r.get('url')
+        }
+
+    def save(self, path: str):
+        """Salva os registros como um manifesto json-lines. As exceções
+        são salvas como texto.
+
+        Parâmetros
+        ----------
+        path: str
+            caminho do arquivo.
+        """
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for record in self.records:
+                record = dict(record)
+                if isinstance(record.get('error'), BaseException):
+                    record['error'] = '{}: {}'.format(
+                        type(record['error']).__name__, record['error']
+                    )
+                f.write(json.dumps(record, sort_keys=True) + '\n')
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'RunResult':
+        """Carrega um manifesto salvo por save.
+
+        Parâmetros
+        ----------
+        path: str
+            caminho do arquivo.
+        """
+        with open(path, 'r') as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+    def __repr__(self) -> str:
+        counts = {}
+        for record in self.records:
+            counts[record['status']] = counts.get(record['status'], 0) + 1
+        return 'RunResult({})'.format(', '.join(
+            '{}={}'.format(status, count)
+            for status, count in sorted(counts.items())
+        ))
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+
+
+class SyncManifest:
+    """Registro local, por pacote, do estado dos recursos já baixados,
+    usado pelo modo de sincronização para evitar downloads repetidos.
+
+    Para cada recurso são guardados os campos de versão informados pela
+    API (`last_modified`, `revision_id`, `size` e `hash`) e os cabeçalhos
+    `ETag` e `Last-Modified` da última resposta do servidor.
+
+    Atributos
+    ---------
+    path: str
+        caminho do arquivo json do registro.
+    entries: dict
+        estado de cada recurso, indexado pelo seu identificador.
+    """
+
+    FILENAME = '.odufrn-sync.json'
+    VERSION_FIELDS = ('last_modified', 'revision_id', 'size', 'hash')
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, self.FILENAME)
+        self.entries = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+
+    def unchanged(self, resource: dict, file_path: str) -> bool:
+        """Verifica se o recurso já foi baixado em file_path e se sua
+        versão na API não mudou desde então.
+
+        Parâmetros
+        ----------
+        resource: dict
+            o recurso do pacote.
+        file_path: str
+            o caminho do arquivo baixado.
+        """
+        entry = self.entries.get(self._key(resource))
+        if entry is None or entry['file'] != file_path \
+                or not os.path.exists(file_path):
+            return False
+
+        version = self._version(resource)
+        return any(version.values()) and version == entry['version']
+
+    def headers(self, resource: dict, file_path: str) -> dict:
+        """Retorna os cabeçalhos de requisição condicional do recurso.
+
+        Parâmetros
+        ----------
+        resource: dict
+            o recurso do pacote.
+        file_path: str
+            o caminho do arquivo baixado.
+        """
+        entry = self.entries.get(self._key(resource))
+        if entry is None or entry['file'] != file_path \
+                or not os.path.exists(file_path):
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('http_last_modified'):
+            headers['If-Modified-Since'] = entry['http_last_modified']
+
+        return headers
+
+    def validators(self, file_path: str) -> dict:
+        """Retorna os cabeçalhos `ETag` e `Last-Modified` registrados
+        para o arquivo, no formato dos cabeçalhos da resposta (ver
+        update), ou um dicionário vazio se ele não estiver registrado.
+
+        Parâmetros
+        ----------
+        file_path: str
+            o caminho do arquivo baixado.
+        """
+        for entry in self.entries.values():
+            if entry['file'] == file_path:
+                return {'ETag': entry.get('etag'),
+                        'Last-Modified': entry.get('http_last_modified')}
+
+        return {}
+
+    def update(self, resource: dict, file_path: str, headers: dict):
+        """Registra o download do recurso e salva o registro em disco.
+
+        Parâmetros
+        ----------
+        resource: dict
+            o recurso do pacote.
+        file_path: str
+            o caminho do arquivo baixado.
+        headers: dict
+            os cabeçalhos da resposta do servidor.
+        """
+        with self._lock:
+            self.entries[self._key(resource)] = {
+                'file': file_path,
+                'version': self._version(resource),
+                'etag': headers.get('ETag'),
+                'http_last_modified': headers.get('Last-Modified'),
+            }
+            self._save()
+
+    def _key(self, resource: dict) -> str:
+        return resource.get('id') or resource['url']
+
+    def _version(self, resource: dict) -> dict:
+        return {field: resource.get(field) for field in self.VERSION_FIELDS}
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -1,5 +1,4 @@
-import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from .Env import Env
 from ..mixins.FilterMixin import FilterMixin
 
@@ -13,30 +12,122 @@ class Tag(Env, FilterMixin):
         a url para a consulta de etiquetas da API da UFRN.
     available_tags: list
         lista de etiquetas que estão disponíveis.
+
+    Os pacotes de cada etiqueta já consultada ficam em um índice invertido
+    (etiqueta -> pacotes e pacote -> etiquetas), de forma que novas
+    buscas pela mesma etiqueta não fazem requisições.
     """
 
     def __init__(self):
         super().__init__()
 
-        self.url_tag = self.url_base + 'api/rest/tag'
-        self.available_tags = []
-        self.load_tags()
+    @property
+    def url_tag(self) -> str:
+        return self.url_base + 'api/rest/tag'
+
+    @property
+    def available_tags(self) -> list:
+        return self._get_catalog('tag_list')
+
+    @available_tags.setter
+    def available_tags(self, value: list):
+        self._catalog['tag_list'] = value
+
+    @property
+    def _tag_packages(self) -> dict:
+        return self._catalog.setdefault('tag_packages', {})
+
+    @property
+    def _package_tags(self) -> dict:
+        return self._catalog.setdefault('package_tags', {})
 
     def load_tags(self):
-        """Atualiza lista de etiquetas disponíveis."""
-        self.available_tags = self._load_list('tag_list')
+        """Atualiza lista de etiquetas disponíveis e descarta o índice
+        de pacotes por etiqueta."""
+        self._refresh_catalog('tag_list')
+        self._catalog.pop('tag_packages', None)
+        self._catalog.pop('package_tags', None)
+
+    def load_tag_index(self, workers: int = 1):
+        """Preenche o índice de pacotes por etiqueta com todas as
+        etiquetas disponíveis.
+
+        > Exemplo: load_tag_index(workers=4)
+
+        Parâmetros
+        ----------
+        workers: int
+            quantidade de etiquetas consultadas simultaneamente
+            (por padrão, 1).
+        """
+        missing = [
+            key for key in self.available_tags
+            if key not in self._tag_packages
+        ]
+        with ThreadPoolExecutor(max(1, workers)) as executor:
+            responses = executor.map(
+                lambda key: self._request_get(self.url_tag + '/' + key),
+                missing
+            )
+            for key, packages in zip(missing, responses):
+                self._index_tag(key, packages)
+
+    def get_packages_by_tag(self, key: str, refresh: bool = False) -> list:
+        """Retorna os pacotes de uma etiqueta, consultando a API apenas se
+        ela ainda não estiver no índice.
+
+        Parâmetros
+        ----------
+        key: str
+            nome exato da etiqueta.
+        refresh: bool
+            flag para ignorar o índice e o cache e consultar a API
+            (por padrão, False).
+        """
+        if refresh or key not in self._tag_packages:
+            self._index_tag(key, self._request_get(
+                self.url_tag + '/' + key, refresh
+            ))
+
+        return self._tag_packages[key]
+
+    def get_tags_of_package(self, name: str) -> list:
+        """Retorna as etiquetas de um pacote, de acordo com as etiquetas
+        já presentes no índice.
+
+        Parâmetros
+        ----------
+        name: str
+            nome do pacote.
+        """
+        return self._package_tags.get(name, [])
+
+    def _index_tag(self, key: str, packages: list):
+        """Adiciona ao índice os pacotes de uma etiqueta."""
+        for package in set(self._tag_packages.get(key, [])) - set(packages):
+            tags = self._package_tags.get(package, [])
+            if key in tags:
+                tags.remove(key)
+        self._tag_packages[key] = packages
+        for package in packages:
+            tags = self._package_tags.setdefault(package, [])
+            if key not in tags:
+                tags.append(key)
 
     def print_tags(self):
         """Imprime as etiquetas."""
         self._print_list("etiquetas", self.available_tags)
 
-    def search_by_tag(self, tag: str) -> list:
+    def search_by_tag(self, tag: str, refresh: bool = False) -> list:
         """ Busca pacotes com base em etiqueta.
 
         Parâmetros
         ----------
         tag: str
             etiqueta desejada
+        refresh: bool
+            flag para consultar novamente os pacotes das etiquetas
+            encontradas (por padrão, False).
         """
 
         tags = self.search_related(tag, self.available_tags, False)
@@ -46,8 +137,6 @@ class Tag(Env, FilterMixin):
 
         packages = []
         for key in tags:
-            url = self.url_tag + "/" + key
-            package = self._request_get(url)
-            packages += package
+            packages += self.get_packages_by_tag(key, refresh)
 
         return packages
@@ -1,5 +1,14 @@
 from .Env import Env
+from .ContentStore import ContentStore
+from .DownloadPool import DownloadPool
 from .File import File
 from .Group import Group
+from .MetadataCache import MetadataCache
+from .Monitor import Monitor
 from .Package import Package
+from .RequestScheduler import RequestScheduler
+from .Resource import Resource
+from .RetryPolicy import RetryPolicy
+from .RunResult import RunResult
+from .SyncManifest import SyncManifest
 from .Tag import Tag
@@ -0,0 +1,179 @@
+import os
+from .Sink import Sink, SinkWriter
+from .DirectorySink import DirectorySink
+from ..modules.CsvStream import CsvStream
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ColumnarSink(Sink):
+    """Grava os recursos CSV em uma pasta local já convertidos para
+    Parquet ou Arrow IPC (Feather), durante o download.
+
+    O CSV é convertido em blocos de `block_size` bytes à medida que é
+    recebido (ver CsvStream), de modo que apenas um bloco fica em
+    memória. Os tipos das colunas são inferidos no primeiro bloco e os
+    demais blocos são lidos com os mesmos tipos; campos vazios são
+    gravados como nulos. Se um bloco tiver valores que não cabem nesses
+    tipos (ex.: um código que passa a ter letras), as colunas afetadas
+    são ampliadas (ver CsvStream.read_arrow) e o que já foi gravado é
+    convertido, lote a lote, para os novos tipos. Recursos em outros
+    formatos (ex.: dicionários em PDF) são gravados sem conversão.
+    Requer o pacote `pyarrow` (pip install odufrn-downloader[arrow]).
+
+    > Exemplo:
+        ufrn_data.download_all(sink=ColumnarSink('/dados/ufrn'), workers=4)
+
+    O arquivo `<pacote>/<nome>.csv` é gravado como
+    `<pacote>/<nome>.parquet` (ou `.arrow`).
+
+    Atributos
+    ---------
+    root: str
+        o caminho da pasta onde serão adicionados os arquivos.
+    format: str
+        'parquet' ou 'arrow' (por padrão, 'parquet').
+    compression: str
+        compressão dos arquivos (por padrão, 'zstd').
+    block_size: int
+        tamanho, em bytes, dos blocos convertidos de cada vez.
+    encoding: str
+        codificação dos CSV (None para detectar).
+    delimiter: str
+        delimitador dos CSV (None para detectar).
+    infer_types: bool
+        flag para inferir os tipos das colunas; com False, todas as
+        colunas são gravadas como texto (por padrão, True).
+    """
+
+    FORMATS = ('parquet', 'arrow')
+
+    def __init__(self, root: str, format: str = 'parquet',
+                 compression: str = 'zstd',
+                 block_size: int = 4 * 1024 * 1024, encoding: str = None,
+                 delimiter: str = None, infer_types: bool = True):
+        if pyarrow is None:
+            raise ImportError(
+                'ColumnarSink requer o pacote pyarrow: '
+                'pip install odufrn-downloader[arrow]'
+            )
+        if format not in self.FORMATS:
+            raise ValueError('Formato inválido: {}'.format(format))
+
+        self.root = root
+        self.format = format
+        self.compression = compression
+        self.block_size = block_size
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.infer_types = infer_types
+        self._files = DirectorySink(root)
+
+    def open(self, key: str, resource: dict) -> SinkWriter:
+        if (resource.get('format') or '').lower() != 'csv':
+            return self._files.open(key, resource)
+
+        file_path = self._converted_path(key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        return _ColumnarWriter(self, file_path)
+
+    def exists(self, key: str) -> bool:
+        return self._files.exists(key) or \
+            os.path.exists(self._converted_path(key))
+
+    def _converted_path(self, key: str) -> str:
+        file_path = os.path.join(self.root, *key.split('/'))
+        return '{}.{}'.format(os.path.splitext(file_path)[0], self.format)
+
+
+class _ColumnarWriter(SinkWriter):
+    def __init__(self, sink: ColumnarSink, file_path: str):
+        self.sink = sink
+        self.file_path = file_path
+        self.part_path = file_path + '.part'
+        self.stream = CsvStream(sink.block_size, sink.encoding,
+                                sink.delimiter)
+        self._schema = None
+        self._writer = None
+        self._file = None
+
+    def write(self, chunk: bytes):
+        for block in self.stream.feed(chunk):
+            self._write_block(block)
+
+    def close(self):
+        for block in self.stream.close():
+            self._write_block(block)
+        if self._writer is None:
+            # CSV sem registros: grava apenas as colunas
+            self._open(pyarrow.schema([
+                (name, pyarrow.string())
+                for name in self.stream.columns or []
+            ]))
+        self._close()
+        os.replace(self.part_path, self.file_path)
+
+    def abort(self):
+        self._close()
+        for file_path in (self.part_path, self.part_path + '.old'):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def _write_block(self, block: bytes):
+        table = self.stream.read_arrow(block, self._schema,
+                                       self.sink.infer_types)
+        if self._writer is None:
+            self._open(table.schema)
+        elif table.schema != self._schema:
+            self._widen(table.schema)
+        self._writer.write_table(table)
+
+    def _widen(self, schema: 'pyarrow.Schema'):
+        """Regrava o que já foi escrito com os tipos ampliados de schema,
+        lote a lote."""
+        self._close()
+        old_path = self.part_path + '.old'
+        os.replace(self.part_path, old_path)
+        self._open(schema)
+        for batch in self._read_batches(old_path):
+            self._writer.write_table(
+                pyarrow.Table.from_batches([batch]).cast(schema)
+            )
+        os.remove(old_path)
+
+    def _read_batches(self, file_path: str):
+        if self.sink.format == 'parquet':
+            yield from pyarrow.parquet.ParquetFile(file_path).iter_batches()
+            return
+
+        with pyarrow.OSFile(file_path, 'rb') as source:
+            reader = pyarrow.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield reader.get_batch(index)
+
+    def _open(self, schema: 'pyarrow.Schema'):
+        self._schema = schema
+        if self.sink.format == 'parquet':
+            self._writer = pyarrow.parquet.ParquetWriter(
+                self.part_path, schema, compression=self.sink.compression
+            )
+        else:
+            self._file = pyarrow.OSFile(self.part_path, 'wb')
+            self._writer = pyarrow.ipc.new_file(
+                self._file, schema, options=pyarrow.ipc.IpcWriteOptions(
+                    compression=self.sink.compression
+                )
+            )
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,234 @@
+import csv
+import io
+import os
+import re
+from abc import abstractmethod
+from .Sink import Sink, SinkWriter
+from ..modules.CsvStream import CsvStream
+
+
+class DatabaseSink(Sink):
+    """Base dos sinks que gravam os registros dos recursos CSV em tabelas
+    de um banco de dados, durante o download (ver SQLiteSink e
+    DuckDBSink).
+
+    Cada recurso é gravado na tabela `<pacote>__<recurso>` (ex.:
+    `discentes__ingressantes_em_2018`), que é recriada a cada download.
+    O CSV é lido em blocos à medida que é recebido (ver CsvStream), os
+    tipos das colunas (INTEGER, REAL ou TEXT) são inferidos no primeiro
+    bloco e os registros são inseridos em lotes de batch_size linhas,
+    em uma transação por recurso: se o download falhar, a tabela não é
+    alterada. Recursos em outros formatos (ex.: dicionários em PDF) são
+    ignorados; use dictionary=False para não baixá-los.
+
+    Atributos
+    ---------
+    batch_size: int
+        quantidade de registros de cada inserção.
+    block_size: int
+        tamanho, em bytes, dos blocos lidos de cada vez.
+    encoding: str
+        codificação dos CSV (None para detectar).
+    delimiter: str
+        delimitador dos CSV (None para detectar).
+    """
+
+    def __init__(self, batch_size: int = 1000,
+                 block_size: int = 1024 * 1024, encoding: str = None,
+                 delimiter: str = None):
+        self.batch_size = batch_size
+        self.block_size = block_size
+        self.encoding = encoding
+        self.delimiter = delimiter
+
+    def open(self, key: str, resource: dict) -> SinkWriter:
+        if (resource.get('format') or '').lower() != 'csv':
+            return _DiscardWriter()
+
+        return _TableWriter(self, self.table_name(key), CsvStream(
+            self.block_size, self.encoding, self.delimiter
+        ))
+
+    @staticmethod
+    def table_name(key: str) -> str:
+        """Retorna o nome da tabela de um arquivo: `<pacote>__<recurso>`,
+        em minúsculas e sem acentos ou caracteres especiais.
+
+        Parâmetros
+        ----------
+        key: str
+            caminho relativo do arquivo (ver Sink.open).
+        """
+        parts = os.path.splitext(key)[0].split('/')[-2:]
+        return '__'.join(identifier(part) for part in parts)
+
+    @abstractmethod
+    def begin(self, table: str, columns: list, types: list):
+        """Inicia a gravação de uma tabela e retorna o estado usado nas
+        demais operações.
+
+        Parâmetros
+        ----------
+        table: str
+            nome da tabela.
+        columns: list
+            nomes das colunas.
+        types: list
+            tipos das colunas ('INTEGER', 'REAL' ou 'TEXT').
+        """
+
+    @abstractmethod
+    def insert(self, state, rows: list):
+        """Insere um lote de registros."""
+
+    @abstractmethod
+    def commit(self, state):
+        """Conclui a gravação da tabela."""
+
+    @abstractmethod
+    def rollback(self, state):
+        """Descarta a gravação da tabela."""
+
+
+_ACCENTS = str.maketrans(
+    'áàâãäéèêëíìîïóòôõöúùûüçñ', 'aaaaaeeeeiiiiooooouuuucn'
+)
+
+
+def identifier(name: str) -> str:
+    """Converte um nome em um identificador SQL simples: minúsculas,
+    sem acentos e com '_' no lugar dos demais caracteres."""
+    name = name.lower().translate(_ACCENTS)
+    name = re.sub(r'[^a-z0-9]+', '_', name).strip('_')
+    return name if name and not name[0].isdigit() else '_' + name
+
+
+def quote(name: str) -> str:
+    """Coloca um identificador SQL entre aspas."""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def unique_columns(columns: list) -> list:
+    """Converte os nomes das colunas em identificadores distintos."""
+    names = []
+    for index, column in enumerate(columns):
+        name = identifier(column) if column.strip() else \
+            'coluna_{}'.format(index + 1)
+        while name in names:
+            name += '_'
+        names.append(name)
+
+    return names
+
+
+def infer_types(rows: list, count: int) -> list:
+    """Infere os tipos ('INTEGER', 'REAL' ou 'TEXT') de count colunas a
+    partir dos registros. Colunas sem valores são TEXT.
+
+    Parâmetros
+    ----------
+    rows: list
+        os registros, como listas de textos.
+    count: int
+        quantidade de colunas.
+    """
+    types = []
+    for index in range(count):
+        values = [row[index] for row in rows
+                  if index < len(row) and row[index] != '']
+        if values and all(_is_integer(value) for value in values):
+            types.append('INTEGER')
+        elif values and all(_to_real(value) is not None for value in values):
+            types.append('REAL')
+        else:
+            types.append('TEXT')
+
+    return types
+
+
+def convert(row: list, types: list) -> tuple:
+    """Converte os valores de um registro para os tipos das colunas.
+    Valores vazios são nulos, e valores que não correspondem ao tipo são
+    mantidos como texto."""
+    values = []
+    for index, kind in enumerate(types):
+        value = row[index] if index < len(row) else ''
+        if value == '':
+            value = None
+        elif kind == 'INTEGER' and _is_integer(value):
+            value = int(value)
+        elif kind == 'REAL' and _to_real(value) is not None:
+            value = _to_real(value)
+        values.append(value)
+
+    return tuple(values)
+
+
+def _is_integer(value: str) -> bool:
+    # Códigos com zeros à esquerda (ex.: CPF, matrícula) continuam texto
+    digits = value[1:] if value[:1] == '-' else value
+    return digits.isdigit() and (digits == '0' or digits[0] != '0')
+
+
+def _to_real(value: str) -> float:
+    if _is_integer(value):
+        return float(value)
+    if ',' in value and '.' not in value:
+        # Decimais no formato brasileiro (ex.: 1,5)
+        value = value.replace(',', '.')
+    if not re.match(r'^-?(0|[1-9]\d*)?\.\d+$|^-?[1-9]\d*\.\d*$', value):
+        return None
+    return float(value)
+
+
+class _TableWriter(SinkWriter):
+    def __init__(self, sink: DatabaseSink, table: str, stream: CsvStream):
+        self.sink = sink
+        self.table = table
+        self.stream = stream
+        self._state = None
+        self._types = None
+        self._rows = []
+
+    def write(self, chunk: bytes):
+        for block in self.stream.feed(chunk):
+            self._write_block(block)
+
+    def close(self):
+        for block in self.stream.close():
+            self._write_block(block)
+        if self._state is None:
+            # CSV sem registros: cria a tabela apenas com as colunas
+            self._begin([])
+        self._flush(0)
+        self.sink.commit(self._state)
+
+    def abort(self):
+        if self._state is not None:
+            self.sink.rollback(self._state)
+
+    def _write_block(self, block: bytes):
+        rows = list(csv.reader(io.StringIO(block.decode('utf-8')),
+                               delimiter=self.stream.delimiter))
+        if self._state is None:
+            self._begin(rows)
+        self._rows.extend(convert(row, self._types) for row in rows)
+        self._flush(self.sink.batch_size)
+
+    def _begin(self, rows: list):
+        columns = self.stream.columns or []
+        self._types = infer_types(rows, len(columns))
+        self._state = self.sink.begin(
+            self.table, unique_columns(columns), self._types
+        )
+
+    def _flush(self, minimum: int):
+        while self._rows and len(self._rows) >= minimum:
+            batch = self._rows[:self.sink.batch_size]
+            self._rows = self._rows[self.sink.batch_size:]
+            self.sink.insert(self._state, batch)
+
+
+class _DiscardWriter(SinkWriter):
+    def write(self, chunk: bytes):
+        pass
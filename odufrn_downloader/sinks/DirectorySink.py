@@ -0,0 +1,45 @@
+import os
+from .Sink import Sink, SinkWriter
+
+
+class DirectorySink(Sink):
+    """Grava os arquivos em uma pasta local.
+
+    Cada arquivo é escrito em `<nome>.part` e renomeado para o nome final
+    ao término do download.
+
+    Atributos
+    ---------
+    root: str
+        o caminho da pasta onde serão adicionados os arquivos.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def open(self, key: str, resource: dict) -> SinkWriter:
+        file_path = os.path.join(self.root, *key.split('/'))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        return _FileWriter(file_path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.root, *key.split('/')))
+
+
+class _FileWriter(SinkWriter):
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.part_path = file_path + '.part'
+        self._file = open(self.part_path, 'wb')
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+
+    def close(self):
+        self._file.close()
+        os.replace(self.part_path, self.file_path)
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
@@ -0,0 +1,139 @@
+import threading
+from .DatabaseSink import DatabaseSink, quote, _to_real
+
+try:
+    import duckdb
+    import pyarrow
+except ImportError:
+    duckdb = None
+
+
+class DuckDBSink(DatabaseSink):
+    """Grava os registros dos recursos CSV em tabelas de um banco DuckDB
+    (ver DatabaseSink). Requer os pacotes `duckdb` e `pyarrow`
+    (pip install odufrn-downloader[duckdb]).
+
+    Cada recurso é gravado em uma transação própria, em um cursor da
+    conexão do sink, de modo que vários recursos podem ser baixados
+    simultaneamente (workers). Cada lote é convertido em uma tabela
+    Arrow e inserido de uma só vez. Como as colunas do DuckDB têm tipo
+    fixo, uma coluna que recebe um valor que não corresponde ao tipo
+    inferido no primeiro bloco é alargada dentro da transação (BIGINT
+    para DOUBLE, ou para VARCHAR se o valor não for numérico).
+
+    > Exemplo:
+        with DuckDBSink('ufrn.duckdb') as sink:
+            ufrn_data.download_group('ensino', dictionary=False, sink=sink)
+
+    Atributos
+    ---------
+    database: str
+        caminho do arquivo do banco.
+    """
+
+    def __init__(self, database: str, **options):
+        if duckdb is None:
+            raise ImportError(
+                'DuckDBSink requer os pacotes duckdb e pyarrow: '
+                'pip install odufrn-downloader[duckdb]'
+            )
+        super().__init__(**options)
+        self.database = database
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> 'duckdb.DuckDBPyConnection':
+        """Conexão com o banco, aberta no primeiro uso."""
+        with self._lock:
+            if self._connection is None:
+                self._connection = duckdb.connect(self.database)
+            return self._connection
+
+    def close(self):
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def begin(self, table: str, columns: list, types: list):
+        cursor = self.connection.cursor()
+        cursor.execute('BEGIN TRANSACTION')
+        cursor.execute('CREATE OR REPLACE TABLE {} ({})'.format(
+            quote(table), ', '.join(
+                '{} {}'.format(quote(column), self._type(kind))
+                for column, kind in zip(columns, types)
+            )
+        ))
+        return cursor, table, columns, list(types)
+
+    def insert(self, state, rows: list):
+        cursor, table, columns, types = state
+        arrays = []
+        for index, column in enumerate(columns):
+            values = [row[index] for row in rows]
+            kind = self._widen(values, types[index])
+            if kind != types[index]:
+                cursor.execute('ALTER TABLE {} ALTER COLUMN {} TYPE {}'.format(
+                    quote(table), quote(column), self._type(kind)
+                ))
+                types[index] = kind
+            arrays.append(self._array(values, kind))
+
+        batch = pyarrow.Table.from_arrays(arrays, names=columns)
+        cursor.register('lote', batch)
+        try:
+            cursor.execute(
+                'INSERT INTO {} SELECT * FROM lote'.format(quote(table))
+            )
+        finally:
+            cursor.unregister('lote')
+
+    def commit(self, state):
+        try:
+            state[0].execute('COMMIT')
+        finally:
+            state[0].close()
+
+    def rollback(self, state):
+        try:
+            state[0].execute('ROLLBACK')
+        finally:
+            state[0].close()
+
+    @staticmethod
+    def _widen(values: list, kind: str) -> str:
+        """Retorna o tipo que comporta os valores de uma coluna do tipo
+        kind. Valores que não correspondem ao tipo chegam como texto (ver
+        convert)."""
+        texts = [value for value in values if isinstance(value, str)]
+        if kind == 'TEXT' or not texts:
+            return kind
+        if all(_to_real(value) is not None for value in texts):
+            return 'REAL'
+        return 'TEXT'
+
+    @staticmethod
+    def _array(values: list, kind: str) -> 'pyarrow.Array':
+        if kind == 'INTEGER':
+            return pyarrow.array(values, pyarrow.int64())
+        if kind == 'REAL':
+            return pyarrow.array([
+                _to_real(value) if isinstance(value, str) else value
+                for value in values
+            ], pyarrow.float64())
+        return pyarrow.array([
+            value if value is None or isinstance(value, str) else str(value)
+            for value in values
+        ], pyarrow.string())
+
+    @staticmethod
+    def _type(kind: str) -> str:
+        return {'INTEGER': 'BIGINT', 'REAL': 'DOUBLE'}.get(kind, 'VARCHAR')
+
+    def __enter__(self) -> 'DuckDBSink':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
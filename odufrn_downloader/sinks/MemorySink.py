@@ -0,0 +1,49 @@
+import io
+import threading
+from .Sink import Sink, SinkWriter
+
+
+class MemorySink(Sink):
+    """Mantém os arquivos baixados em memória.
+
+    > Exemplo:
+        sink = MemorySink()
+        ufrn_data.download_package('telefones', sink=sink)
+        content = sink.files['telefones/Telefones.csv']
+
+    Atributos
+    ---------
+    files: dict
+        dicionário {caminho: conteúdo em bytes} dos arquivos concluídos.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self._lock = threading.Lock()
+
+    def open(self, key: str, resource: dict) -> SinkWriter:
+        return _MemoryWriter(self, key)
+
+    def exists(self, key: str) -> bool:
+        return key in self.files
+
+    def _store(self, key: str, content: bytes):
+        with self._lock:
+            self.files[key] = content
+
+
+class _MemoryWriter(SinkWriter):
+    def __init__(self, sink: MemorySink, key: str):
+        self.sink = sink
+        self.key = key
+        self._buffer = io.BytesIO()
+
+    def write(self, chunk: bytes):
+        self._buffer.write(chunk)
+
+    def close(self):
+        self.sink._store(self.key, self._buffer.getvalue())
+        self._buffer.close()
+
+    def abort(self):
+        self._buffer.close()
@@ -0,0 +1,229 @@
+import datetime
+import hashlib
+import hmac
+import re
+import requests
+from urllib.parse import quote, urlsplit
+from .Sink import Sink, SinkWriter
+from ..modules.RetryPolicy import RetryPolicy
+
+
+class S3Sink(Sink):
+    """Envia os arquivos baixados a um bucket de um serviço compatível
+    com S3 (AWS S3, MinIO, etc), sem gravá-los no disco.
+
+    Arquivos menores que part_size são enviados em uma única requisição
+    PUT; os demais por upload multipart, em partes de part_size bytes,
+    de modo que no máximo uma parte de cada arquivo fica em memória. Uma
+    resposta 200 com um `<Error>` no corpo (possível na conclusão do
+    upload multipart) também é tratada como falha. As requisições são
+    assinadas com AWS Signature Version 4 e usam URLs no
+    estilo `<endpoint>/<bucket>/<chave>`.
+
+    > Exemplo:
+        sink = S3Sink('dados-ufrn', 'http://localhost:9000',
+                      'minio', 'minio123', prefix='ufrn/')
+        ufrn_data.download_all(sink=sink, workers=8)
+
+    Atributos
+    ---------
+    bucket: str
+        nome do bucket.
+    endpoint_url: str
+        endereço do serviço.
+    prefix: str
+        prefixo adicionado à chave de cada arquivo.
+    part_size: int
+        tamanho, em bytes, das partes do upload multipart (mínimo de
+        5 MiB no S3).
+    session: requests.Session
+        sessão HTTP usada nas requisições.
+    retry: RetryPolicy
+        política de novas tentativas das requisições ao serviço, que
+        respeita o `Retry-After` das respostas 503 (SlowDown) do S3
+        (por padrão, None, sem novas tentativas).
+    """
+
+    def __init__(self, bucket: str, endpoint_url: str, access_key: str,
+                 secret_key: str, region: str = 'us-east-1',
+                 prefix: str = '', part_size: int = 8 * 1024 * 1024,
+                 session: requests.Session = None,
+                 retry: RetryPolicy = None):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url.rstrip('/')
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.prefix = prefix
+        self.part_size = part_size
+        self.session = session if session is not None else requests.Session()
+        self.retry = retry
+
+    def open(self, key: str, resource: dict) -> SinkWriter:
+        return _S3Writer(self, self.prefix + key)
+
+    def request(self, method: str, key: str, params: dict = None,
+                data: bytes = b'') -> requests.Response:
+        """Realiza uma requisição assinada sobre um objeto do bucket.
+
+        Parâmetros
+        ----------
+        method: str
+            método HTTP.
+        key: str
+            chave do objeto.
+        params: dict
+            parâmetros da query string.
+        data: bytes
+            corpo da requisição.
+
+        Com retry, cada nova tentativa é assinada novamente.
+        """
+        if self.retry is None:
+            return self._request(method, key, params, data)
+
+        return self.retry.call(self._request, method, key, params, data)
+
+    def _request(self, method: str, key: str, params: dict,
+                 data: bytes) -> requests.Response:
+        params = params or {}
+        path = quote('/{}/{}'.format(self.bucket, key), safe='/-_.~')
+        query = '&'.join(
+            '{}={}'.format(quote(name, safe='-_.~'), quote(value, safe='-_.~'))
+            for name, value in sorted(params.items())
+        )
+        headers = {
+            'host': urlsplit(self.endpoint_url).netloc,
+            'x-amz-content-sha256': hashlib.sha256(data).hexdigest(),
+            'x-amz-date': datetime.datetime.now(
+                datetime.timezone.utc
+            ).strftime('%Y%m%dT%H%M%SZ'),
+        }
+        headers['Authorization'] = self.authorization(
+            method, path, query, headers
+        )
+
+        url = self.endpoint_url + path + ('?' + query if query else '')
+        response = self.session.request(method, url, data=data,
+                                        headers=headers)
+        response.raise_for_status()
+        # O S3 pode responder 200 e informar o erro no corpo; InternalError
+        # e SlowDown são tratados como 500 e 503, para novas tentativas
+        error = re.match(r'(<\?xml[^>]*>\s*)?<Error>.*?<Code>(.*?)</Code>',
+                         response.text, re.S)
+        if error is not None:
+            code = error.group(2)
+            response.status_code = {
+                'InternalError': 500, 'SlowDown': 503
+            }.get(code, response.status_code)
+            raise requests.HTTPError(
+                '{} em {} {}'.format(code, method, url), response=response
+            )
+        return response
+
+    def authorization(self, method: str, path: str, query: str,
+                      headers: dict) -> str:
+        """Calcula o cabeçalho Authorization (AWS Signature Version 4).
+
+        Parâmetros
+        ----------
+        method: str
+            método HTTP.
+        path: str
+            caminho da url, já codificado.
+        query: str
+            query string canônica (parâmetros ordenados e codificados).
+        headers: dict
+            cabeçalhos assinados, incluindo `host`, `x-amz-date` e
+            `x-amz-content-sha256`.
+        """
+        headers = {
+            name.lower(): ' '.join(str(value).split())
+            for name, value in headers.items()
+        }
+        signed_headers = ';'.join(sorted(headers))
+        canonical_request = '\n'.join([
+            method, path, query,
+            ''.join(
+                '{}:{}\n'.format(name, headers[name])
+                for name in sorted(headers)
+            ),
+            signed_headers,
+            headers['x-amz-content-sha256'],
+        ])
+
+        amz_date = headers['x-amz-date']
+        scope = '{}/{}/s3/aws4_request'.format(amz_date[:8], self.region)
+        string_to_sign = '\n'.join([
+            'AWS4-HMAC-SHA256', amz_date, scope,
+            hashlib.sha256(canonical_request.encode('utf-8')).hexdigest(),
+        ])
+
+        key = ('AWS4' + self.secret_key).encode('utf-8')
+        for part in (amz_date[:8], self.region, 's3', 'aws4_request'):
+            key = hmac.new(key, part.encode('utf-8'), hashlib.sha256).digest()
+        signature = hmac.new(
+            key, string_to_sign.encode('utf-8'), hashlib.sha256
+        ).hexdigest()
+
+        return 'AWS4-HMAC-SHA256 Credential={}/{}, SignedHeaders={}, ' \
+            'Signature={}'.format(
+                self.access_key, scope, signed_headers, signature
+            )
+
+
+class _S3Writer(SinkWriter):
+    def __init__(self, sink: S3Sink, key: str):
+        self.sink = sink
+        self.key = key
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def write(self, chunk: bytes):
+        self._buffer += chunk
+        while len(self._buffer) >= self.sink.part_size:
+            self._upload_part()
+
+    def close(self):
+        try:
+            if self._upload_id is None:
+                self.sink.request('PUT', self.key, data=bytes(self._buffer))
+                return
+
+            if self._buffer:
+                self._upload_part()
+            body = ''.join(
+                '<Part><PartNumber>{}</PartNumber><ETag>{}</ETag></Part>'
+                .format(number, etag)
+                for number, etag in self._parts
+            )
+            self.sink.request(
+                'POST', self.key, {'uploadId': self._upload_id},
+                '<CompleteMultipartUpload>{}</CompleteMultipartUpload>'
+                .format(body).encode('utf-8')
+            )
+        except Exception:
+            self.abort()
+            raise
+
+    def abort(self):
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            upload_id, self._upload_id = self._upload_id, None
+            self.sink.request('DELETE', self.key, {'uploadId': upload_id})
+
+    def _upload_part(self):
+        if self._upload_id is None:
+            response = self.sink.request('POST', self.key, {'uploads': ''})
+            self._upload_id = re.search(
+                r'<UploadId>(.*?)</UploadId>', response.text
+            ).group(1)
+
+        number = len(self._parts) + 1
+        data = bytes(self._buffer[:self.sink.part_size])
+        response = self.sink.request('PUT', self.key, {
+            'partNumber': str(number), 'uploadId': self._upload_id
+        }, data)
+        self._parts.append((number, response.headers['ETag']))
+        del self._buffer[:len(data)]
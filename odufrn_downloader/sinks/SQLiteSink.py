@@ -0,0 +1,72 @@
+import sqlite3
+from .DatabaseSink import DatabaseSink, quote
+
+
+class SQLiteSink(DatabaseSink):
+    """Grava os registros dos recursos CSV em tabelas de um banco SQLite
+    (ver DatabaseSink).
+
+    Durante o download, os registros de cada recurso são inseridos em uma
+    tabela temporária da própria conexão, que não bloqueia o banco; ao
+    final, a tabela é recriada a partir dela em uma única transação.
+    Assim, vários recursos podem ser baixados simultaneamente (workers).
+
+    > Exemplo:
+        sink = SQLiteSink('ufrn.db')
+        ufrn_data.download_group('ensino', dictionary=False, sink=sink)
+
+    Atributos
+    ---------
+    database: str
+        caminho do arquivo do banco.
+    timeout: float
+        espera máxima, em segundos, pelo banco quando outra transação
+        estiver em andamento.
+    """
+
+    def __init__(self, database: str, timeout: float = 60.0, **options):
+        super().__init__(**options)
+        self.database = database
+        self.timeout = timeout
+
+    def begin(self, table: str, columns: list, types: list):
+        connection = sqlite3.connect(
+            self.database, timeout=self.timeout, isolation_level=None
+        )
+        definition = ', '.join(
+            '{} {}'.format(quote(column), kind)
+            for column, kind in zip(columns, types)
+        )
+        connection.execute('CREATE TEMP TABLE stage ({})'.format(definition))
+        return connection, table, definition, len(columns)
+
+    def insert(self, state, rows: list):
+        connection, _, _, count = state
+        connection.executemany(
+            'INSERT INTO temp.stage VALUES ({})'.format(
+                ', '.join('?' * count)
+            ), rows
+        )
+
+    def commit(self, state):
+        connection, table, definition, _ = state
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(
+                'DROP TABLE IF EXISTS main.{}'.format(quote(table))
+            )
+            connection.execute('CREATE TABLE main.{} ({})'.format(
+                quote(table), definition
+            ))
+            connection.execute('INSERT INTO main.{} SELECT * FROM '
+                               'temp.stage'.format(quote(table)))
+            connection.execute('COMMIT')
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            raise
+        finally:
+            connection.close()
+
+    def rollback(self, state):
+        state[0].close()
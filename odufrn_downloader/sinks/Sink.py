@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+
+
+class Sink(ABC):
+    """Destino dos arquivos baixados.
+
+    Os métodos de download que recebem um sink não gravam os arquivos no
+    disco: o conteúdo de cada recurso é entregue ao sink em partes, à
+    medida que é recebido do servidor.
+
+    Um sink deve implementar `open`, que retorna um SinkWriter para cada
+    arquivo. Com mais de um worker, `open` pode ser chamado de threads
+    diferentes ao mesmo tempo.
+    """
+
+    @abstractmethod
+    def open(self, key: str, resource: dict) -> 'SinkWriter':
+        """Inicia a gravação de um arquivo.
+
+        Parâmetros
+        ----------
+        key: str
+            caminho relativo do arquivo, no formato
+            `<pacote>/<nome>.<formato>` (ou `<grupo>/<pacote>/...`).
+        resource: dict
+            o recurso do pacote.
+        """
+
+    def exists(self, key: str) -> bool:
+        """Indica se o arquivo key foi gravado e ainda existe, para que
+        uma execução com `previous` não o baixe novamente. Retorna None
+        quando o sink não sabe responder (por padrão), e nesse caso o
+        registro da execução anterior é considerado válido.
+
+        Parâmetros
+        ----------
+        key: str
+            caminho relativo do arquivo (ver open).
+        """
+        return None
+
+
+class SinkWriter(ABC):
+    """Gravação de um arquivo em um sink.
+
+    Recebe as partes do arquivo em `write`. Ao término do download é
+    chamado `close`; se o download falhar, é chamado `abort`, e o que
+    foi escrito deve ser descartado sempre que possível.
+    """
+
+    @abstractmethod
+    def write(self, chunk: bytes):
+        """Escreve uma parte do arquivo."""
+
+    def close(self):
+        """Conclui a gravação do arquivo."""
+
+    def abort(self):
+        """Descarta a gravação do arquivo."""
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import threading
+from .Sink import Sink, SinkWriter
+
+
+class WriterSink(Sink):
+    """Entrega os arquivos baixados a um objeto file-like ou a uma
+    função.
+
+    Se target tiver o método `write`, o conteúdo dos arquivos é escrito
+    nele, um arquivo após o outro: cada download é guardado em um buffer
+    próprio (em memória até `buffer_size` bytes, depois em um arquivo
+    temporário) e copiado para target ao terminar, de modo que vários
+    workers baixam ao mesmo tempo e os downloads que falham não chegam a
+    target. Caso contrário, target é chamado como `target(key, chunk)`
+    para cada parte recebida, com as partes de arquivos diferentes
+    podendo se intercalar; essas partes já entregues não podem ser
+    desfeitas se o download falhar.
+
+    > Exemplo:
+        sink = WriterSink(sys.stdout.buffer)
+        ufrn_data.download_package('telefones', sink=sink)
+
+    Atributos
+    ---------
+    target: file-like ou callable
+        o destino das partes dos arquivos.
+    buffer_size: int
+        tamanho máximo, em bytes, do buffer em memória de cada download.
+    """
+
+    def __init__(self, target, buffer_size: int = 8 * 1024 * 1024):
+        self.target = target
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+
+    def open(self, key: str, resource: dict) -> SinkWriter:
+        if hasattr(self.target, 'write'):
+            return _StreamWriter(self.target, self._lock, self.buffer_size)
+        return _CallbackWriter(self.target, key)
+
+
+class _StreamWriter(SinkWriter):
+    def __init__(self, stream, lock: threading.Lock, buffer_size: int):
+        self.stream = stream
+        self._lock = lock
+        self._buffer = tempfile.SpooledTemporaryFile(buffer_size)
+
+    def write(self, chunk: bytes):
+        self._buffer.write(chunk)
+
+    def close(self):
+        # O lock é mantido apenas durante a cópia do arquivo completo
+        try:
+            self._buffer.seek(0)
+            with self._lock:
+                shutil.copyfileobj(self._buffer, self.stream)
+        finally:
+            self._buffer.close()
+
+    def abort(self):
+        self._buffer.close()
+
+
+class _CallbackWriter(SinkWriter):
+    def __init__(self, fun, key: str):
+        self.fun = fun
+        self.key = key
+
+    def write(self, chunk: bytes):
+        self.fun(self.key, chunk)
@@ -0,0 +1,9 @@
+from .Sink import Sink, SinkWriter
+from .DirectorySink import DirectorySink
+from .MemorySink import MemorySink
+from .WriterSink import WriterSink
+from .S3Sink import S3Sink
+from .ColumnarSink import ColumnarSink
+from .DatabaseSink import DatabaseSink
+from .SQLiteSink import SQLiteSink
+from .DuckDBSink import DuckDBSink
@@ -0,0 +1,621 @@
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+def make_catalog(packages: dict, groups: dict = None,
+                 file_size: int = 64) -> dict:
+    """Monta um catálogo no formato servido pelo CKANServer.
+
+    Parâmetros
+    ----------
+    packages: dict
+        dicionário {pacote: {'resources': [(nome, formato), ...],
+        'tags': [...]}}.
+    groups: dict
+        dicionário {grupo: [pacotes]}.
+    file_size: int
+        tamanho, em bytes, do conteúdo de cada recurso.
+
+    Em catalog['files'], o conteúdo de um arquivo pode ser substituído
+    por um inteiro: o servidor então gera essa quantidade de bytes sob
+    demanda, sem mantê-los em memória.
+    """
+    groups = groups or {}
+    catalog = {'packages': {}, 'groups': {}, 'tags': {}, 'files': {}}
+
+    for name, info in packages.items():
+        resources = []
+        for index, (res_name, res_format) in enumerate(info['resources']):
+            path = 'files/{}/{}.{}'.format(name, index, res_format.lower())
+            content = (
+                '{};{}\n'.format(name, res_name) * file_size
+            ).encode('utf-8')[:file_size]
+            catalog['files'][path] = content
+            resources.append({
+                'id': '{}-{}'.format(name, index),
+                'name': res_name,
+                'format': res_format,
+                'path': path,
+                'size': len(content),
+                'last_modified': '2019-01-01T00:00:00',
+            })
+
+        package_groups = [g for g, pkgs in groups.items() if name in pkgs]
+        catalog['packages'][name] = {
+            'name': name,
+            'resources': resources,
+            'tags': list(info.get('tags', [])),
+            'groups': package_groups,
+        }
+        for tag in info.get('tags', []):
+            catalog['tags'].setdefault(tag, []).append(name)
+
+    for group, pkgs in groups.items():
+        catalog['groups'][group] = list(pkgs)
+
+    return catalog
+
+
+def default_catalog() -> dict:
+    """Catálogo pequeno inspirado nos dados da UFRN, usado nos testes."""
+    packages = {
+        'discentes': {
+            'resources': [
+                ('Ingressantes em 2017', 'CSV'),
+                ('Ingressantes em 2018', 'CSV'),
+                ('Dicionário de Dados - Discentes', 'PDF'),
+            ],
+            'tags': ['graduacao', 'discentes'],
+        },
+        'dados-complementares-de-discentes': {
+            'resources': [('Dados complementares', 'CSV')],
+            'tags': ['discentes'],
+        },
+        'telefones': {
+            'resources': [('Telefones', 'CSV')],
+            'tags': ['institucional'],
+        },
+        'unidades-academicas': {
+            'resources': [('Unidades Acadêmicas', 'CSV')],
+            'tags': ['institucional'],
+        },
+        'cursos-de-graduacao': {
+            'resources': [('Cursos de graduação', 'CSV')],
+            'tags': ['graduacao'],
+        },
+        'acervo-biblioteca': {
+            'resources': [('Acervo', 'CSV')],
+            'tags': ['materiais'],
+        },
+    }
+    groups = {
+        'ensino': ['discentes', 'cursos-de-graduacao'],
+        'institucional': ['telefones', 'unidades-academicas'],
+        'biblioteca': ['acervo-biblioteca'],
+    }
+
+    return make_catalog(packages, groups)
+
+
+def ufrn_catalog() -> dict:
+    """Catálogo que reproduz os nomes de grupos, pacotes e etiquetas do
+    dados.ufrn.br usados pelos testes que consultavam a API real."""
+    packages = {
+        'acervo-biblioteca': ('biblioteca', ['materiais'], ['Acervo']),
+        'emprestimos-biblioteca': ('biblioteca', [], ['Empréstimos 2018']),
+        'comunicados': ('comunicados-e-documentos', [], ['Comunicados']),
+        'contratos': ('contratos-e-convenios', [], ['Contratos']),
+        'convenios': ('contratos-e-convenios', [], ['Convênios']),
+        'despesas': ('despesas-e-orcamento', [], ['Despesas 2018']),
+        'discentes': ('ensino', ['graduacao', 'discentes'], [
+            'Ingressantes em 2017', 'Ingressantes em 2018',
+            'Dicionário de Dados - Discentes',
+        ]),
+        'dados-complementares-de-discentes': (
+            'ensino', ['discentes'], ['Dados complementares']
+        ),
+        'auxilios-a-discentes': ('ensino', ['discentes'], ['Auxílios']),
+        'cursos-de-graduacao': (
+            'ensino', ['graduacao'], ['Cursos de graduação']
+        ),
+        'cursos-de-pos-graduacao': (
+            'ensino', ['pos'], ['Cursos de pós-graduação']
+        ),
+        'programas-de-pos-graduacao': ('ensino', ['pos'], ['Programas']),
+        'turmas': ('ensino', ['graduacao'], ['Turmas 2017', 'Turmas 2018']),
+        'cursos-ufrn': ('ensino', ['graduacao'], ['Cursos']),
+        'estruturas-curriculares': (
+            'ensino', ['graduacao'], ['Estruturas curriculares']
+        ),
+        'acoes-de-extensao': ('extensao', [], ['Ações de extensão']),
+        'telefones': ('institucional', ['institucional'], ['Telefones']),
+        'unidades-academicas': (
+            'institucional', ['institucional'], ['Unidades Acadêmicas']
+        ),
+        'materiais-de-almoxarifado': ('materiais', [], ['Materiais']),
+        'bens-patrimoniais': ('patrimonio', [], ['Bens']),
+        'projetos-de-pesquisa': ('pesquisa', [], ['Projetos de pesquisa']),
+        'docentes': ('pessoas', [], ['Docentes']),
+        'servidores': ('pessoas', [], ['Servidores']),
+        'processos': ('processos', [], ['Processos 2018']),
+        'processos-seletivos': ('processos', [], ['Processos seletivos']),
+    }
+    groups = {}
+    for name, (group, _, _) in packages.items():
+        groups.setdefault(group, []).append(name)
+
+    return make_catalog({
+        name: {
+            'resources': [
+                (resource, 'PDF' if 'Dicion' in resource else 'CSV')
+                for resource in resources
+            ],
+            'tags': tags,
+        }
+        for name, (_, tags, resources) in packages.items()
+    }, groups)
+
+
+def synthetic_catalog(n_packages: int, resources_per_package: int = 3,
+                      file_size: int = 64, n_groups: int = 10) -> dict:
+    """Gera um catálogo sintético com n_packages pacotes."""
+    packages = {}
+    groups = {'grupo-{}'.format(i): [] for i in range(n_groups)}
+    for i in range(n_packages):
+        name = 'pacote-{}-dados'.format(i)
+        resources = [
+            ('Recurso {} de {}'.format(j, 2000 + j), 'CSV')
+            for j in range(resources_per_package)
+        ]
+        packages[name] = {
+            'resources': resources,
+            'tags': ['etiqueta-{}'.format(i % 20)],
+        }
+        groups['grupo-{}'.format(i % n_groups)].append(name)
+
+    return make_catalog(packages, groups, file_size)
+
+
+class CKANServer:
+    """Servidor HTTP local que imita os endpoints do dados.ufrn.br
+    usados pelo pacote.
+
+    > Exemplo:
+        with CKANServer() as server:
+            ufrn_data.url_base = server.url
+
+    Atributos
+    ---------
+    catalog: dict
+        catálogo servido (ver make_catalog).
+    latency: float
+        atraso, em segundos, aplicado a cada resposta.
+    requests: list
+        caminhos de todas as requisições recebidas.
+    connections: set
+        endereços dos clientes das conexões abertas com o servidor.
+    ranges: bool
+        indica se o servidor atende requisições com `Range`.
+    bytes_sent: int
+        total de bytes de arquivos enviados.
+    capacity: int
+        quantidade de requisições simultâneas que o servidor atende; as
+        demais recebem 503 (None para não haver limite).
+    max_in_flight: int
+        maior quantidade de requisições simultâneas atendidas.
+    rejected: int
+        quantidade de requisições recusadas por excesso de carga.
+    errors: dict
+        falhas a injetar, {caminho: [status, ...]}: cada requisição ao
+        caminho (ex.: 'files/telefones/0.csv') recebe o próximo status
+        da lista, enquanto houver.
+    error_headers: dict
+        cabeçalhos enviados com as falhas injetadas (ex.: Retry-After).
+    error_rate: float
+        fração das requisições de arquivos que recebem 503, escolhidas
+        de forma aleatória e reprodutível (por padrão, 0).
+    """
+
+    def __init__(self, catalog: dict = None, latency: float = 0.0,
+                 capacity: int = None, error_rate: float = 0.0,
+                 seed: int = 0):
+        self.catalog = catalog if catalog is not None else default_catalog()
+        self.latency = latency
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.requests = []
+        self.connections = set()
+        self.ranges = True
+        self.bytes_sent = 0
+        self.max_in_flight = 0
+        self.rejected = 0
+        self.errors = {}
+        self.error_headers = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address
+        return 'http://{}:{}/'.format(host, port)
+
+    def reset(self):
+        """Zera o registro de requisições e conexões."""
+        self.requests = []
+        self.connections = set()
+        self.bytes_sent = 0
+        self.max_in_flight = 0
+        self.rejected = 0
+
+    def start(self) -> 'CKANServer':
+        server = self
+
+        class Handler(_CKANHandler):
+            ckan = server
+
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> 'CKANServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clientes que fecham a conexão no meio da resposta são esperados
+        if not issubclass(sys.exc_info()[0], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _CKANHandler(BaseHTTPRequestHandler):
+    ckan = None
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.ckan.requests.append(self.path)
+        self.ckan.connections.add(self.client_address)
+        with self.ckan._lock:
+            overloaded = self.ckan.capacity is not None \
+                and self.ckan._in_flight >= self.ckan.capacity
+            if overloaded:
+                self.ckan.rejected += 1
+            else:
+                self.ckan._in_flight += 1
+                self.ckan.max_in_flight = max(
+                    self.ckan.max_in_flight, self.ckan._in_flight
+                )
+        if overloaded:
+            return self._send(503, b'Overloaded', 'text/plain')
+
+        try:
+            status = self._injected_error()
+            if status is not None:
+                return self._send(status, b'Error', 'text/plain',
+                                  self.ckan.error_headers)
+            self._respond()
+        finally:
+            with self.ckan._lock:
+                self.ckan._in_flight -= 1
+
+    def _injected_error(self) -> int:
+        path = unquote(urlsplit(self.path).path.lstrip('/'))
+        with self.ckan._lock:
+            errors = self.ckan.errors.get(path)
+            if errors:
+                return errors.pop(0)
+            if path.startswith('files/') and self.ckan.error_rate \
+                    and self.ckan._random.random() < self.ckan.error_rate:
+                return 503
+            return None
+
+    def _respond(self):
+        if self.ckan.latency:
+            time.sleep(self.ckan.latency)
+
+        url = urlsplit(self.path)
+        path = unquote(url.path.lstrip('/'))
+        query = parse_qs(url.query)
+        catalog = self.ckan.catalog
+
+        if path == 'api/action/package_list':
+            return self._json({'result': sorted(catalog['packages'])})
+        if path == 'api/action/group_list':
+            return self._json({'result': sorted(catalog['groups'])})
+        if path == 'api/action/tag_list':
+            return self._json({'result': sorted(catalog['tags'])})
+        if path == 'api/action/package_search':
+            return self._json({'result': self._search(query)})
+
+        prefix, _, name = path.rpartition('/')
+        if prefix == 'api/rest/dataset' and name in catalog['packages']:
+            return self._json(self._package(catalog['packages'][name]))
+        if prefix == 'api/rest/group' and name in catalog['groups']:
+            return self._json({
+                'name': name, 'packages': catalog['groups'][name]
+            })
+        if prefix == 'api/rest/tag' and name in catalog['tags']:
+            return self._json(catalog['tags'][name])
+        if path in catalog['files']:
+            content = catalog['files'][path]
+            if isinstance(content, int):
+                return self._send_generated(content)
+            etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'', None, {'ETag': etag})
+            return self._send_file(content, {'ETag': etag})
+
+        # A API do CKAN responde em json também nos erros
+        if path.startswith('api/rest/'):
+            return self._json('Not found', 404)
+        if path.startswith('api/action/'):
+            return self._json({
+                'success': False,
+                'error': {'message': 'Not found', '__type': 'Not Found Error'},
+            }, 404)
+        return self._send(404, b'Not found', 'text/plain')
+
+    def _search(self, query: dict) -> dict:
+        rows = int(query.get('rows', ['10'])[0])
+        start = int(query.get('start', ['0'])[0])
+        names = sorted(self.ckan.catalog['packages'])
+        results = []
+        for name in names[start:start + rows]:
+            package = self._package(self.ckan.catalog['packages'][name])
+            package['tags'] = [{'name': tag} for tag in package['tags']]
+            package['groups'] = [
+                {'name': group} for group in package['groups']
+            ]
+            results.append(package)
+
+        return {'count': len(names), 'results': results}
+
+    def _package(self, package: dict) -> dict:
+        base = 'http://{}/'.format(self.headers['Host'])
+        package = dict(package)
+        package['resources'] = [
+            dict(resource, url=base + quote(resource['path']))
+            for resource in package['resources']
+        ]
+        return package
+
+    def _json(self, data, status: int = 200):
+        self._send(status, json.dumps(data).encode('utf-8'),
+                   'application/json')
+
+    def _send_file(self, content: bytes, headers: dict):
+        start = self._range_start()
+        if_range = self.headers.get('If-Range')
+        if if_range is not None and if_range != headers.get('ETag'):
+            start = None
+        if start is None:
+            self.ckan.bytes_sent += len(content)
+            return self._send(200, content, 'application/octet-stream',
+                              headers)
+        if start >= len(content):
+            return self._send(416, b'', None, {
+                'Content-Range': 'bytes */{}'.format(len(content))
+            })
+
+        headers = dict(headers)
+        headers['Content-Range'] = 'bytes {}-{}/{}'.format(
+            start, len(content) - 1, len(content)
+        )
+        self.ckan.bytes_sent += len(content) - start
+        self._send(206, content[start:], 'application/octet-stream', headers)
+
+    def _range_start(self):
+        value = self.headers.get('Range', '')
+        if not self.ckan.ranges or not value.startswith('bytes='):
+            return None
+        return int(value[len('bytes='):].split('-')[0])
+
+    def _send_generated(self, size: int, chunk_size: int = 1024 * 1024):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        chunk = b'0123456789abcdef' * (chunk_size // 16)
+        while size > 0:
+            self.wfile.write(chunk[:size])
+            size -= len(chunk)
+
+    def _send(self, status: int, body: bytes, content_type: str,
+              headers: dict = None):
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header('Content-Type', content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class S3Server:
+    """Servidor HTTP local que imita a API de objetos de um serviço
+    compatível com S3 (como o MinIO), em URLs no estilo
+    `<endereço>/<bucket>/<chave>`.
+
+    As assinaturas não são conferidas: requisições sem o cabeçalho
+    Authorization recebem 403.
+
+    Atributos
+    ---------
+    objects: dict
+        dicionário {(bucket, chave): conteúdo} dos objetos gravados.
+    uploads: dict
+        uploads multipart em andamento, {id: {número da parte: conteúdo}}.
+    requests: list
+        pares (método, caminho) das requisições recebidas.
+    errors: list
+        status a injetar: cada requisição recebe o próximo status da
+        lista (503 com `Retry-After: 0`), enquanto houver.
+    complete_errors: list
+        códigos de erro a injetar na conclusão dos uploads multipart:
+        cada conclusão recebe 200 com um `<Error>` no corpo, com o
+        próximo código da lista, enquanto houver.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.requests = []
+        self.errors = []
+        self.complete_errors = []
+        self._next_upload = 0
+        self._httpd = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self) -> 'S3Server':
+        server = self
+
+        class Handler(_S3Handler):
+            s3 = server
+
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> 'S3Server':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class _S3Handler(BaseHTTPRequestHandler):
+    s3 = None
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_PUT(self):
+        bucket, key, query = self._parse()
+        body = self._body()
+        if not self._authorized():
+            return
+        with self.s3._lock:
+            if 'uploadId' in query:
+                upload_id = query['uploadId'][0]
+                number = int(query['partNumber'][0])
+                self.s3.uploads[upload_id][number] = body
+            else:
+                self.s3.objects[(bucket, key)] = body
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        self._send(200, b'', {'ETag': etag})
+
+    def do_POST(self):
+        bucket, key, query = self._parse()
+        body = self._body()
+        if not self._authorized():
+            return
+        with self.s3._lock:
+            if 'uploads' in query:
+                self.s3._next_upload += 1
+                upload_id = str(self.s3._next_upload)
+                self.s3.uploads[upload_id] = {}
+                return self._send(200, (
+                    '<InitiateMultipartUploadResult><Bucket>{}</Bucket>'
+                    '<Key>{}</Key><UploadId>{}</UploadId>'
+                    '</InitiateMultipartUploadResult>'
+                ).format(bucket, key, upload_id).encode('utf-8'))
+
+            if self.s3.complete_errors:
+                return self._send(200, (
+                    '<?xml version="1.0" encoding="UTF-8"?>\n<Error><Code>{}'
+                    '</Code><Message>Erro</Message></Error>'
+                ).format(self.s3.complete_errors.pop(0)).encode('utf-8'))
+            parts = self.s3.uploads.pop(query['uploadId'][0])
+            numbers = [
+                int(n) for n in re.findall(
+                    r'<PartNumber>(\d+)</PartNumber>', body.decode('utf-8')
+                )
+            ]
+            self.s3.objects[(bucket, key)] = b''.join(
+                parts[number] for number in numbers
+            )
+        self._send(200, b'<CompleteMultipartUploadResult/>')
+
+    def do_DELETE(self):
+        bucket, key, query = self._parse()
+        if not self._authorized():
+            return
+        with self.s3._lock:
+            if 'uploadId' in query:
+                self.s3.uploads.pop(query['uploadId'][0], None)
+            else:
+                self.s3.objects.pop((bucket, key), None)
+        self._send(204, b'')
+
+    def _parse(self):
+        self.s3.requests.append((self.command, self.path))
+        url = urlsplit(self.path)
+        bucket, _, key = unquote(url.path.lstrip('/')).partition('/')
+        return bucket, key, parse_qs(url.query, keep_blank_values=True)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _authorized(self) -> bool:
+        with self.s3._lock:
+            status = self.s3.errors.pop(0) if self.s3.errors else None
+        if status is not None:
+            self._send(status, b'<Error><Code>SlowDown</Code></Error>',
+                       {'Retry-After': '0'})
+            return False
+        authorization = self.headers.get('Authorization', '')
+        if authorization.startswith('AWS4-HMAC-SHA256 Credential='):
+            return True
+        self._send(403, b'<Error><Code>AccessDenied</Code></Error>')
+        return False
+
+    def _send(self, status: int, body: bytes, headers: dict = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,94 @@
+from .utils import *
+from .server import CKANServer, synthetic_catalog
+from odufrn_downloader import AsyncODUFRNDownloader
+from odufrn_downloader.AsyncODUFRNDownloader import aiohttp
+from odufrn_downloader.modules import Monitor, RequestScheduler, RetryPolicy
+import asyncio
+import concurrent.futures
+import tempfile
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp não está instalado')
+class AsyncDownloader(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = AsyncODUFRNDownloader()
+        self.tmp = tempfile.mkdtemp()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        shutil.rmtree(self.tmp)
+
+    def test_can_download_group(self):
+        """Verifica se baixa-se os pacotes de um grupo."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            failures = self.loop.run_until_complete(
+                self.ufrn_data.download_group(
+                    'ensino', self.tmp, dictionary=False, years=[2018]
+                )
+            )
+        self.assertEqual(failures, [])
+        self.assertEqual(
+            os.listdir(self.tmp + '/ensino/discentes'),
+            ['Ingressantes em 2018.csv']
+        )
+        self.assertTrue(os.path.exists(
+            self.tmp + '/ensino/cursos-de-graduacao'
+        ))
+
+    def test_can_download_all(self):
+        """Verifica se baixa-se todos os pacotes e se as falhas são
+        retornadas."""
+        with CKANServer() as server:
+            del server.catalog['files']['files/telefones/0.csv']
+            self.ufrn_data.url_base = server.url
+            failures = self.loop.run_until_complete(
+                self.ufrn_data.download_all(self.tmp)
+            )
+        self.assertEqual(len(os.listdir(self.tmp)), 6)
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0]['resource'], 'Telefones')
+
+    def test_can_retry_and_monitor(self):
+        """Verifica se as falhas transitórias são tentadas novamente, se
+        o scheduler e o monitor são usados e se o download não tem
+        limite de duração total."""
+        monitor = Monitor()
+        self.ufrn_data.monitor = monitor
+        self.ufrn_data.scheduler = RequestScheduler()
+        self.ufrn_data.retry = RetryPolicy(backoff=0.01)
+        with CKANServer() as server:
+            server.errors = {'files/telefones/0.csv': [503, 503]}
+            self.ufrn_data.url_base = server.url
+            failures = self.loop.run_until_complete(
+                self.ufrn_data.download_package('telefones', self.tmp)
+            )
+            files = [r for r in server.requests if '/files/' in r]
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(files), 3)
+        self.assertEqual(self.ufrn_data.retry.retried, 2)
+        stats = monitor.stats()
+        self.assertEqual((stats['files'], stats['bytes']), (1, 64))
+        self.assertEqual(stats['requests'], 4)
+        self.assertIsNone(self.ufrn_data._client().timeout.total)
+
+    def test_can_schedule_more_tasks_than_threads(self):
+        """Verifica se a espera pela vez no scheduler não ocupa as
+        threads do executor, mesmo com concurrency maior que ele."""
+        self.loop.set_default_executor(
+            concurrent.futures.ThreadPoolExecutor(2)
+        )
+        self.ufrn_data = AsyncODUFRNDownloader(concurrency=16)
+        self.ufrn_data.scheduler = RequestScheduler(max_concurrency=2)
+        with CKANServer(synthetic_catalog(10, 3, 20000)) as server:
+            self.ufrn_data.url_base = server.url
+            failures = self.loop.run_until_complete(asyncio.wait_for(
+                self.ufrn_data.download_all(self.tmp), 30
+            ))
+            self.assertLessEqual(server.max_in_flight, 2)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(os.listdir(self.tmp)), 10)
@@ -0,0 +1,65 @@
+from .utils import *
+from .server import CKANServer
+from odufrn_downloader.modules.MetadataCache import MetadataCache
+import tempfile
+
+
+class Cache(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_can_serve_metadata_from_cache(self):
+        """Verifica se respostas repetidas são atendidas pelo cache."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.cache = MetadataCache(self.cache_path)
+            url = self.ufrn_data.url_package + 'discentes'
+
+            first = self.ufrn_data._request_get(url)
+            second = self.ufrn_data._request_get(url)
+            self.assertEqual(first, second)
+            self.assertEqual(server.requests.count('/api/rest/dataset/'
+                                                   'discentes'), 1)
+            self.assertEqual(self.ufrn_data.cache.hits, 1)
+            self.assertEqual(self.ufrn_data.cache.misses, 1)
+
+            self.ufrn_data._request_get(url, refresh=True)
+            self.assertEqual(server.requests.count('/api/rest/dataset/'
+                                                   'discentes'), 2)
+
+    def test_can_persist_cache(self):
+        """Verifica se o cache é mantido em disco entre instâncias."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.cache = MetadataCache(self.cache_path)
+            self.ufrn_data.available_packages
+
+            ufrn_data = ODUFRNDownloader()
+            ufrn_data.url_base = server.url
+            ufrn_data.cache = MetadataCache(self.cache_path)
+            self.assertIn('discentes', ufrn_data.available_packages)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_can_expire_cache(self):
+        """Verifica se respostas expiradas são descartadas."""
+        cache = MetadataCache(ttl=-1)
+        cache.set('url', [1, 2])
+        self.assertIsNone(cache.get('url'))
+        self.assertEqual(cache.misses, 1)
+
+    def test_can_evict_least_recently_used(self):
+        """Verifica se o limite de tamanho remove a entrada menos usada."""
+        cache = MetadataCache(max_size=20)
+        cache.set('a', 'x' * 5)
+        cache.set('b', 'y' * 5)
+        cache.get('a')
+        cache.set('c', 'z' * 5)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'x' * 5)
+        self.assertEqual(cache.get('c'), 'z' * 5)
@@ -0,0 +1,163 @@
+from .utils import *
+from .server import CKANServer
+from odufrn_downloader.modules.CsvStream import CsvStream
+import tempfile
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+    from odufrn_downloader.sinks import ColumnarSink
+except ImportError:
+    pyarrow = None
+
+CSV = (
+    'matricula;nome;ano;observacao\n'
+    '1;João;2017;\n'
+    '2;"Conceição; filha";2018;"linha 1\nlinha 2"\n'
+    '3;Inês;2018;ok\n'
+)
+
+
+def set_file(catalog: dict, path: str, content: bytes):
+    """Substitui o conteúdo de um arquivo do catálogo."""
+    catalog['files'][path] = content
+    package = path.split('/')[1]
+    index = int(path.split('/')[2].split('.')[0])
+    catalog['packages'][package]['resources'][index]['size'] = len(content)
+
+
+class Csv(unittest.TestCase):
+    def read(self, content: bytes, chunk_size: int, **options) -> tuple:
+        stream = CsvStream(**options)
+        blocks = []
+        for start in range(0, len(content), chunk_size):
+            blocks += stream.feed(content[start:start + chunk_size])
+        blocks += stream.close()
+        return stream, blocks
+
+    def test_can_split_complete_records(self):
+        """Verifica se os blocos terminam em registros completos, mesmo
+        com quebras de linha entre aspas."""
+        content = CSV.encode('utf-8')
+        stream, blocks = self.read(content, 7, block_size=16)
+
+        self.assertEqual(stream.columns,
+                         ['matricula', 'nome', 'ano', 'observacao'])
+        self.assertEqual(stream.delimiter, ';')
+        self.assertEqual(stream.encoding, 'utf-8')
+        self.assertGreater(len(blocks), 1)
+        self.assertEqual(b''.join(blocks), content.split(b'\n', 1)[1])
+        for block in blocks:
+            self.assertEqual(block.count(b'"') % 2, 0)
+
+    def test_cannot_grow_buffer_without_limit(self):
+        """Verifica se aspas nunca fechadas interrompem a leitura, em vez
+        de acumular o arquivo em memória."""
+        content = b'a;b\n1;"x\n' + b'2;y\n' * 1000
+        with self.assertRaises(ValueError):
+            self.read(content, 64, block_size=256)
+
+    def test_can_detect_latin1(self):
+        """Verifica se arquivos em Latin-1 são entregues em UTF-8."""
+        stream, blocks = self.read(CSV.encode('latin-1'), 1024)
+
+        self.assertEqual(stream.encoding, 'latin-1')
+        self.assertIn('Conceição'.encode('utf-8'), b''.join(blocks))
+
+    def test_can_switch_to_latin1_after_ascii(self):
+        """Verifica se um arquivo que começa apenas com ASCII e tem
+        caracteres Latin-1 depois é decodificado corretamente."""
+        content = ('a,b\n' + '1,x\n' * 10 + '2,ção\n').encode('latin-1')
+        stream, blocks = self.read(content, 8, block_size=8)
+
+        self.assertEqual(stream.delimiter, ',')
+        self.assertEqual(stream.encoding, 'latin-1')
+        self.assertTrue(b''.join(blocks).endswith('2,ção\n'.encode('utf-8')))
+
+
+@unittest.skipIf(pyarrow is None, 'requer o pacote pyarrow')
+class Columnar(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def download(self, sink: 'ColumnarSink'):
+        with CKANServer() as server:
+            set_file(server.catalog, 'files/discentes/0.csv',
+                     CSV.encode('latin-1'))
+            set_file(server.catalog, 'files/discentes/1.csv',
+                     b'matricula;nome\n')
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.chunk_size = 16
+            return self.ufrn_data.download_package(
+                'discentes', workers=2, sink=sink
+            )
+
+    def test_can_convert_to_parquet(self):
+        """Verifica se os CSV são gravados em Parquet, em blocos."""
+        result = self.download(ColumnarSink(self.tmp_dir, block_size=32))
+
+        self.assertTrue(result.ok)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir + '/discentes')), [
+            'Dicionário de Dados - Discentes.pdf',
+            'Ingressantes em 2017.parquet',
+            'Ingressantes em 2018.parquet',
+        ])
+        table = pyarrow.parquet.read_table(
+            self.tmp_dir + '/discentes/Ingressantes em 2017.parquet'
+        )
+        self.assertEqual(table.column_names,
+                         ['matricula', 'nome', 'ano', 'observacao'])
+        self.assertEqual(table.schema.field('ano').type, pyarrow.int64())
+        self.assertEqual(table.column('nome').to_pylist(),
+                         ['João', 'Conceição; filha', 'Inês'])
+        self.assertEqual(table.column('observacao').to_pylist(),
+                         [None, 'linha 1\nlinha 2', 'ok'])
+
+        empty = pyarrow.parquet.read_table(
+            self.tmp_dir + '/discentes/Ingressantes em 2018.parquet'
+        )
+        self.assertEqual(empty.column_names, ['matricula', 'nome'])
+        self.assertEqual(empty.num_rows, 0)
+
+    def test_can_convert_to_arrow(self):
+        """Verifica se os CSV são gravados em Arrow IPC, como texto."""
+        self.download(ColumnarSink(self.tmp_dir, 'arrow', infer_types=False))
+
+        path = self.tmp_dir + '/discentes/Ingressantes em 2017.arrow'
+        with pyarrow.OSFile(path) as f:
+            table = pyarrow.ipc.open_file(f).read_all()
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.schema.field('ano').type, pyarrow.string())
+
+    def test_can_widen_types(self):
+        """Verifica se valores que não cabem nos tipos do primeiro bloco
+        ampliam a coluna em todo o arquivo, nos dois formatos."""
+        rows = '1;2018\n' * 20 + '2;2018a\n'
+        for file_format in ColumnarSink.FORMATS:
+            sink = ColumnarSink(self.tmp_dir, file_format, block_size=32)
+            with CKANServer() as server:
+                set_file(server.catalog, 'files/telefones/0.csv',
+                         ('id;ano\n' + rows).encode('utf-8'))
+                self.ufrn_data.url_base = server.url
+                result = self.ufrn_data.download_package(
+                    'telefones', sink=sink
+                )
+
+            path = self.tmp_dir + '/telefones/Telefones.' + file_format
+            if file_format == 'parquet':
+                table = pyarrow.parquet.read_table(path)
+            else:
+                with pyarrow.OSFile(path) as f:
+                    table = pyarrow.ipc.open_file(f).read_all()
+            self.assertTrue(result.ok)
+            self.assertNotIn('Telefones.{}.part.old'.format(file_format),
+                             os.listdir(self.tmp_dir + '/telefones'))
+            self.assertEqual(table.schema.field('id').type, pyarrow.int64())
+            self.assertEqual(table.column('ano').to_pylist()[-2:],
+                             ['2018', '2018a'])
@@ -0,0 +1,158 @@
+from .utils import *
+from .server import CKANServer
+from .test_columnar import CSV, set_file
+from odufrn_downloader.sinks import DatabaseSink, SQLiteSink
+import sqlite3
+import tempfile
+
+try:
+    import duckdb
+    import pyarrow
+    from odufrn_downloader.sinks import DuckDBSink
+except ImportError:
+    duckdb = None
+
+
+class Database(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data.retry = None
+        self.ufrn_data.chunk_size = 16
+        self.tmp_dir = tempfile.mkdtemp()
+        self.server = CKANServer().start()
+        self.ufrn_data.url_base = self.server.url
+        set_file(self.server.catalog, 'files/discentes/0.csv',
+                 CSV.encode('latin-1'))
+        rows = ''.join('{};Aluno {};{},5\n'.format(i, i, i) for i in range(50))
+        set_file(self.server.catalog, 'files/discentes/1.csv',
+                 ('matrícula;nome;média\n' + rows).encode('utf-8'))
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_can_name_tables(self):
+        """Verifica se os nomes das tabelas são identificadores simples."""
+        names = [
+            DatabaseSink.table_name('ensino/discentes/Ingressantes 2018.csv'),
+            DatabaseSink.table_name('Unidades-Acadêmicas/Unidades (1).csv'),
+        ]
+        self.assertEqual(names, [
+            'discentes__ingressantes_2018', 'unidades_academicas__unidades_1'
+        ])
+
+    def test_can_load_sqlite(self):
+        """Verifica se os registros são gravados com os tipos inferidos,
+        em lotes, com vários workers."""
+        database = os.path.join(self.tmp_dir, 'ufrn.db')
+        result = self.ufrn_data.download_package(
+            'discentes', workers=2,
+            sink=SQLiteSink(database, batch_size=7, block_size=64)
+        )
+
+        self.assertTrue(result.ok)
+        with sqlite3.connect(database) as connection:
+            tables = sorted(row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            ))
+            self.assertEqual(tables, [
+                'discentes__ingressantes_em_2017',
+                'discentes__ingressantes_em_2018',
+            ])
+            rows = connection.execute(
+                'SELECT * FROM discentes__ingressantes_em_2017'
+            ).fetchall()
+            self.assertEqual(rows[1], (
+                2, 'Conceição; filha', 2018, 'linha 1\nlinha 2'
+            ))
+            self.assertIsNone(rows[0][3])
+
+            columns = [row[1:3] for row in connection.execute(
+                'PRAGMA table_info(discentes__ingressantes_em_2018)'
+            )]
+            self.assertEqual(columns, [
+                ('matricula', 'INTEGER'), ('nome', 'TEXT'),
+                ('media', 'REAL'),
+            ])
+            count, total = connection.execute(
+                'SELECT COUNT(*), SUM(media) FROM '
+                'discentes__ingressantes_em_2018'
+            ).fetchone()
+            self.assertEqual((count, total), (50, 1250.0))
+
+    def test_can_keep_table_on_failure(self):
+        """Verifica se um download com falha não altera a tabela e se o
+        filtro de anos é respeitado."""
+        database = os.path.join(self.tmp_dir, 'ufrn.db')
+        sink = SQLiteSink(database)
+        self.ufrn_data.download_package('discentes', years=[2018], sink=sink)
+
+        resource = self.server.catalog['packages']['discentes']['resources']
+        resource[1]['size'] += 1
+        result = self.ufrn_data.download_package(
+            'discentes', years=[2018], sink=sink
+        )
+
+        self.assertEqual(len(result.failures), 1)
+        with sqlite3.connect(database) as connection:
+            tables = [row[0] for row in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )]
+            count = connection.execute(
+                'SELECT COUNT(*) FROM discentes__ingressantes_em_2018'
+            ).fetchone()[0]
+        self.assertEqual(tables, ['discentes__ingressantes_em_2018'])
+        self.assertEqual(count, 50)
+
+    @unittest.skipIf(duckdb is None, 'requer os pacotes duckdb e pyarrow')
+    def test_can_load_duckdb(self):
+        """Verifica se os registros são gravados em um banco DuckDB."""
+        database = os.path.join(self.tmp_dir, 'ufrn.duckdb')
+        with DuckDBSink(database, batch_size=7) as sink:
+            result = self.ufrn_data.download_package(
+                'discentes', workers=2, sink=sink
+            )
+            count, total = sink.connection.execute(
+                'SELECT COUNT(*), SUM(media) FROM '
+                'discentes__ingressantes_em_2018'
+            ).fetchone()
+            names = sink.connection.execute(
+                'SELECT nome FROM discentes__ingressantes_em_2017 '
+                'ORDER BY matricula'
+            ).fetchall()
+
+        self.assertTrue(result.ok)
+        self.assertEqual((count, total), (50, 1250.0))
+        self.assertEqual(names[1], ('Conceição; filha',))
+
+    @unittest.skipIf(duckdb is None, 'requer os pacotes duckdb e pyarrow')
+    def test_can_widen_duckdb_columns(self):
+        """Verifica se as colunas são alargadas quando um bloco posterior
+        tem valores que não correspondem ao tipo inferido."""
+        rows = ''.join('{};{};{}\n'.format(i, i, i) for i in range(1, 41))
+        set_file(self.server.catalog, 'files/discentes/1.csv', (
+            'código;valor;turma\n' + rows + 'ABC;1,5;42\n007;2;43\n'
+        ).encode('utf-8'))
+        database = os.path.join(self.tmp_dir, 'ufrn.duckdb')
+        with DuckDBSink(database, batch_size=7, block_size=64) as sink:
+            result = self.ufrn_data.download_package(
+                'discentes', years=[2018], sink=sink
+            )
+            types = sink.connection.execute(
+                'SELECT column_name, data_type FROM information_schema.columns'
+                " WHERE table_name = 'discentes__ingressantes_em_2018'"
+                ' ORDER BY ordinal_position'
+            ).fetchall()
+            rows = sink.connection.execute(
+                'SELECT * FROM discentes__ingressantes_em_2018'
+                ' WHERE turma > 39 ORDER BY turma'
+            ).fetchall()
+
+        self.assertTrue(result.ok)
+        self.assertEqual(types, [
+            ('codigo', 'VARCHAR'), ('valor', 'DOUBLE'), ('turma', 'BIGINT')
+        ])
+        self.assertEqual(rows, [
+            ('40', 40.0, 40), ('ABC', 1.5, 42), ('007', 2.0, 43)
+        ])
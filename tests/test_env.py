@@ -1,13 +1,15 @@
 import os
 import json
 import shutil
+import requests
 from .utils import *
+from .server import CKANServer
 
 
-class Env(unittest.TestCase):
+class Env(ServerTestCase):
     def setUp(self):
         """ Inicia novo objeto em todos os testes """
-        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data = self.downloader()
         self.test_dir = 'temporary_test_dir'
 
     def test_can_print_exception(self):
@@ -48,3 +50,43 @@ class Env(unittest.TestCase):
             print(e)
             result = False
         self.assertTrue(result)
+
+    def test_can_load_catalog_lazily(self):
+        """ Verifica se o catálogo só é consultado no primeiro acesso """
+        with CKANServer() as server:
+            ufrn_data = ODUFRNDownloader()
+            ufrn_data.url_base = server.url
+            self.assertEqual(server.requests, [])
+
+            self.assertIn('discentes', ufrn_data.available_packages)
+            self.assertIn('ensino', ufrn_data.available_groups)
+            self.assertIn('graduacao', ufrn_data.available_tags)
+            self.assertIs(ufrn_data.tag, ufrn_data)
+            ufrn_data.search_related_packages('graduacao', search_tag=True)
+            self.assertEqual(
+                len([r for r in server.requests if 'api/action' in r]), 3
+            )
+
+    def test_can_reuse_connections(self):
+        """ Verifica se as requisições reaproveitam a mesma conexão """
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_package('discentes', self.test_dir)
+            self.assertEqual(len(server.requests), 5)
+            self.assertEqual(len(server.connections), 1)
+        shutil.rmtree(self.test_dir)
+
+    def test_can_inject_session(self):
+        """ Verifica se uma sessão personalizada é usada nas requisições """
+        urls = []
+
+        class Session(requests.Session):
+            def get(self, url, **kwargs):
+                urls.append(url)
+                return super().get(url, **kwargs)
+
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.session = Session()
+            self.ufrn_data.search_by_tag('graduacao')
+        self.assertEqual(len(urls), 2)
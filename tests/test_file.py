@@ -2,10 +2,10 @@ from .utils import *
 import tempfile
 
 
-class Group(unittest.TestCase):
+class Group(ServerTestCase):
     def setUp(self):
         """Inicia novo objeto em todo os testes """
-        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data = self.downloader()
 
     def test_can_download_packages_from_file(self):
         """Verifica se dado um arquivo com pacotes realiza-se download."""
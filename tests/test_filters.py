@@ -0,0 +1,74 @@
+from .utils import *
+from odufrn_downloader.mixins.FilterMixin import FilterMixin
+
+
+class Filters(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.filters = FilterMixin()
+        self.packages = [
+            'discentes', 'dados-complementares-de-discentes',
+            'dados-socio-economicos-de-discentes', 'docentes',
+            'processos', 'processos-seletivos', 'cursos-de-graduacao',
+            'cursos-de-pos-graduacao', 'programas-de-pos-graduacao',
+            'telefones', 'unidades-academicas', 'acervo-biblioteca',
+        ]
+
+    def levenshtein_search(self, keyword: str, input_list: list,
+                           split: bool = True) -> list:
+        """Busca comparando a keyword com todas as palavras, sem índice."""
+        return [
+            item for item in input_list
+            if any(self.filters.levenshtein(list(keyword), list(word)) > 0.87
+                   for word in (item.split('-') if split else [item]))
+        ]
+
+    def test_search_related_matches_levenshtein(self):
+        """Verifica se a busca com índice retorna o mesmo que o cálculo
+        da razão de Levenshtein para todas as palavras."""
+        for keyword in ['discent', 'discente', 'disc', 'process',
+                        'graduacao', 'graduacoa', 'pos', 'telefone',
+                        'biblioteca', 'xyz', 'dados']:
+            for split in (True, False):
+                self.assertEqual(
+                    self.filters.search_related(
+                        keyword, self.packages, split
+                    ),
+                    self.levenshtein_search(keyword, self.packages, split)
+                )
+
+    def test_search_related_lists_item_once(self):
+        """Verifica se um item com várias palavras semelhantes aparece
+        apenas uma vez."""
+        self.assertEqual(
+            self.filters.search_related(
+                'graduacao', ['pos-graduacao-graduacao']
+            ),
+            ['pos-graduacao-graduacao']
+        )
+
+    def test_search_related_reuses_index(self):
+        """Verifica se o índice é reaproveitado e refeito quando a lista
+        é substituída."""
+        self.filters.search_related('discente', self.packages)
+        index = self.filters._search_index(self.packages, True)
+        self.filters.search_related('docente', self.packages)
+        self.assertIs(self.filters._search_index(self.packages, True), index)
+
+        packages = self.packages + ['discentes-ead']
+        self.assertIn(
+            'discentes-ead',
+            self.filters.search_related('discente', packages)
+        )
+
+    def test_search_related_many(self):
+        """Verifica se a busca em lote retorna o mesmo que buscas
+        individuais."""
+        keywords = ['discente', 'graduacao', 'xyz', 'discente', 'ação']
+        result = self.filters.search_related_many(keywords, self.packages)
+        self.assertEqual(sorted(result), sorted(set(keywords)))
+        for keyword in keywords:
+            self.assertEqual(
+                result[keyword],
+                self.levenshtein_search(keyword, self.packages)
+            )
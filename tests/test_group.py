@@ -1,10 +1,12 @@
 from .utils import *
+from .server import CKANServer
+import tempfile
 
 
-class Group(unittest.TestCase):
+class Group(ServerTestCase):
     def setUp(self):
         """Inicia novo objeto em todo os testes """
-        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data = self.downloader()
 
     def test_can_print_groups(self):
         """Verifica se a lista de grupos é impressa na tela """
@@ -88,3 +90,60 @@ class Group(unittest.TestCase):
 
 Você pode estar procurando por processos ou processos-seletivos\n"""
         )
+
+    def test_can_download_groups_concurrently(self):
+        """Verifica se baixa-se grupos com vários workers."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            failures = self.ufrn_data.download_groups(
+                ['ensino', 'institucional'], tmp, workers=4
+            ).failures
+        self.assertEqual(failures, [])
+        self.assertTrue(os.path.exists(
+            tmp + '/ensino/discentes/Ingressantes em 2018.csv'
+        ))
+        self.assertTrue(os.path.exists(
+            tmp + '/institucional/telefones/Telefones.csv'
+        ))
+        shutil.rmtree(tmp)
+
+    def test_can_iter_resources(self):
+        """Verifica se percorre-se os recursos sem baixar os arquivos."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            resources = self.ufrn_data.iter_resources(
+                groups=['ensino'], tags=['discentes'], years=[2018],
+                dictionary=False
+            )
+            self.assertEqual(server.requests, [])
+            resources = list(resources)
+            downloaded = [r for r in server.requests if 'files/' in r]
+
+        self.assertEqual(downloaded, [])
+        self.assertEqual(len(resources), 1)
+        resource = resources[0]
+        self.assertEqual(resource.package, 'discentes')
+        self.assertEqual(resource.name, 'Ingressantes em 2018')
+        self.assertEqual(resource.format, 'csv')
+        self.assertEqual(resource.size, 64)
+        self.assertEqual(resource.year, 2018)
+
+    def test_can_iter_resources_with_dictionary(self):
+        """Verifica se os dicionários são filtrados e se cada pacote é
+        percorrido uma única vez."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            names = [
+                (r.package, r.name, r.year)
+                for r in self.ufrn_data.iter_resources(
+                    packages=['discentes'], tags=['graduacao'],
+                    dictionary=False
+                )
+            ]
+
+        self.assertEqual(names, [
+            ('discentes', 'Ingressantes em 2017', 2017),
+            ('discentes', 'Ingressantes em 2018', 2018),
+            ('cursos-de-graduacao', 'Cursos de graduação', None),
+        ])
@@ -0,0 +1,107 @@
+from .utils import *
+from .server import CKANServer
+from .test_columnar import CSV, set_file
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+@unittest.skipIf(pyarrow is None, 'requer o pacote pyarrow')
+class Load(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.server = CKANServer().start()
+        self.ufrn_data.url_base = self.server.url
+        set_file(self.server.catalog, 'files/discentes/0.csv',
+                 CSV.encode('latin-1'))
+        rows = b'9;Ana;2018;x\n' * 500
+        set_file(self.server.catalog, 'files/discentes/1.csv',
+                 b'matricula;nome;ano;observacao\n' + rows)
+        self.cwd = os.getcwd()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_can_load_arrow_table(self):
+        """Verifica se o recurso é carregado em uma tabela Arrow, apenas
+        com as colunas pedidas e sem gravar arquivos."""
+        before = os.listdir(self.cwd)
+        table = self.ufrn_data.load_resource(
+            'discentes', 'Ingressantes em 2017', 'arrow',
+            usecols=['nome', 'ano']
+        )
+
+        self.assertEqual(table.column_names, ['nome', 'ano'])
+        self.assertEqual(table.column('nome').to_pylist(),
+                         ['João', 'Conceição; filha', 'Inês'])
+        self.assertEqual(table.column('ano').to_pylist(), [2017, 2018, 2018])
+        self.assertEqual(os.listdir(self.cwd), before)
+
+    def test_can_load_batches_with_nrows(self):
+        """Verifica se o carregamento em lotes respeita nrows e
+        interrompe o download."""
+        self.ufrn_data.chunk_size = 64
+        batches = self.ufrn_data.load_resource(
+            'discentes', 'Ingressantes em 2018', 'batches', nrows=10,
+            block_size=128
+        )
+        self.assertEqual(self.server.bytes_sent, 0)
+
+        batches = list(batches)
+        self.assertEqual(sum(batch.num_rows for batch in batches), 10)
+        self.assertEqual(batches[0].schema.names,
+                         ['matricula', 'nome', 'ano', 'observacao'])
+
+    def test_can_load_package(self):
+        """Verifica se os recursos CSV do pacote são carregados,
+        filtrando por anos."""
+        tables = self.ufrn_data.load_package(
+            'discentes', 'arrow', years=[2018], nrows=0
+        )
+
+        self.assertEqual(list(tables), ['Ingressantes em 2018'])
+        self.assertEqual(tables['Ingressantes em 2018'].num_rows, 0)
+        self.assertEqual(tables['Ingressantes em 2018'].num_columns, 4)
+
+    def test_cannot_load_missing_resource(self):
+        """Verifica se recursos inexistentes ou que não são CSV são
+        recusados."""
+        with self.assertRaises(ValueError):
+            self.ufrn_data.load_resource('discentes', 'Inexistente')
+        with self.assertRaises(ValueError):
+            self.ufrn_data.load_resource(
+                'discentes', 'Dicionário de Dados - Discentes'
+            )
+
+    @unittest.skipIf(pandas is None, 'requer o pacote pandas')
+    def test_can_load_dataframe(self):
+        """Verifica se o recurso é carregado em um DataFrame."""
+        frame = self.ufrn_data.load_resource(
+            'discentes', 'Ingressantes em 2017'
+        )
+        self.assertEqual(list(frame['nome']),
+                         ['João', 'Conceição; filha', 'Inês'])
+
+    def test_can_widen_types(self):
+        """Verifica se valores que não cabem nos tipos do primeiro bloco
+        ampliam a coluna, em vez de falhar o carregamento."""
+        rows = '1;Ana;2018;x\n' * 20 + '1.5;Bia;2018a;y\n'
+        set_file(self.server.catalog, 'files/discentes/1.csv',
+                 ('matricula;nome;ano;observacao\n' + rows).encode('utf-8'))
+        table = self.ufrn_data.load_resource(
+            'discentes', 'Ingressantes em 2018', 'arrow', block_size=64
+        )
+
+        self.assertEqual(table.num_rows, 21)
+        self.assertEqual(str(table.schema.field('ano').type), 'string')
+        self.assertEqual(table.column('ano').to_pylist()[-2:],
+                         ['2018', '2018a'])
+        self.assertEqual(table.column('matricula').to_pylist()[-1], 1.5)
@@ -0,0 +1,146 @@
+from .utils import *
+from .server import CKANServer
+from odufrn_downloader.modules.MetadataCache import MetadataCache
+from odufrn_downloader.modules.Monitor import Monitor, percentiles
+import json
+import tempfile
+import threading
+
+
+class Monitoring(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data.monitor = Monitor()
+        self.events = []
+        self.ufrn_data.monitor.subscribe(
+            lambda event, data: self.events.append((event, data))
+        )
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_can_emit_events(self):
+        """Verifica se os eventos de metadados e downloads são emitidos
+        com suas durações."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_package('telefones', self.tmp_dir)
+
+        names = [event for event, data in self.events]
+        self.assertEqual(names, [
+            'request', 'metadata', 'request', 'metadata',
+            'download_start', 'request', 'download_progress', 'download_end'
+        ])
+        end = self.events[-1][1]
+        self.assertEqual(end['package'], 'telefones')
+        self.assertEqual(end['resource'], 'Telefones')
+        self.assertEqual(end['bytes'], 64)
+        self.assertGreater(end['duration'], 0)
+
+    def test_can_report_failures(self):
+        """Verifica se as falhas de download são emitidas."""
+        self.ufrn_data.retry = None
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/telefones/0.csv': [503]}
+            self.ufrn_data.download_package('telefones', self.tmp_dir)
+
+        event, data = self.events[-1]
+        self.assertEqual(event, 'download_failure')
+        self.assertEqual(data['resource'], 'Telefones')
+        self.assertEqual(self.ufrn_data.monitor.stats()['failures'], 1)
+
+    def test_can_aggregate_stats(self):
+        """Verifica as estatísticas agregadas e os exportadores."""
+        self.ufrn_data.cache = MetadataCache()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_group('ensino', self.tmp_dir, workers=4)
+            self.ufrn_data.download_group('ensino', self.tmp_dir, workers=4)
+            requests = len(server.requests)
+
+        stats = self.ufrn_data.monitor.stats()
+        self.assertEqual(stats['requests'], requests)
+        self.assertEqual(stats['files'], 8)
+        self.assertEqual(stats['bytes'], 8 * 64)
+        self.assertEqual(stats['cache_hits'], 3)
+        self.assertEqual(stats['cache_misses'], 5)
+        self.assertEqual(sorted(stats['request_latency']), [50, 90, 99])
+
+        self.assertEqual(json.loads(self.ufrn_data.monitor.to_json())['files'],
+                         8)
+        text = self.ufrn_data.monitor.to_prometheus()
+        self.assertIn('odufrn_files_total 8\n', text)
+        self.assertIn('odufrn_request_latency_seconds{quantile="0.99"}', text)
+
+    def test_can_separate_simultaneous_downloads(self):
+        """Verifica se downloads simultâneos da mesma url, em threads
+        diferentes ou com tasks diferentes, não se misturam."""
+        monitor = self.ufrn_data.monitor
+        url = 'http://localhost/files/telefones/0.csv'
+
+        def download(size: int, **task):
+            monitor.emit('download_start', url=url, **task)
+            monitor.emit('download_progress', url=url, bytes=size, **task)
+            barrier.wait()
+            monitor.emit('download_end', url=url, **task)
+
+        barrier = threading.Barrier(2)
+        threads = [threading.Thread(target=download, args=(size,))
+                   for size in (10, 20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        barrier = threading.Barrier(1)
+        download(30, task=1)
+        download(40, task=2)
+
+        sizes = sorted(data['bytes'] for event, data in self.events
+                       if event == 'download_end')
+        self.assertEqual(sizes, [10, 20, 30, 40])
+        self.assertEqual(monitor.stats()['files'], 4)
+
+    def test_cannot_count_unchanged_files(self):
+        """Verifica se os recursos inalterados no modo de sincronização
+        não contam como arquivos baixados."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_package('telefones', self.tmp_dir,
+                                            sync=True)
+            self.ufrn_data.download_package('telefones', self.tmp_dir,
+                                            sync=True)
+
+        stats = self.ufrn_data.monitor.stats()
+        self.assertEqual((stats['files'], stats['unchanged']), (1, 1))
+        self.assertEqual(stats['download_duration_count'], 1)
+        self.assertEqual(self.events[-1][1]['status'], 'unchanged')
+
+    def test_can_bound_samples(self):
+        """Verifica se a amostra das latências é limitada e se a soma e a
+        contagem consideram todas as requisições."""
+        monitor = Monitor()
+        monitor.RESERVOIR_SIZE = 10
+        monitor.reset()
+        for duration in range(1000):
+            monitor.emit('request', url='http://localhost/', status=200,
+                         duration=duration)
+
+        self.assertEqual(len(monitor._request_latencies.values), 10)
+        stats = monitor.stats()
+        self.assertEqual(stats['request_latency_count'], 1000)
+        self.assertEqual(stats['request_latency_sum'], sum(range(1000)))
+        text = monitor.to_prometheus()
+        self.assertIn('odufrn_request_latency_seconds_count 1000\n', text)
+        self.assertIn('odufrn_request_latency_seconds_sum 499500.0\n', text)
+
+    def test_can_calculate_percentiles(self):
+        """Verifica o cálculo de percentis pelo posto mais próximo."""
+        values = list(range(1, 101))
+        self.assertEqual(percentiles(values, (50, 90, 99, 100)),
+                         {50: 50, 90: 90, 99: 99, 100: 100})
+        self.assertEqual(percentiles([3], (50,)), {50: 3})
+        self.assertEqual(percentiles([], (50,)), {})
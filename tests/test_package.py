@@ -1,10 +1,15 @@
 from .utils import *
+from .server import CKANServer, synthetic_catalog
+from odufrn_downloader.modules import MetadataCache
+from odufrn_downloader.sinks import MemorySink
+import hashlib
+import tempfile
 
 
-class Package(unittest.TestCase):
+class Package(ServerTestCase):
     def setUp(self):
         """Inicia novo objeto em todo os testes."""
-        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data = self.downloader()
 
     def test_can_print_packages(self):
         """Verifica se a lista de packages é impressa na tela."""
@@ -71,3 +76,363 @@ class Package(unittest.TestCase):
         self.assertTrue(len(files) > 0 and file_exist)
         if os.path.exists('./tmp'):
             shutil.rmtree('./tmp')
+
+    def test_can_download_packages_concurrently(self):
+        """Verifica se baixa-se pacotes com vários workers e se as falhas
+        são retornadas."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            failures = self.ufrn_data.download_packages(
+                ['discentes', 'telefones', 'inexistente'], tmp, workers=4
+            ).failures
+        _, _, files = next(os.walk(os.path.join(tmp, 'discentes')))
+        self.assertEqual(len(files), 3)
+        self.assertTrue(os.path.exists(tmp + '/telefones/Telefones.csv'))
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0]['package'], 'inexistente')
+        shutil.rmtree(tmp)
+
+    def test_can_discard_failed_download(self):
+        """Verifica se um download com erro não deixa arquivos na pasta."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            del server.catalog['files']['files/telefones/0.csv']
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.chunk_size = 8
+            result = self.ufrn_data.download_package('telefones', tmp)
+            failures = result.failures
+            self.ufrn_data.download_package('discentes', tmp)
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(os.listdir(tmp + '/telefones'), [])
+        self.assertEqual(
+            sorted(os.listdir(tmp + '/discentes')),
+            ['Dicionário de Dados - Discentes.pdf',
+             'Ingressantes em 2017.csv', 'Ingressantes em 2018.csv']
+        )
+        shutil.rmtree(tmp)
+
+    def test_can_sync_package(self):
+        """Verifica se o modo de sincronização baixa apenas os recursos
+        alterados."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_package('discentes', tmp, sync=True)
+            self.assertEqual(
+                len([r for r in server.requests if '/files/' in r]), 3
+            )
+
+            server.reset()
+            self.ufrn_data.download_package('discentes', tmp, sync=True)
+            self.assertEqual(
+                len([r for r in server.requests if '/files/' in r]), 0
+            )
+
+            # Recurso alterado e recurso sem campos de versão
+            resources = server.catalog['packages']['discentes']['resources']
+            resources[0]['last_modified'] = '2020-01-01T00:00:00'
+            resources[0]['size'] = 4
+            server.catalog['files']['files/discentes/0.csv'] = b'novo'
+            resources[1].pop('last_modified')
+            resources[1].pop('size')
+
+            server.reset()
+            output = input_value(lambda: self.ufrn_data.download_package(
+                'discentes', tmp, sync=True
+            ))
+            self.assertEqual(
+                len([r for r in server.requests if '/files/' in r]), 2
+            )
+            self.assertIn('Ingressantes em 2018 não foi alterado', output)
+        with open(tmp + '/discentes/Ingressantes em 2017.csv', 'rb') as f:
+            self.assertEqual(f.read(), b'novo')
+        shutil.rmtree(tmp)
+
+    def test_can_sync_with_cache(self):
+        """Verifica se o modo de sincronização consulta os metadados na
+        API, e não no cache, ao comparar as versões dos recursos."""
+        tmp = tempfile.mkdtemp()
+        self.ufrn_data.cache = MetadataCache()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_package('telefones', tmp, sync=True)
+            self.ufrn_data.download_group('ensino', tmp, sync=True)
+
+            resource = server.catalog['packages']['telefones']['resources'][0]
+            resource.update(size=4, revision_id='nova',
+                            last_modified='2020-01-01T00:00:00')
+            server.catalog['files']['files/telefones/0.csv'] = b'novo'
+            server.catalog['groups']['ensino'].append('telefones')
+
+            result = self.ufrn_data.download_package('telefones', tmp,
+                                                     sync=True)
+            group = self.ufrn_data.download_group('ensino', tmp, sync=True)
+
+        self.assertEqual(result.records[0]['status'], 'ok')
+        with open(tmp + '/telefones/Telefones.csv', 'rb') as f:
+            self.assertEqual(f.read(), b'novo')
+        self.assertIn('telefones', os.listdir(tmp + '/ensino'))
+        self.assertEqual(len(group.records), 5)
+        shutil.rmtree(tmp)
+
+    def test_can_sync_tag_with_cache(self):
+        """Verifica se, no modo de sincronização, os pacotes da etiqueta
+        são consultados novamente."""
+        tmp = tempfile.mkdtemp()
+        self.ufrn_data.cache = MetadataCache()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_packages_by_tag('institucional', tmp,
+                                                    sync=True)
+            server.catalog['tags']['institucional'].append('discentes')
+            self.ufrn_data.download_packages_by_tag('institucional', tmp,
+                                                    sync=True)
+
+        self.assertIn('discentes', os.listdir(tmp))
+        self.assertIn('institucional',
+                      self.ufrn_data.tag.get_tags_of_package('discentes'))
+        shutil.rmtree(tmp)
+
+    def test_can_resume_download(self):
+        """Verifica se um download interrompido é retomado do ponto em
+        que parou."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            content = server.catalog['files']['files/telefones/0.csv']
+            os.makedirs(tmp + '/telefones')
+            part = tmp + '/telefones/Telefones.csv.part'
+            with open(part, 'wb') as f:
+                f.write(content[:40])
+
+            self.ufrn_data.download_package('telefones', tmp)
+            self.assertEqual(server.bytes_sent, len(content) - 40)
+            with open(tmp + '/telefones/Telefones.csv', 'rb') as f:
+                self.assertEqual(f.read(), content)
+            self.assertFalse(os.path.exists(part))
+
+            # Servidor que ignora o Range: baixa o arquivo inteiro
+            server.ranges = False
+            server.reset()
+            with open(part, 'wb') as f:
+                f.write(b'lixo')
+            self.ufrn_data.download_package('telefones', tmp)
+            self.assertEqual(server.bytes_sent, len(content))
+            with open(tmp + '/telefones/Telefones.csv', 'rb') as f:
+                self.assertEqual(f.read(), content)
+        shutil.rmtree(tmp)
+
+    def test_can_check_resumed_version(self):
+        """Verifica se o download só é retomado se o arquivo não mudou no
+        servidor (If-Range) e se, no modo de sincronização, um arquivo
+        inalterado não é retomado."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            content = server.catalog['files']['files/telefones/0.csv']
+            etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+            os.makedirs(tmp + '/telefones')
+            part = tmp + '/telefones/Telefones.csv.part'
+            for validator, sent in [('"antigo"', len(content)),
+                                    (etag, len(content) - 40)]:
+                server.reset()
+                with open(part, 'wb') as f:
+                    f.write(content[:40])
+                with open(part + '.validator', 'w') as f:
+                    f.write(validator)
+                self.ufrn_data.download_package('telefones', tmp)
+                self.assertEqual(server.bytes_sent, sent)
+                with open(tmp + '/telefones/Telefones.csv', 'rb') as f:
+                    self.assertEqual(f.read(), content)
+                self.assertEqual(os.listdir(tmp + '/telefones'),
+                                 ['Telefones.csv'])
+
+            self.ufrn_data.download_package('telefones', tmp, sync=True)
+            resource = server.catalog['packages']['telefones']['resources'][0]
+            resource['revision_id'] = 'nova'
+            with open(part, 'wb') as f:
+                f.write(content[:40])
+            with open(part + '.validator', 'w') as f:
+                f.write(etag)
+            server.reset()
+            result = self.ufrn_data.download_package(
+                'telefones', tmp, sync=True
+            )
+        self.assertEqual(result.records[0]['status'], 'unchanged')
+        self.assertEqual(server.bytes_sent, 0)
+        self.assertFalse(os.path.exists(part))
+        shutil.rmtree(tmp)
+
+    def test_can_finish_complete_part(self):
+        """Verifica se um arquivo parcial já completo é finalizado quando
+        o servidor recusa o Range (416), sem ser baixado de novo."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            content = server.catalog['files']['files/telefones/0.csv']
+            etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+            os.makedirs(tmp + '/telefones')
+            part = tmp + '/telefones/Telefones.csv.part'
+            with open(part, 'wb') as f:
+                f.write(content)
+            with open(part + '.validator', 'w') as f:
+                f.write(etag)
+
+            result = self.ufrn_data.download_package(
+                'telefones', tmp, sync=True
+            )
+            self.assertTrue(result.ok)
+            self.assertEqual(server.bytes_sent, 0)
+            with open(tmp + '/telefones/Telefones.csv', 'rb') as f:
+                self.assertEqual(f.read(), content)
+            self.assertFalse(os.path.exists(part))
+            self.assertFalse(os.path.exists(part + '.validator'))
+
+            # O ETag do parcial é registrado para a próxima sincronização
+            resource = server.catalog['packages']['telefones']['resources'][0]
+            resource['revision_id'] = 'nova'
+            result = self.ufrn_data.download_package(
+                'telefones', tmp, sync=True
+            )
+        self.assertEqual(result.records[0]['status'], 'unchanged')
+        self.assertEqual(server.bytes_sent, 0)
+        shutil.rmtree(tmp)
+
+    def test_can_fail_on_unsatisfiable_download(self):
+        """Verifica se uma resposta 416 a uma requisição sem Range é uma
+        falha, em vez de recomeçar o download indefinidamente."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors['files/telefones/0.csv'] = [416] * 10
+            result = self.ufrn_data.download_package('telefones', tmp)
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn('416', str(result.failures[0]['error']))
+        self.assertFalse(os.path.exists(
+            tmp + '/telefones/Telefones.csv.part'
+        ))
+        shutil.rmtree(tmp)
+
+    def test_can_check_downloaded_size(self):
+        """Verifica se um arquivo com tamanho diferente do informado
+        nos metadados é descartado."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            resource = server.catalog['packages']['telefones']['resources'][0]
+            resource['size'] += 1
+            result = self.ufrn_data.download_package('telefones', tmp)
+            failures = result.failures
+        self.assertEqual(len(failures), 1)
+        self.assertIsInstance(failures[0]['error'], IOError)
+        self.assertEqual(os.listdir(tmp + '/telefones'), [])
+        shutil.rmtree(tmp)
+
+    def test_can_load_catalog(self):
+        """Verifica se o catálogo carregado evita consultas por pacote,
+        grupo e etiqueta."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.load_catalog(rows=4)
+            self.assertEqual(len(server.requests), 2)
+            self.assertEqual(len(self.ufrn_data.available_packages), 6)
+
+            server.reset()
+            self.ufrn_data.download_group('ensino', tmp)
+            self.ufrn_data.print_files_from_package('telefones')
+            self.assertEqual(
+                sorted(self.ufrn_data.search_by_tag('graduacao')),
+                ['cursos-de-graduacao', 'discentes']
+            )
+            self.assertTrue(
+                all(r.startswith('/files/') for r in server.requests)
+            )
+        self.assertTrue(os.path.exists(
+            tmp + '/ensino/discentes/Ingressantes em 2018.csv'
+        ))
+        shutil.rmtree(tmp)
+
+    def test_can_download_all_from_catalog(self):
+        """Verifica se download_all carrega o catálogo de uma vez."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_all(tmp)
+            metadata = [r for r in server.requests if '/files/' not in r]
+        self.assertEqual(metadata, ['/api/action/package_search?'
+                                    'rows=1000&start=0'])
+        self.assertEqual(len(os.listdir(tmp)), 6)
+        shutil.rmtree(tmp)
+
+    def test_can_refresh_catalog(self):
+        """Verifica se download_all carrega novamente o catálogo com
+        refresh ou sync, baixando os pacotes publicados depois."""
+        tmp = tempfile.mkdtemp()
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_all(tmp)
+            packages = server.catalog['packages']
+            packages['telefones-2'] = dict(packages['telefones'],
+                                           name='telefones-2')
+
+            self.ufrn_data.download_all(tmp)
+            self.assertEqual(len(os.listdir(tmp)), 6)
+            self.ufrn_data.download_all(tmp, refresh=True)
+            self.assertIn('telefones-2', os.listdir(tmp))
+
+            packages['telefones-3'] = dict(packages['telefones'],
+                                           name='telefones-3')
+            self.ufrn_data.download_all(tmp, sync=True)
+            self.assertIn('telefones-3', os.listdir(tmp))
+        shutil.rmtree(tmp)
+
+    def test_can_shard_download_all(self):
+        """Verifica se as partes do download_all são disjuntas e cobrem
+        todos os pacotes."""
+        shards = []
+        with CKANServer(synthetic_catalog(30)) as server:
+            for index in range(3):
+                ufrn_data = self.downloader()
+                ufrn_data.url_base = server.url
+                sink = MemorySink()
+                ufrn_data.download_all(sink=sink, shard_index=index,
+                                       shard_count=3)
+                shards.append({key.split('/')[0] for key in sink.files})
+
+        packages = set().union(*shards)
+        self.assertEqual(len(packages), 30)
+        self.assertEqual(sum(len(shard) for shard in shards), 30)
+        self.assertTrue(all(shards))
+
+        with self.assertRaises(ValueError):
+            self.ufrn_data.download_all(shard_index=3, shard_count=3)
+
+    def test_can_shard_changed_catalog(self):
+        """Verifica se mudanças no catálogo não mudam a parte dos demais
+        pacotes: com partes baixadas de catálogos diferentes, nenhum
+        pacote em comum é pulado ou baixado duas vezes."""
+        old = ['pacote-{}'.format(i) for i in range(300)]
+        new = old[:150] + old[151:] + ['pacote-novo']
+        shards = [
+            self.ufrn_data._shard(old if index < 2 else new, index, 4)
+            for index in range(4)
+        ]
+        common = set(old) & set(new)
+        downloaded = [name for shard in shards for name in shard
+                      if name in common]
+        self.assertEqual(sorted(downloaded), sorted(common))
+        self.assertEqual(
+            self.ufrn_data._shard(old[::-1], 1, 4),
+            self.ufrn_data._shard(old, 1, 4)[::-1]
+        )
+
+        # Ao passar de 4 para 5 partes, só mudam os pacotes da parte nova
+        fifth = set(self.ufrn_data._shard(old, 4, 5))
+        self.assertTrue(fifth)
+        for index in range(4):
+            self.assertEqual(
+                set(self.ufrn_data._shard(old, index, 5)),
+                set(self.ufrn_data._shard(old, index, 4)) - fifth
+            )
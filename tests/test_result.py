@@ -0,0 +1,135 @@
+from .utils import *
+from .server import CKANServer
+from odufrn_downloader.modules.RunResult import RunResult
+from odufrn_downloader.sinks import MemorySink
+import json
+import tempfile
+
+
+class Result(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data.retry = None
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manifest = os.path.join(self.tmp_dir, 'manifesto.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_can_return_run_result(self):
+        """Verifica se o download retorna um registro por recurso."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/discentes/0.csv': [503]}
+            result = self.ufrn_data.download_group(
+                'ensino', self.tmp_dir, workers=4
+            )
+
+        self.assertEqual(len(result.records), 4)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.bytes, 3 * 64)
+
+        records = {r['resource']: r for r in result.records}
+        failed = records['Ingressantes em 2017']
+        self.assertEqual(failed['status'], 'failed')
+        self.assertEqual(failed['retries'], 0)
+        self.assertEqual(result.failures, [failed])
+
+        done = records['Cursos de graduação']
+        self.assertEqual(done['status'], 'ok')
+        self.assertEqual(done['package'], 'cursos-de-graduacao')
+        self.assertEqual(done['bytes'], 64)
+        self.assertTrue(os.path.exists(done['path']))
+        self.assertGreater(done['duration'], 0)
+
+    def test_can_save_manifest(self):
+        """Verifica se o resultado é salvo e carregado em json-lines."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/telefones/0.csv': [404]}
+            result = self.ufrn_data.download_packages(
+                ['telefones', 'acervo-biblioteca'], self.tmp_dir
+            )
+        result.save(self.manifest)
+
+        with open(self.manifest) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0]['error'].startswith('HTTPError: 404'))
+
+        loaded = RunResult.load(self.manifest)
+        self.assertEqual(len(loaded.failures), 1)
+        self.assertEqual(loaded.records[1], result.records[1])
+
+    def test_can_download_only_failed_or_missing(self):
+        """Verifica se, com o manifesto anterior, só são baixados os
+        recursos que falharam ou cujos arquivos sumiram."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/discentes/0.csv': [503]}
+            first = self.ufrn_data.download_group('ensino', self.tmp_dir)
+            first.save(self.manifest)
+            os.remove(self.tmp_dir + '/ensino/cursos-de-graduacao/'
+                      'Cursos de graduação.csv')
+
+            server.reset()
+            second = self.ufrn_data.download_group(
+                'ensino', self.tmp_dir, previous=self.manifest
+            )
+            files = sorted(r for r in server.requests if '/files/' in r)
+
+        self.assertTrue(second.ok)
+        self.assertEqual(files, [
+            '/files/cursos-de-graduacao/0.csv', '/files/discentes/0.csv'
+        ])
+        statuses = sorted(r['status'] for r in second.records)
+        self.assertEqual(statuses, ['ok', 'ok', 'skipped', 'skipped'])
+
+    def test_can_check_each_destination(self):
+        """Verifica se um arquivo reaproveitado em outro grupo, ou gravado
+        em outra pasta, não impede o download de um arquivo que sumiu."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.catalog['groups']['graduacao'] = ['discentes']
+            self.ufrn_data.load_groups()
+            first = self.ufrn_data.download_groups(
+                ['ensino', 'graduacao'], self.tmp_dir
+            )
+            first.save(self.manifest)
+            os.remove(self.tmp_dir + '/ensino/discentes/'
+                      'Ingressantes em 2017.csv')
+
+            server.reset()
+            second = self.ufrn_data.download_groups(
+                ['ensino', 'graduacao'], self.tmp_dir, previous=self.manifest
+            )
+            files = [r for r in server.requests if '/files/' in r]
+
+            other = os.path.join(self.tmp_dir, 'outra')
+            third = self.ufrn_data.download_groups(
+                ['ensino'], other, previous=self.manifest
+            )
+
+        self.assertEqual(files, ['/files/discentes/0.csv'])
+        self.assertTrue(os.path.exists(
+            self.tmp_dir + '/ensino/discentes/Ingressantes em 2017.csv'
+        ))
+        self.assertEqual(len(second.records), 7)
+        self.assertNotIn('skipped', [r['status'] for r in third.records])
+
+    def test_can_check_sink_files(self):
+        """Verifica se, com um sink, apenas os arquivos que ainda existem
+        nele são pulados."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            sink = MemorySink()
+            first = self.ufrn_data.download_group('ensino', sink=sink)
+            del sink.files['ensino/discentes/Ingressantes em 2017.csv']
+            second = self.ufrn_data.download_group(
+                'ensino', sink=sink, previous=first
+            )
+
+        statuses = sorted(r['status'] for r in second.records)
+        self.assertEqual(statuses, ['ok', 'skipped', 'skipped', 'skipped'])
+        self.assertEqual(len(sink.files), 4)
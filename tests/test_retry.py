@@ -0,0 +1,120 @@
+from .utils import *
+from .server import CKANServer
+from odufrn_downloader.modules.RetryPolicy import RetryPolicy
+import tempfile
+import time
+import requests
+
+
+class Retry(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data.retry = RetryPolicy(backoff=0.01)
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_can_retry_transient_failures(self):
+        """Verifica se metadados e arquivos são tentados novamente após
+        falhas transitórias."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {
+                'api/rest/dataset/discentes': [503],
+                'files/discentes/0.csv': [500, 502],
+            }
+            failures = self.ufrn_data.download_package(
+                'discentes', self.tmp_dir
+            ).failures
+
+        self.assertEqual(failures, [])
+        self.assertEqual(self.ufrn_data.retry.retried, 3)
+        self.assertTrue(os.path.exists(
+            self.tmp_dir + '/discentes/Ingressantes em 2017.csv'
+        ))
+
+    def test_can_retry_each_resource(self):
+        """Verifica se uma falha permanente não impede o download dos
+        demais recursos do pacote."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/discentes/0.csv': [503] * 10}
+            failures = self.ufrn_data.download_package(
+                'discentes', self.tmp_dir
+            ).failures
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0]['resource'], 'Ingressantes em 2017')
+        self.assertEqual(self.ufrn_data.retry.retried, 3)
+        self.assertTrue(os.path.exists(
+            self.tmp_dir + '/discentes/Ingressantes em 2018.csv'
+        ))
+
+    def test_can_limit_retries_by_budget(self):
+        """Verifica se o orçamento limita as novas tentativas."""
+        self.ufrn_data.retry = RetryPolicy(backoff=0, budget=0,
+                                           min_budget=2)
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {
+                'files/discentes/{}.csv'.format(i): [503] * 10
+                for i in range(2)
+            }
+            failures = self.ufrn_data.download_package(
+                'discentes', self.tmp_dir
+            ).failures
+
+        self.assertEqual(len(failures), 2)
+        self.assertEqual(self.ufrn_data.retry.retried, 2)
+
+    def test_can_time_out(self):
+        """Verifica se um servidor que não responde não trava o
+        download."""
+        self.ufrn_data.timeout = (1, 0.2)
+        self.ufrn_data.retry = None
+        with CKANServer(latency=1) as server:
+            self.ufrn_data.url_base = server.url
+            start = time.monotonic()
+            with self.assertRaises(requests.Timeout):
+                self.ufrn_data._request_get(server.url + 'api/rest/dataset/'
+                                            'telefones')
+            self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_can_wait_with_jitter(self):
+        """Verifica se a espera cresce exponencialmente, com limite."""
+        retry = RetryPolicy(backoff=1, max_backoff=5)
+        delays = [retry.delay(3) for _ in range(100)]
+        self.assertTrue(all(0 <= delay <= 5 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_can_cap_budget(self):
+        """Verifica se o saldo acumulado em um período sem falhas é
+        limitado por window."""
+        policy = RetryPolicy(retries=100, backoff=0, budget=0.5,
+                             min_budget=1, window=4)
+        for _ in range(100):
+            policy.call(lambda: None)
+
+        def fail():
+            raise requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            policy.call(fail)
+        self.assertEqual(policy.retried, 3)
+
+    def test_cannot_shorten_retry_after(self):
+        """Verifica se um Retry-After maior que max_backoff não é
+        antecipado: a falha não é tentada novamente."""
+        self.ufrn_data.retry = RetryPolicy(backoff=0, max_backoff=0.5)
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/telefones/0.csv': [503]}
+            server.error_headers = {'Retry-After': '60'}
+            failures = self.ufrn_data.download_package(
+                'telefones', self.tmp_dir
+            ).failures
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.ufrn_data.retry.retried, 0)
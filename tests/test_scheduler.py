@@ -0,0 +1,74 @@
+from .utils import *
+from .server import CKANServer, synthetic_catalog
+from odufrn_downloader.modules.RequestScheduler import RequestScheduler
+import datetime
+import tempfile
+import time
+
+
+class Response:
+    """Resposta mínima usada para registrar resultados no scheduler."""
+
+    def __init__(self, status_code: int, elapsed: float = 0.01,
+                 headers: dict = None):
+        self.status_code = status_code
+        self.elapsed = datetime.timedelta(seconds=elapsed)
+        self.headers = headers or {}
+
+
+class Scheduler(unittest.TestCase):
+    URL = 'http://dados.ufrn.br/api/action/package_list'
+
+    def request(self, scheduler: RequestScheduler, response: Response):
+        with scheduler.slot(self.URL) as slot:
+            slot.record(response)
+
+    def test_can_limit_rate(self):
+        """Verifica se o balde de fichas limita a taxa de requisições."""
+        scheduler = RequestScheduler(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            self.request(scheduler, Response(200))
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_can_adapt_concurrency(self):
+        """Verifica se o limite cresce com respostas saudáveis e cai pela
+        metade com 503 e picos de latência."""
+        scheduler = RequestScheduler(max_concurrency=8, backoff=0)
+        for _ in range(20):
+            self.request(scheduler, Response(200))
+        self.assertEqual(scheduler.concurrency(self.URL), 6)
+
+        self.request(scheduler, Response(503))
+        self.assertEqual(scheduler.concurrency(self.URL), 3)
+
+        self.request(scheduler, Response(200, elapsed=1.0))
+        self.assertEqual(scheduler.concurrency(self.URL), 1)
+
+        for _ in range(100):
+            self.request(scheduler, Response(200))
+        self.assertEqual(scheduler.concurrency(self.URL), 8)
+
+    def test_can_back_off(self):
+        """Verifica se o servidor deixa de receber requisições após 429,
+        respeitando o Retry-After."""
+        scheduler = RequestScheduler()
+        self.request(scheduler, Response(429, headers={'Retry-After': '0.2'}))
+        start = time.monotonic()
+        self.request(scheduler, Response(200))
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_can_respect_server_capacity(self):
+        """Verifica se os downloads se adaptam à capacidade do servidor."""
+        tmp = tempfile.mkdtemp()
+        ufrn_data = ODUFRNDownloader()
+        ufrn_data.scheduler = RequestScheduler(max_concurrency=3)
+        catalog = synthetic_catalog(10, 2)
+        with CKANServer(catalog, latency=0.01, capacity=3) as server:
+            ufrn_data.url_base = server.url
+            failures = ufrn_data.download_all(tmp, workers=8).failures
+
+        self.assertEqual(failures, [])
+        self.assertEqual(server.rejected, 0)
+        self.assertLessEqual(server.max_in_flight, 3)
+        shutil.rmtree(tmp)
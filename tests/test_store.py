@@ -0,0 +1,133 @@
+from .utils import *
+from .server import CKANServer, default_catalog
+from odufrn_downloader.modules.ContentStore import ContentStore
+import tempfile
+
+
+class Store(unittest.TestCase):
+    def setUp(self):
+        """Inicia novo objeto em todo os testes."""
+        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data.retry = None
+        self.tmp_dir = tempfile.mkdtemp()
+
+        # O grupo 'graduacao' tem pacotes em comum com o grupo 'ensino'
+        self.catalog = default_catalog()
+        self.catalog['groups']['graduacao'] = [
+            'discentes', 'cursos-de-graduacao'
+        ]
+        for name in self.catalog['groups']['graduacao']:
+            self.catalog['packages'][name]['groups'].append('graduacao')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_can_fetch_overlapping_groups_once(self):
+        """Verifica se os recursos presentes em mais de um grupo são
+        baixados uma única vez."""
+        for workers in (1, 4):
+            path = os.path.join(self.tmp_dir, str(workers))
+            with CKANServer(self.catalog) as server:
+                self.ufrn_data.url_base = server.url
+                result = self.ufrn_data.download_groups(
+                    ['ensino', 'graduacao'], path, workers=workers
+                )
+                files = [r for r in server.requests if '/files/' in r]
+
+            self.assertTrue(result.ok)
+            self.assertEqual(len(files), 4)
+            self.assertEqual(len(set(files)), 4)
+            statuses = sorted(r['status'] for r in result.records)
+            self.assertEqual(statuses, ['linked'] * 4 + ['ok'] * 4)
+
+            first = os.stat(
+                path + '/ensino/discentes/Ingressantes em 2017.csv'
+            )
+            second = os.stat(
+                path + '/graduacao/discentes/Ingressantes em 2017.csv'
+            )
+            self.assertEqual(first.st_ino, second.st_ino)
+
+    def test_can_copy_duplicates(self):
+        """Verifica se, com link_duplicates False, as urls repetidas são
+        copiadas em vez de ligadas por hardlink."""
+        self.ufrn_data.link_duplicates = False
+        with CKANServer(self.catalog) as server:
+            self.ufrn_data.url_base = server.url
+            result = self.ufrn_data.download_groups(
+                ['ensino', 'graduacao'], self.tmp_dir
+            )
+
+        self.assertTrue(result.ok)
+        first = self.tmp_dir + '/ensino/discentes/Ingressantes em 2017.csv'
+        second = self.tmp_dir + '/graduacao/discentes/Ingressantes em 2017.csv'
+        self.assertNotEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+        with open(first, 'rb') as f, open(second, 'rb') as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_can_sync_linked_files(self):
+        """Verifica se os arquivos ligados são registrados com os
+        validadores do download original, evitando downloads na próxima
+        sincronização."""
+        with CKANServer(self.catalog) as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.download_groups(
+                ['ensino', 'graduacao'], self.tmp_dir, sync=True
+            )
+            for package in server.catalog['packages'].values():
+                for resource in package['resources']:
+                    resource['revision_id'] = 'nova'
+
+            server.reset()
+            result = self.ufrn_data.download_group(
+                'graduacao', self.tmp_dir, sync=True
+            )
+
+        statuses = [r['status'] for r in result.records]
+        self.assertEqual(statuses, ['unchanged'] * 4)
+        self.assertEqual(server.bytes_sent, 0)
+
+    def test_can_download_again_if_first_failed(self):
+        """Verifica se a url é baixada novamente quando o primeiro
+        download dela falha."""
+        with CKANServer(self.catalog) as server:
+            self.ufrn_data.url_base = server.url
+            server.errors = {'files/cursos-de-graduacao/0.csv': [503]}
+            result = self.ufrn_data.download_groups(
+                ['ensino', 'graduacao'], self.tmp_dir
+            )
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertTrue(os.path.exists(
+            self.tmp_dir + '/graduacao/cursos-de-graduacao/'
+            'Cursos de graduação.csv'
+        ))
+
+    def test_can_store_equal_contents_once(self):
+        """Verifica se arquivos de urls diferentes com o mesmo conteúdo
+        ocupam o disco uma única vez."""
+        files = self.catalog['files']
+        files['files/discentes/1.csv'] = files['files/discentes/0.csv']
+        store = ContentStore(os.path.join(self.tmp_dir, '.store'))
+        self.ufrn_data.store = store
+
+        with CKANServer(self.catalog) as server:
+            self.ufrn_data.url_base = server.url
+            result = self.ufrn_data.download_package(
+                'discentes', self.tmp_dir
+            )
+
+        self.assertTrue(result.ok)
+        first = os.stat(self.tmp_dir + '/discentes/Ingressantes em 2017.csv')
+        second = os.stat(
+            self.tmp_dir + '/discentes/Ingressantes em 2018.csv'
+        )
+        self.assertEqual(first.st_ino, second.st_ino)
+        self.assertEqual(first.st_nlink, 3)
+
+        blobs = [name for _, _, names in os.walk(store.root)
+                 for name in names]
+        self.assertEqual(len(blobs), 2)
+
+        shutil.rmtree(self.tmp_dir + '/discentes')
+        self.assertEqual(store.prune(), 2)
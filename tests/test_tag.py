@@ -1,10 +1,11 @@
 from .utils import *
+from .server import CKANServer
 
 
-class Tag(unittest.TestCase):
+class Tag(ServerTestCase):
     def setUp(self):
         """ Inicia novo objeto em todo os testes """
-        self.ufrn_data = ODUFRNDownloader()
+        self.ufrn_data = self.downloader()
 
     def test_can_print_packages(self):
         """ Verifica se a lista de tags é impressa na tela """
@@ -35,3 +36,32 @@ class Tag(unittest.TestCase):
         self.assertTrue(os.path.exists('./tmp/acervo-biblioteca'))
         if os.path.exists('./tmp'):
             shutil.rmtree('./tmp')
+
+    def test_can_reuse_tag_index(self):
+        """Verifica se buscas repetidas por etiqueta usam o índice."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            packages = self.ufrn_data.search_by_tag('graduacao')
+            self.assertEqual(
+                sorted(packages), ['cursos-de-graduacao', 'discentes']
+            )
+            self.ufrn_data.search_related_packages('graduacao',
+                                                   search_tag=True)
+            self.assertEqual(self.ufrn_data.search_by_tag('graduacao'),
+                             packages)
+            self.assertEqual(
+                server.requests.count('/api/rest/tag/graduacao'), 1
+            )
+
+    def test_can_load_tag_index(self):
+        """Verifica se o índice de etiquetas é preenchido de uma vez."""
+        with CKANServer() as server:
+            self.ufrn_data.url_base = server.url
+            self.ufrn_data.load_tag_index(workers=4)
+            requests_count = len(server.requests)
+            self.assertEqual(
+                sorted(self.ufrn_data.get_tags_of_package('discentes')),
+                ['discentes', 'graduacao']
+            )
+            self.ufrn_data.search_by_tag('institucional')
+            self.assertEqual(len(server.requests), requests_count)
@@ -5,6 +5,7 @@ import shutil
 import unittest
 from odufrn_downloader import ODUFRNDownloader
 from os.path import dirname, join, abspath
+from .server import CKANServer, ufrn_catalog
 
 sys.path.insert(0, abspath(join(dirname(__file__), '..')))
 
@@ -26,3 +27,33 @@ def assert_console(fun, message: str = None):
         return unit.assertEqual(message, input_value(fun))
     else:
         return unit.assertTrue(len(input_value(fun)) > 0)
+
+
+class ServerTestCase(unittest.TestCase):
+    """Testes que consultam um servidor local com o catálogo ufrn_catalog.
+
+    Com a variável de ambiente ODUFRN_LIVE=1, os testes consultam a API
+    real do dados.ufrn.br.
+    """
+
+    server = None
+
+    @classmethod
+    def setUpClass(cls):
+        if not os.environ.get('ODUFRN_LIVE'):
+            cls.server = CKANServer(ufrn_catalog()).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.server is not None:
+            cls.server.stop()
+            cls.server = None
+
+    def downloader(self) -> ODUFRNDownloader:
+        """Retorna um ODUFRNDownloader que consulta o servidor dos
+        testes."""
+        ufrn_data = ODUFRNDownloader()
+        if self.server is not None:
+            ufrn_data.url_base = self.server.url
+
+        return ufrn_data